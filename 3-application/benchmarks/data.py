@@ -0,0 +1,46 @@
+# benchmarks/data.py
+# ------------------------------------------------------------
+# 목적: 벤치마크용 합성 고객 데이터(REQ_COLUMNS 스키마) 생성/캐시
+# - 실제 CSV 분포를 학습한 utils/process/synthetic.py 생성기 사용
+# - 크기 표기: "10k", "100k", "1m", "10m" (정수도 가능)
+# - CSV는 benchmarks/.cache/customers_<rows>_<seed>.csv 로 1회 생성 후 재사용
+# ------------------------------------------------------------
+from __future__ import annotations
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.process.synthetic import fit_synthetic_spec, load_spec, save_spec, write_synthetic
+from utils.process.synthetic import synthetic_frame as _synthetic_frame
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+SPEC_PATH = CACHE_DIR / "synthetic_spec.json"
+
+
+def get_spec() -> Dict[str, Any]:
+    """기본 학습 CSV로 학습한 생성 스펙(캐시)."""
+    if SPEC_PATH.exists():
+        return load_spec(SPEC_PATH)
+    from utils.process import load_csv_from_data
+    spec = fit_synthetic_spec(load_csv_from_data())
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    save_spec(spec, SPEC_PATH)
+    return spec
+
+
+def synthetic_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """원본 CSV와 같은 컬럼/타입의 합성 고객 DataFrame (RowNumber 포함)."""
+    return _synthetic_frame(n_rows, spec=get_spec(), seed=seed)
+
+
+def synthetic_csv(n_rows: int, seed: int = 42) -> Path:
+    """합성 CSV 경로(캐시). 없으면 청크 단위로 스트리밍 생성."""
+    path = CACHE_DIR / f"customers_{n_rows}_{seed}.csv"
+    if not path.exists():
+        write_synthetic(path, n_rows, spec=get_spec(), seed=seed)
+    return path
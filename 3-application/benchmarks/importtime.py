@@ -0,0 +1,128 @@
+# benchmarks/importtime.py
+# ------------------------------------------------------------
+# 목적: Streamlit 페이지 시작(import) 비용 측정 + 예산 검사 (python -X importtime)
+# - 페이지 스크립트에서 로드 시 무조건 실행되는 import 문을 AST로 추출
+#   (함수/클래스 본문, if 분기, except 처리부 안의 import는 지연 import로 간주해 제외)
+# - 새 프로세스에서 -X importtime 으로 실행 → 누적 import 시간(ms) + 무거운 모듈 Top N
+# - 프레임워크(streamlit)는 서버 프로세스당 1회 비용이므로 측정 전에 미리 import(예산 제외)
+# - 예산: benchmarks/import_budget.json {page: {"max_ms": .., "forbid": [모듈 접두어]}} → 위반 시 exit 1
+# 사용: python benchmarks/importtime.py
+#       python benchmarks/importtime.py --pages user_list,page01_visualization --top 10 --scale 2
+# ------------------------------------------------------------
+from __future__ import annotations
+import ast
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+APP_DIR = Path(__file__).resolve().parents[1]
+BUDGET_PATH = Path(__file__).resolve().parent / "import_budget.json"
+PRELOAD = ("streamlit",)
+_MARK = "--importtime-start--"
+
+
+def page_scripts() -> Dict[str, Path]:
+    pages = {"main": APP_DIR / "main.py"}
+    pages.update({p.stem: p for p in sorted((APP_DIR / "pages").glob("*.py")) if p.stem != "app_bootstrap"})
+    return pages
+
+def eager_imports(path: Path) -> List[str]:
+    """로드 시 무조건 실행되는 import 문(소스 그대로)."""
+    src = path.read_text(encoding="utf-8")
+    out: List[str] = []
+
+    def walk(stmts):
+        for node in stmts:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                if not (isinstance(node, ast.ImportFrom) and node.module == "__future__"):
+                    out.append(ast.get_source_segment(src, node))
+            elif isinstance(node, (ast.With, ast.For, ast.While)):
+                walk(node.body)
+            elif isinstance(node, ast.Try):
+                walk(node.body)
+                walk(node.finalbody)
+            # FunctionDef/ClassDef/If/except → 호출·분기 시점에만 실행(지연 import)
+    walk(ast.parse(src).body)
+    return out
+
+def _probe_code(imports: List[str]) -> str:
+    return "\n".join([
+        "import sys",
+        f"sys.path.insert(0, {str(APP_DIR)!r})",
+        "missing = []",
+        *[f"try:\n    import {m}\nexcept ImportError:\n    pass" for m in PRELOAD],
+        f"sys.stderr.write({_MARK!r} + '\\n')",
+        *[f"try:\n    {stmt}\nexcept ImportError as e:\n    missing.append(getattr(e, 'name', None) or str(e))"
+          for stmt in imports],
+        "sys.stderr.write('--missing--' + ','.join(sorted(set(missing))) + '\\n')",
+    ])
+
+def measure(imports: List[str]) -> Dict[str, Any]:
+    """-X importtime 로그 파싱 → 총 ms, 최상위 모듈별 누적 ms, 로드된 전체 모듈 목록."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _probe_code(imports)],
+                          cwd=str(APP_DIR), capture_output=True, text=True)
+    lines = proc.stderr.splitlines()
+    started, top, loaded, missing = False, [], [], []
+    for line in lines:
+        if line == _MARK:
+            started = True
+            continue
+        if line.startswith("--missing--"):
+            missing = [m for m in line[len("--missing--"):].split(",") if m]
+            continue
+        if not started or not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, raw = line[len("import time:"):].split("|", 2)
+        raw = raw.rstrip()
+        mod = raw.strip()
+        loaded.append(mod)
+        if len(raw) - len(raw.lstrip()) <= 1:          # 들여쓰기 없음 = 최상위 import
+            top.append((mod, int(cum) / 1000))
+    return {"total_ms": round(sum(ms for _, ms in top), 1), "top": sorted(top, key=lambda t: -t[1]),
+            "loaded": loaded, "missing": missing, "returncode": proc.returncode}
+
+def check(res: Dict[str, Any], budget: Dict[str, Any], scale: float) -> List[str]:
+    errors = []
+    max_ms = budget.get("max_ms")
+    if max_ms is not None and res["total_ms"] > max_ms * scale:
+        errors.append(f"{res['total_ms']:.0f}ms > budget {max_ms * scale:.0f}ms")
+    for prefix in budget.get("forbid", []):
+        hit = sorted({m for m in res["loaded"] if m == prefix or m.startswith(prefix + ".")})
+        if hit:
+            errors.append(f"forbidden eager import: {prefix} ({hit[0]})")
+    return errors
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Streamlit 페이지 import 시간 예산 검사(-X importtime)")
+    ap.add_argument("--pages", default=None, help="쉼표 구분 페이지 이름(기본: 전체)")
+    ap.add_argument("--repeat", type=int, default=3, help="반복 측정 후 최소값 사용(디스크 캐시 영향 완화)")
+    ap.add_argument("--top", type=int, default=5, help="페이지별 무거운 최상위 import 표시 개수")
+    ap.add_argument("--scale", type=float, default=1.0, help="예산 배율(느린 머신/CI)")
+    ap.add_argument("--budget", default=str(BUDGET_PATH))
+    args = ap.parse_args()
+
+    budgets = json.loads(Path(args.budget).read_text(encoding="utf-8")) if Path(args.budget).exists() else {}
+    pages = page_scripts()
+    names = args.pages.split(",") if args.pages else list(pages)
+    failed = 0
+    for name in names:
+        imports = eager_imports(pages[name])
+        runs = [measure(imports) for _ in range(max(1, args.repeat))]
+        res = min(runs, key=lambda r: r["total_ms"])
+        errors = check(res, budgets.get(name, {}), args.scale)
+        failed += bool(errors)
+        status = "FAIL" if errors else "ok"
+        budget_ms = budgets.get(name, {}).get("max_ms")
+        print(f"[IMPORT] {name:<24} {res['total_ms']:>8.1f} ms"
+              + (f" / {budget_ms * args.scale:.0f} ms" if budget_ms else "") + f"  {status}")
+        for mod, ms in res["top"][:args.top]:
+            print(f"           {ms:>8.1f} ms  {mod}")
+        if res["missing"]:
+            print(f"           (미설치로 제외: {', '.join(res['missing'])})")
+        for e in errors:
+            print(f"[ERROR] {name}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,203 @@
+# benchmarks/run.py
+# ------------------------------------------------------------
+# 목적: 파이프라인 벤치마크 실행 + 커밋별 JSON 히스토리 기록/회귀 비교
+# - (벤치, 행 수)마다 별도 프로세스에서 실행 → 프로세스 peak RSS를 메모리 지표로 사용
+# - 결과: benchmarks/results/history.json (실행마다 1개 엔트리 append)
+# 사용: python benchmarks/run.py --sizes 10k,100k
+#       python benchmarks/run.py --only engineer_features,read_csv --sizes 1m,10m --repeat 1
+# ------------------------------------------------------------
+from __future__ import annotations
+import gc
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
+
+from utils.process.synthetic import parse_size
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+HISTORY_PATH = RESULTS_DIR / "history.json"
+DEFAULT_SIZES = "10k,100k"
+REGRESSION_RATIO = 1.2   # 직전 커밋 대비 median이 20% 이상 느리면 회귀 표시
+
+
+def _rss_mb() -> float:
+    """현재 RSS(MB). /proc이 없으면 peak RSS로 대체."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return _peak_rss_mb()
+
+def _peak_rss_mb() -> float:
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / 2**20 if sys.platform == "darwin" else kb / 1024   # macOS는 bytes 단위
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", *args], cwd=APP_DIR, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+# ─────────────────────────────────────────────
+# 자식 프로세스: 벤치 1개 × 행 수 1개
+# ─────────────────────────────────────────────
+def _child(name: str, rows: int, repeat: int) -> Dict[str, Any]:
+    from benchmarks.suite import BENCHES, Skip
+
+    bench = BENCHES[name]
+    try:
+        state = bench.setup(rows)
+    except Skip as e:
+        return {"status": "skipped", "reason": str(e)}
+    gc.collect()
+    rss_before = _rss_mb()
+    times: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = bench.run(state)
+        times.append(time.perf_counter() - t0)
+        del out
+        gc.collect()
+    per = max(1, int(bench.per(state)))
+    peak = _peak_rss_mb()
+    times = [t / per for t in times]
+    return {
+        "status": "ok",
+        "times_s": [round(t, 6) for t in times],
+        "min_s": round(min(times), 6),
+        "median_s": round(sorted(times)[len(times) // 2], 6),
+        "per": per,
+        "peak_rss_mb": round(peak, 1),
+        # setup 이후 측정 구간에서 늘어난 peak(0이면 setup 단계 peak 이내)
+        "delta_rss_mb": round(max(0.0, peak - rss_before), 1),
+    }
+
+
+def _run_one(name: str, rows: int, repeat: int, timeout: Optional[float]) -> Dict[str, Any]:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--_child", name, str(rows), str(repeat)]
+    try:
+        proc = subprocess.run(cmd, cwd=APP_DIR, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout"}
+    # 마지막 줄이 JSON 결과(그 전 출력은 파이프라인 로그)
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        err = (proc.stderr.strip().splitlines() or ["(no stderr)"])[-1]
+        return {"status": "error", "reason": err}
+    return json.loads(lines[-1])
+
+
+# ─────────────────────────────────────────────
+# 히스토리
+# ─────────────────────────────────────────────
+def load_history(path: Path = HISTORY_PATH) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_history(entry: Dict[str, Any], path: Path = HISTORY_PATH) -> None:
+    hist = load_history(path)
+    hist.append(entry)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(hist, f, ensure_ascii=False, indent=2)
+    tmp.replace(path)
+
+def _baseline(hist: List[Dict[str, Any]], commit: Optional[str]) -> Dict[tuple, Dict[str, Any]]:
+    """현재 커밋이 아닌 가장 최근 엔트리들의 (bench, rows) → 결과."""
+    base: Dict[tuple, Dict[str, Any]] = {}
+    for entry in reversed(hist):
+        if entry.get("commit") == commit:
+            continue
+        for r in entry["results"]:
+            if r.get("status") == "ok":
+                base.setdefault((r["bench"], r["rows"]), {**r, "commit": entry.get("commit")})
+    return base
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from benchmarks.suite import BENCHES
+
+    ap = argparse.ArgumentParser(description="학습/스코어링 파이프라인 벤치마크")
+    ap.add_argument("--sizes", default=DEFAULT_SIZES, help="행 수 목록(예: 10k,100k,1m,10m)")
+    ap.add_argument("--only", default="", help=f"실행할 벤치(쉼표): {','.join(BENCHES)}")
+    ap.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수(median 기록)")
+    ap.add_argument("--no-cap", action="store_true", help="벤치별 max_rows 상한 무시")
+    ap.add_argument("--timeout", type=float, default=None, help="(벤치, 행 수)당 제한 시간(초)")
+    ap.add_argument("--history", default=str(HISTORY_PATH), help="결과 히스토리 JSON 경로")
+    ap.add_argument("--no-save", action="store_true", help="히스토리에 기록하지 않음")
+    ap.add_argument("--_child", nargs=3, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args._child:
+        name, rows, repeat = args._child
+        print(json.dumps(_child(name, int(rows), int(repeat))))
+        return 0
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(BENCHES)
+    unknown = [n for n in names if n not in BENCHES]
+    if unknown:
+        ap.error(f"알 수 없는 벤치: {unknown}")
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+
+    history_path = Path(args.history)
+    commit = _git("rev-parse", "--short", "HEAD")
+    base = _baseline(load_history(history_path), commit)
+
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        cap = BENCHES[name].max_rows
+        for rows in sizes:
+            if cap and rows > cap and not args.no_cap:
+                res = {"status": "skipped", "reason": f"max_rows={cap:,} (--no-cap로 해제)"}
+            else:
+                res = _run_one(name, rows, args.repeat, args.timeout)
+            res = {"bench": name, "rows": rows, **res}
+            results.append(res)
+
+            line = f"[BENCH] {name:<28} {rows:>11,} rows  "
+            if res["status"] != "ok":
+                print(line + f"{res['status']}: {res.get('reason', '')}")
+                continue
+            line += f"median={res['median_s']:.4f}s  peak_rss={res['peak_rss_mb']:.0f}MB"
+            prev = base.get((name, rows))
+            if prev:
+                ratio = res["median_s"] / prev["median_s"] if prev["median_s"] else float("inf")
+                flag = "  ⚠ REGRESSION" if ratio >= REGRESSION_RATIO else ""
+                line += f"  vs {prev['commit']}: x{ratio:.2f}{flag}"
+            print(line, flush=True)
+
+    if not args.no_save:
+        save_history({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "results": results,
+        }, history_path)
+        print(f"[SAVE] history -> {history_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# benchmarks/suite.py
+# ------------------------------------------------------------
+# 목적: 학습/스코어링 파이프라인 단계별 벤치마크 정의
+# - setup(n_rows) → 상태(측정 제외), run(상태) → 측정 대상
+# - max_rows: 기본 측정 상한(무거운 단계). run.py --no-cap 으로 해제
+# - per: 결과 시간을 나눌 단위 수(예: CV는 fold 수 → fold당 시간)
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.data import CACHE_DIR, synthetic_csv, synthetic_frame
+from utils.process import engineer_features, get_feature_groups, make_preprocessor
+from utils.process.data_loader import _safe_read_csv
+from utils.process.utils import write_churn_scores
+
+BENCH_CV_FOLDS = int(os.getenv("BENCH_CV_FOLDS", "2"))
+BENCH_CV_VARIANT = os.getenv("BENCH_CV_VARIANT", "balanced")
+# 기본: 로컬 SQLite 파일(판다스 to_sql 경로). MySQL 측정 시 mysql+pymysql://... 지정
+BENCH_DB_URL = os.getenv("BENCH_DB_URL", f"sqlite:///{CACHE_DIR / 'bench.sqlite'}")
+
+
+class Skip(Exception):
+    """환경상 측정 불가(모델/DB 없음 등) — 결과에 skipped로 기록."""
+
+
+@dataclass
+class Bench:
+    name: str
+    setup: Callable[[int], Any]
+    run: Callable[[Any], Any]
+    max_rows: Optional[int] = None
+    per: Callable[[Any], int] = lambda state: 1
+
+
+# ─────────────────────────────────────────────
+# 공통 준비
+# ─────────────────────────────────────────────
+def _engineered(n: int) -> pd.DataFrame:
+    return engineer_features(synthetic_frame(n))
+
+def _train_matrix(n: int):
+    """full_scoring과 동일한 피처 서브셋/범주형 처리."""
+    import service.full_scoring as fs
+    df_ = _engineered(n)
+    X = df_[[c for c in fs.RECOMMENDED_COLS if c in df_.columns]].copy()
+    y = df_["Exited"].astype(int).values
+    cat_cols, cat_idx = fs._cat_cols_and_idx(X)
+    return X, y, cat_cols, cat_idx
+
+
+# ─────────────────────────────────────────────
+# 단계별 벤치
+# ─────────────────────────────────────────────
+def _setup_read_csv(n):
+    return synthetic_csv(n)
+
+def _run_read_csv(path):
+    return _safe_read_csv(path)
+
+
+def _setup_engineer(n):
+    return synthetic_frame(n)
+
+def _run_engineer(df):
+    return engineer_features(df)
+
+
+def _setup_preprocess(n):
+    return _engineered(n)
+
+def _run_preprocess(data):
+    return make_preprocessor(get_feature_groups()).fit_transform(data)
+
+
+def _setup_cv(n):
+    from service.config import RunConfig
+    # fold 캐시/양자화 Pool 파일 캐시를 끄지 않으면 반복 측정이 캐시 적중(파일 로드)만 재고
+    # assets/logs 아래에 벤치 크기 캐시 파일도 남김
+    return (*_train_matrix(n), RunConfig(n_folds=BENCH_CV_FOLDS, variants=(BENCH_CV_VARIANT,),
+                                         cv_cache=False, quantized_pool=False))
+
+def _run_cv(state):
+    import service.full_scoring as fs
+    X, y, _, cat_idx, config = state
+    return fs._evaluate_catboost_cv(X, y, BENCH_CV_VARIANT, cat_idx, config)
+
+
+def _setup_score(backend: str):
+    def setup(n):
+        from service.scoring import load_model
+        try:
+            bundle = load_model(backend=backend)
+        except FileNotFoundError as e:
+            raise Skip(str(e))
+        return bundle, bundle.prepare(synthetic_frame(n))
+    return setup
+
+def _run_score(state):
+    bundle, X = state
+    return bundle.predict_proba(X)
+
+
+def _scores(n):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"customer_id": 15_000_000 + np.arange(n), "churn_probability": rng.random(n)})
+
+def _setup_db_scores(n):
+    from sqlalchemy import create_engine
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(BENCH_DB_URL)
+    try:
+        with engine.connect():
+            pass
+    except Exception as e:
+        raise Skip(f"DB 연결 실패({BENCH_DB_URL}): {e}")
+    return engine, _scores(n)
+
+def _run_db_scores(state):
+    engine, df = state
+    write_churn_scores(engine, df, table="bench_churn_score")
+
+def _setup_db_rows(n):
+    """db/csv_to_db.py의 row-by-row(executemany) 폴백 경로 — MySQL 전용."""
+    import db.csv_to_db  # noqa: F401  (측정 구간에서 import 비용 제외)
+    if not BENCH_DB_URL.startswith("mysql"):
+        raise Skip("row-by-row 적재는 MySQL 전용(BENCH_DB_URL=mysql+pymysql://...)")
+    engine, df = _setup_db_scores(n)
+    path = CACHE_DIR / f"scores_{n}.csv"
+    if not path.exists():
+        df.to_csv(path, index=False)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE IF EXISTS bench_stg_churn_score")
+        conn.exec_driver_sql("CREATE TABLE bench_stg_churn_score (customer_id BIGINT PRIMARY KEY, "
+                             "churn_probability DECIMAL(9,6) NOT NULL)")
+    return engine, path
+
+def _run_db_rows(state):
+    from db.csv_to_db import load_csv_row_by_row
+    engine, path = state
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            cur.execute("TRUNCATE TABLE bench_stg_churn_score")
+            load_csv_row_by_row(
+                cur, "bench_stg_churn_score", str(path),
+                "INSERT INTO bench_stg_churn_score (customer_id, churn_probability) VALUES (%s, %s)",
+                ["customer_id", "churn_probability"],
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+BENCHES: Dict[str, Bench] = {b.name: b for b in [
+    Bench("read_csv", _setup_read_csv, _run_read_csv),
+    Bench("engineer_features", _setup_engineer, _run_engineer),
+    Bench("preprocessor_fit_transform", _setup_preprocess, _run_preprocess),
+    Bench("catboost_cv_fold", _setup_cv, _run_cv, max_rows=100_000, per=lambda state: BENCH_CV_FOLDS),
+    Bench("score_catboost", _setup_score("catboost"), _run_score),
+    Bench("score_compiled", _setup_score("compiled"), _run_score),
+    Bench("db_write_scores", _setup_db_scores, _run_db_scores, max_rows=1_000_000),
+    Bench("db_insert_rows", _setup_db_rows, _run_db_rows, max_rows=1_000_000),
+]}
@@ -2,9 +2,19 @@
 import os
 import sys
 import csv
+import time
+import argparse
+import tempfile
 import pymysql
 from pathlib import Path
 
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.perf import metrics
+
+INGEST_ROWS = metrics.counter("ingest_rows", "CSV → DB 적재 행 수", ["table", "method"])
+INGEST_SECONDS = metrics.histogram("ingest_duration_seconds", "CSV → DB 적재 소요(초)", ["table", "method"])
+
 # =========================
 # Config (env overridable)
 # =========================
@@ -58,6 +68,20 @@ def resolve_bank_csv():
         "👉 Set BANK_CSV env to absolute path or place file under assets/data/"
     )
 
+def build_scaled_csv(bank_csv, scale, workers=1):
+    """부하 테스트용: 원본 분포를 학습한 합성 고객 CSV(원본 행 수 × scale)를 임시 폴더에 생성."""
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from utils.process.data_loader import _safe_read_csv
+    from utils.process.synthetic import write_synthetic
+
+    src = _safe_read_csv(Path(bank_csv))
+    n_rows = int(len(src) * scale)
+    out = Path(tempfile.gettempdir()) / f"bank_synthetic_x{scale:g}.csv"
+    t0 = time.perf_counter()
+    write_synthetic(out, n_rows, df=src, workers=workers)
+    print(f"[INFO] Synthetic BANK_CSV: {out} ({n_rows:,} rows, {time.perf_counter() - t0:.1f}s)")
+    return str(out)
+
 def connect():
     # local_infile client flag enables LOAD DATA LOCAL INFILE when server allows it
     return pymysql.connect(
@@ -295,12 +319,17 @@ def ensure_database_exists():
     finally:
         conn.close()
         
-def main():
+def main(scale=1.0, workers=1):
     # resolve csv paths
     bank_csv = resolve_bank_csv()
     print(f"[INFO] Using BANK_CSV: {bank_csv}")
-    if SCORE_CSV:
-        print(f"[INFO] SCORE_CSV: {SCORE_CSV} ({'exists' if Path(SCORE_CSV).exists() else 'missing'})")
+    score_csv = SCORE_CSV
+    if scale != 1:
+        bank_csv = build_scaled_csv(bank_csv, scale, workers)
+        score_csv = ""  # 합성 고객 ID와 점수 CSV가 맞지 않으므로 점수 적재 생략
+        print("[INFO] --scale 사용: stg_churn_score 적재는 건너뜁니다.")
+    if score_csv:
+        print(f"[INFO] SCORE_CSV: {score_csv} ({'exists' if Path(score_csv).exists() else 'missing'})")
 
     ensure_database_exists()   # ✅ DB 없으면 생성
     conn = connect()
@@ -314,6 +343,8 @@ def main():
 
             # Load bank_customer (from CSV)
             print(">> Load bank_customer from CSV via LOCAL INFILE...")
+            t_load = time.perf_counter()
+            method = "local_infile"
             try:
                 load_csv_via_local_infile(
                     cur, "bank_customer", bank_csv,
@@ -323,6 +354,7 @@ def main():
                 print("   - LOCAL INFILE succeeded.")
             except Exception as e:
                 print(f"   - LOCAL INFILE failed ({e}); fallback to row-by-row insert.")
+                method = "row_by_row"
                 insert_sql = """
                 INSERT INTO bank_customer
                 (RowNumber, CustomerId, Surname, CreditScore, Geography, Gender, Age, Tenure,
@@ -350,19 +382,27 @@ def main():
                                 "Age","Tenure","Balance","NumOfProducts","HasCrCard",
                                 "IsActiveMember","EstimatedSalary","Exited","Complain"]
                 load_csv_row_by_row(cur, "bank_customer", bank_csv, insert_sql, expected_cols)
+            cur.execute("SELECT COUNT(*) FROM bank_customer")
+            n_loaded = cur.fetchone()[0]
+            dt = time.perf_counter() - t_load
+            print(f"   - bank_customer {n_loaded:,} rows in {dt:.1f}s ({n_loaded / max(dt, 1e-9):,.0f} rows/s)")
+            INGEST_ROWS.inc(n_loaded, table="bank_customer", method=method)
+            INGEST_SECONDS.observe(dt, table="bank_customer", method=method)
 
 
             # Optionally load stg_churn_score
-            if SCORE_CSV and Path(SCORE_CSV).exists():
+            if score_csv and Path(score_csv).exists():
                 print(">> Load stg_churn_score from CSV...")
+                t_load, method = time.perf_counter(), "local_infile"
                 try:
                     load_csv_via_local_infile(
-                        cur, "stg_churn_score", SCORE_CSV,
+                        cur, "stg_churn_score", score_csv,
                         "customer_id, churn_probability"
                     )
                     print("   - stg_churn_score LOCAL INFILE succeeded.")
                 except Exception as e:
                     print(f"   - stg_churn_score LOCAL INFILE failed ({e}); fallback to row-by-row.")
+                    method = "row_by_row"
                     insert_sql = """
                     INSERT INTO stg_churn_score (customer_id, churn_probability)
                     VALUES (%s, %s)
@@ -370,7 +410,10 @@ def main():
                                             _scored_at=CURRENT_TIMESTAMP
                     """
                     expected_cols = ["customer_id", "churn_probability"]
-                    load_csv_row_by_row(cur, "stg_churn_score", SCORE_CSV, insert_sql, expected_cols)
+                    load_csv_row_by_row(cur, "stg_churn_score", score_csv, insert_sql, expected_cols)
+                cur.execute("SELECT COUNT(*) FROM stg_churn_score")
+                INGEST_ROWS.inc(cur.fetchone()[0], table="stg_churn_score", method=method)
+                INGEST_SECONDS.observe(time.perf_counter() - t_load, table="stg_churn_score", method=method)
 
                 # 점수 ID 정규화(RowNumber → CustomerId)
                 print(">> Normalize stg_churn_score IDs (RowNumber -> CustomerId if applicable)...")
@@ -391,10 +434,16 @@ def main():
         print("✅ Done. Tables created and data loaded:")
         print(" - stg_bank_churn")
         print(" - rfm_result_once")
-        if SCORE_CSV and Path(SCORE_CSV).exists():
+        if score_csv and Path(score_csv).exists():
             print(" - stg_churn_score (ID normalized if needed)")
     finally:
         conn.close()
+        metrics.flush()
 
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description="CSV → MySQL 최초 적재 (bank_customer / rfm_result_once / stg_churn_score)")
+    ap.add_argument("--scale", type=float, default=1.0,
+                    help="부하 테스트: 원본 분포로 원본 행 수 × scale 만큼 합성 고객을 만들어 적재(예: 100)")
+    ap.add_argument("--workers", type=int, default=1, help="--scale 합성 데이터 생성 병렬 프로세스 수")
+    args = ap.parse_args()
+    main(scale=args.scale, workers=args.workers)
@@ -1,5 +1,9 @@
 # 3-application/pages/app_bootstrap.py
+import os
+import sys
+from pathlib import Path
 import streamlit as st
+from utils.perf import metrics, page_profile
 
 def hide_builtin_nav():
     """Streamlit 기본 멀티페이지 네비(상단 자동 목록) 숨김 + 사이드바 정돈"""
@@ -14,7 +18,7 @@ def hide_builtin_nav():
     """, unsafe_allow_html=True)
 
 def render_sidebar():
-    """BCMS 공통 사이드바"""
+    """BCMS 공통 사이드바 (+ 프로파일 모드면 ⏱️ 패널: PAGE_PROFILE=1 또는 ?profile=1)"""
     with st.sidebar:
         st.header("BCMS")
         st.page_link("main.py", label="홈", icon="🏠")
@@ -24,3 +28,9 @@ def render_sidebar():
         st.page_link("pages/data_tool.py", label="데이터 도구", icon="🧰")
         st.write("---")
         st.caption("© 2025 BCMS")
+    # 호출한 페이지 스크립트 이름(main / user_list / …)으로 rerun 프로파일 시작
+    page_profile.begin(Path(sys._getframe(1).f_code.co_filename).stem)
+    # 지표: METRICS_PORT 지정 시 /metrics 서버(프로세스당 1회), 아니면 textfile로 주기 저장
+    if os.getenv("METRICS_PORT"):
+        metrics.start_http_server(metrics.METRICS_PORT)
+    metrics.flush(min_interval_s=10)
@@ -6,6 +6,7 @@ from streamlit import column_config as cc
 from sqlalchemy import create_engine, text
 from utils.ui.ui_tools import metric_with_tooltip, ensure_ui_css, render_segment_kpis
 from pages.app_bootstrap import hide_builtin_nav, render_sidebar  # 필수
+from utils.perf.page_profile import cache_data, profiled, timer  # ?profile=1 구간 측정
 
 # ───────────────────────────────────────────────────────────────
 # LLM 추천 래퍼
@@ -48,7 +49,7 @@ ENGINE = create_engine(
 # =========================
 # Data Access
 # =========================
-@st.cache_data(show_spinner=False)
+@cache_data(show_spinner=False)
 def load_rfm_joined():
     """
     1) vw_rfm_for_app 뷰가 있으면 사용
@@ -189,6 +190,7 @@ def seg_label(code: str) -> str:
 if "selected_segment" not in st.session_state:
     st.session_state.selected_segment = None
 
+@profiled("chart")
 def make_layout(seg, df_seg):
     color = seg_color_alpha(seg)
     st.markdown(
@@ -270,7 +272,8 @@ if seg:
             seg_df[col] = pd.to_numeric(seg_df[col], errors="coerce")
 
     # KPIs
-    render_segment_kpis(seg_df)
+    with timer("chart", "segment_kpis"):
+        render_segment_kpis(seg_df)
 
     # 표 데이터
     show_cols = [
@@ -349,22 +352,23 @@ if seg:
 
     # 표 렌더
     # st.dataframe(display_df, use_container_width=True, height=520)
-    st.dataframe(
-        view_df[show_cols],
-        use_container_width=True,
-        height=520,
-        column_config={
-            "customer_id": cc.Column("고객ID"),
-            "surname": cc.Column("이름(성)"),
-            "r_score": cc.NumberColumn("R 점수", format="%.1f"),
-            "f_score": cc.NumberColumn("F 점수", format="%.1f"),
-            "m_score": cc.NumberColumn("M 점수", format="%.1f"),
-            "churn_probability": cc.NumberColumn("이탈확률", format="%.2f %%"),
-            "monetary_90d": cc.NumberColumn("최근 잔액", format="€%.2f"),
-            "recency_days": cc.NumberColumn("최근 거래일", format="%d"),
-            "frequency_90d": cc.NumberColumn("최근 거래일", format="%d"),
-        }
-    )
+    with timer("chart", "segment_table", rows=len(view_df)):
+        st.dataframe(
+            view_df[show_cols],
+            use_container_width=True,
+            height=520,
+            column_config={
+                "customer_id": cc.Column("고객ID"),
+                "surname": cc.Column("이름(성)"),
+                "r_score": cc.NumberColumn("R 점수", format="%.1f"),
+                "f_score": cc.NumberColumn("F 점수", format="%.1f"),
+                "m_score": cc.NumberColumn("M 점수", format="%.1f"),
+                "churn_probability": cc.NumberColumn("이탈확률", format="%.2f %%"),
+                "monetary_90d": cc.NumberColumn("최근 잔액", format="€%.2f"),
+                "recency_days": cc.NumberColumn("최근 거래일", format="%d"),
+                "frequency_90d": cc.NumberColumn("최근 거래일", format="%d"),
+            }
+        )
 
     file_suffix = "top10" if view_mode == "top10" else "all"
     st.download_button(
@@ -390,7 +394,8 @@ if seg:
     }
 
     if recommend_for_segment is not None:
-        seg_reco = recommend_for_segment(seg, stats)
+        with timer("llm", "recommend_for_segment"):
+            seg_reco = recommend_for_segment(seg, stats)
     else:
         bundle = SEGMENT_BUNDLES.get(seg, [])
         seg_reco = {
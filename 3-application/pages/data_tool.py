@@ -1,9 +1,9 @@
 # 3-application/pages/data_tool.py
-import os, sys, io, time, contextlib
+import os, sys, time
 from pathlib import Path
 import streamlit as st
-from db.csv_to_db import main as do_csv_to_db
 from pages.app_bootstrap import hide_builtin_nav, render_sidebar
+from service import jobs
 
 APP_ROOT = Path(__file__).resolve().parents[1]
 if str(APP_ROOT) not in sys.path:
@@ -90,43 +90,6 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# ───────────────────────────────────────────────────────────────
-# 실행 헬퍼: 기존 로직 유지 + (선택) 외부 로그 placeholder
-def run_task(label, fn, *args, capture_log=False, hide_log_on_done=False, log_placeholder=None, **kwargs):
-    log_box = log_placeholder if capture_log else None
-    tee = None; success=False
-
-    if capture_log and log_box is None:
-        st.write("🔎 실행 로그")
-        log_box = st.empty()
-
-    if capture_log:
-        class _Tee(io.TextIOBase):
-            def __init__(self, ph): self.ph=ph; self.buf=[]; self.t=0.0
-            def write(self, s):
-                if not isinstance(s,str): s=s.decode("utf-8","ignore")
-                self.buf.append(s); now=time.time()
-                if ("\n" in s) or (now-self.t>0.15):
-                    text="".join(self.buf)
-                    if len(text)>4000: text="…(truncated)…\\n"+text[-4000:]
-                    self.ph.code(text, language="bash"); self.t=now
-                return len(s)
-            def flush(self): ...
-        tee = _Tee(log_box)
-
-    try:
-        if capture_log:
-            with contextlib.redirect_stdout(tee), contextlib.redirect_stderr(tee):
-                with st.spinner(f"{label} 실행 중…"): result = fn(*args, **kwargs)
-        else:
-            with st.spinner(f"{label} 실행 중…"): result = fn(*args, **kwargs)
-        success=True; st.toast(f"✅ {label} 완료", icon="✅"); return result
-    except Exception as e:
-        st.error(f"❌ {label} 실패: {e}"); st.exception(e)
-    finally:
-        if capture_log and hide_log_on_done and success and (log_placeholder is None) and log_box:
-            time.sleep(.8); log_box.empty()
-
 # ───────────────────────────────────────────────────────────────
 def _need_ingest_base_tables()->bool:
     import pymysql
@@ -142,24 +105,37 @@ def _need_ingest_base_tables()->bool:
         return not(has_customer and has_rfm)
     finally: conn.close()
 
-def ensure_ingest_if_needed():
-    if _need_ingest_base_tables():
-        st.info("기초 테이블이 없어 CSV 적재부터 수행합니다.")
-        run_task("CSV 적재", do_csv_to_db, capture_log=True, hide_log_on_done=True)
-
-def do_train_and_score(write_db=True, create_view=True):
-    import importlib
-    os.environ["WRITE_DB"]="true" if write_db else "false"
-    os.environ["CREATE_VIEW"]="true" if create_view else "false"
-    os.environ.setdefault("N_FOLDS","5"); os.environ.setdefault("RANDOM_STATE","42")
-    import service.full_scoring as full_scoring
-    importlib.reload(full_scoring); full_scoring.main()
-    models_dir=APP_ROOT/"models"; latest_path=None
-    try:
-        latest=max(models_dir.glob("best_model_*.pkl"), key=lambda p:p.stat().st_mtime); latest_path=str(latest)
-    except ValueError: pass
-    scores_csv=str(APP_ROOT/"assets"/"data"/"churn_scores.csv")
-    return {"model_pkl": latest_path, "scores_csv": scores_csv}
+def latest_profile_path():
+    try: return max((APP_ROOT/"models").glob("best_model_*.profile.json"), key=lambda p:p.stat().st_mtime)
+    except ValueError: return None
+
+def render_profile(path):
+    """<model>.profile.json → 단계별 타임라인(가로 막대, start~end) + 단계별 합계 표."""
+    import pandas as pd
+    import plotly.graph_objects as go
+    from utils.perf import load_profile, summarize, span_depths
+    prof=load_profile(path); spans=prof.get("spans", [])
+    if not spans:
+        st.info("기록된 단계가 없습니다."); return
+    depth=span_depths(prof)
+    rows=[{"단계": "\u2003"*depth[s["id"]] + s["name"]
+                 + "".join(f" · {k}={v}" for k,v in s.get("attrs",{}).items() if k in ("variant","fold")),
+           "start": s["start_s"], "wall": s["wall_s"], "cpu": s["cpu_s"],
+           "rss": s.get("rss_end_mb"), "depth": depth[s["id"]]} for s in spans]
+    df=pd.DataFrame(rows)
+    fig=go.Figure(go.Bar(
+        y=df["단계"], x=df["wall"], base=df["start"], orientation="h",
+        marker_color=[["#4f7cff","#21c17a","#ffb547"][min(d,2)] for d in df["depth"]],
+        customdata=df[["cpu","rss"]].values,
+        hovertemplate="%{y}<br>start %{base:.2f}s · wall %{x:.2f}s<br>cpu %{customdata[0]:.2f}s · rss %{customdata[1]} MB<extra></extra>",
+    ))
+    fig.update_layout(height=min(80+22*len(df), 900), margin=dict(l=10,r=10,t=30,b=10),
+                      xaxis_title="초(실행 시작 기준)", yaxis=dict(autorange="reversed"),
+                      title=f"{prof.get('run')} · 총 {prof.get('wall_s',0):.1f}s · peak RSS {prof.get('peak_rss_mb')} MB")
+    st.plotly_chart(fig, width="stretch")
+    st.dataframe(pd.DataFrame(summarize(prof)).rename(columns={
+        "name":"단계","count":"횟수","wall_s":"wall(s)","self_s":"self(s)","cpu_s":"cpu(s)",
+        "peak_rss_growth_mb":"peak RSS 증가(MB)","share":"비율"}), hide_index=True, width="stretch")
 
 def collect_status():
     needs=_need_ingest_base_tables()
@@ -171,6 +147,81 @@ def collect_status():
     return {"db_ready": not needs, "host": host, "user": user, "db": db,
             "latest_model": latest, "scores_exists": scores_csv}
 
+# ───────────────────────────────────────────────────────────────
+# 백그라운드 작업: 제출 → job_id를 세션에 보관 → 상태/로그 폴링(학습은 워커 프로세스에서 실행)
+_STATUS_CHIP={"queued":("warn","대기"),"running":("warn","실행 중"),"succeeded":("ok","완료"),
+              "failed":("warn","실패"),"cancelled":("warn","취소됨"),"lost":("warn","중단됨")}
+LOG_TAIL_CHARS=4000
+
+def submit_job(kind, **params):
+    job_id=jobs.submit(kind, **params)
+    st.session_state["bcms_job_id"]=job_id
+    st.session_state["bcms_job_log"]={"id": job_id, "offset": 0, "text": ""}
+    return job_id
+
+def _poll_log(job_id):
+    """이전 offset 이후 로그만 읽어 세션 버퍼에 이어붙임(끝 LOG_TAIL_CHARS자 유지)."""
+    buf=st.session_state.get("bcms_job_log")
+    if not buf or buf["id"]!=job_id:
+        buf={"id": job_id, "offset": 0, "text": ""}
+    text, buf["offset"]=jobs.read_log(job_id, buf["offset"])
+    buf["text"]=(buf["text"]+text)[-LOG_TAIL_CHARS:]
+    st.session_state["bcms_job_log"]=buf
+    return buf["text"]
+
+def _job_panel_body(job_id):
+    job=jobs.get(job_id)
+    if job is None:
+        st.info("작업 정보를 찾을 수 없습니다."); return
+    cls, label=_STATUS_CHIP.get(job["status"], ("warn", job["status"]))
+    st.markdown(f'<div class="chips"><span class="chip {cls}">{label}</span>'
+                f'<span class="chip">{job["kind"]} · {job_id}</span></div>', unsafe_allow_html=True)
+    active=job["status"] in jobs.ACTIVE
+    if active:
+        step=f' · {job["step"]}' if job.get("step") else ""
+        st.progress(float(job.get("progress") or 0.0),
+                    text=("다른 작업이 끝나길 기다리는 중…" if job["status"]=="queued" else f"진행 {job['progress']:.0%}{step}"))
+        st.button("⏹ 작업 취소", key=f"cancel_{job_id}", on_click=jobs.cancel, args=(job_id,))
+    log_text=_poll_log(job_id)
+    st.code(("…(truncated)…\n" if len(log_text)>=LOG_TAIL_CHARS else "")+log_text or "(로그 대기 중)", language="bash")
+    if active:
+        return
+    if st.session_state.get("bcms_job_done")!=job_id:
+        # 종료 감지 → 전체 rerun으로 시스템 상태/최근 프로파일 갱신 + 폴링 중단
+        st.session_state["bcms_job_done"]=job_id
+        try: st.rerun()
+        except AttributeError: st.experimental_rerun()
+    if job["status"]=="succeeded":
+        res=job.get("result") or {}
+        if job["kind"]=="train_and_score":
+            st.success("모델/스코어 생성 완료!")
+            st.write("• 모델 파일:", res.get("model_pkl") or "(생성 확인 필요)")
+            st.write("• 이탈 스코어 CSV:", res.get("scores_csv"))
+            if res.get("profile") and Path(res["profile"]).exists():
+                st.markdown("#### ⏱️ 단계별 소요 시간")
+                render_profile(res["profile"])
+        else:
+            st.success("CSV 적재 완료!")
+    elif job["status"]=="cancelled":
+        st.warning("작업이 취소되었습니다.")
+    else:
+        st.error(f"❌ 작업 실패: {job.get('error') or job['status']}")
+
+def job_panel(job_id):
+    """실행/대기 중이면 1초 주기 fragment로 해당 블록만 갱신(페이지 나머지는 그대로 응답)."""
+    job=jobs.get(job_id)
+    if job and job["status"] in jobs.ACTIVE and hasattr(st, "fragment"):
+        st.fragment(run_every=1.0)(_job_panel_body)(job_id)
+    else:
+        _job_panel_body(job_id)
+
+def render_recent_jobs():
+    import pandas as pd
+    rows=[{"job_id": j["id"], "종류": j["kind"], "상태": j["status"], "진행": f"{j.get('progress') or 0:.0%}",
+           "등록": j["created_at"], "종료": j.get("finished_at")} for j in jobs.list_jobs(limit=10)]
+    if rows: st.dataframe(pd.DataFrame(rows), hide_index=True, width="stretch")
+    else: st.caption("작업 기록이 없습니다.")
+
 # ───────────────────────────────────────────────────────────────
 # 상태/로그 모드
 st.session_state.setdefault("bcms_do_db", True)
@@ -193,6 +244,15 @@ with col_action:
         st.markdown('<div class="help">실행 전 Docker/DB 연결 상태를 확인하세요.</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+if run_clicked:
+    do_db=st.session_state["bcms_do_db"]
+    submit_job("train_and_score", write_db=do_db, create_view=do_db,
+               ingest=do_db and _need_ingest_base_tables())
+    st.toast("학습/스코어링 작업을 등록했습니다.", icon="🚀")
+    if st.session_state["log_mode"]=="팝업 로그":
+        st.session_state["__show_modal"]=True
+job_id=st.session_state.get("bcms_job_id")
+
 # 본문 레이아웃
 left, right = st.columns([7,5], gap="large")
 
@@ -201,7 +261,13 @@ with left:
     # 인라인 로그 카드 자리 고정
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("### 실행 로그")
-    inline_log = st.empty()
+    if job_id and st.session_state["log_mode"]=="인라인 로그":
+        job_panel(job_id)
+    elif job_id:
+        st.caption(f"작업 {job_id} · 로그는 팝업에서 확인하세요.")
+        if st.button("로그 열기"): st.session_state["__show_modal"]=True
+    else:
+        st.caption("실행 중인 작업이 없습니다.")
     st.markdown("</div>", unsafe_allow_html=True)
 
     # 안내(문서 스타일)
@@ -210,6 +276,7 @@ with left:
     st.markdown("""
     - **DB 적재 + 뷰 생성**이 켜져 있으면 기초 테이블 부재 시 CSV를 자동 적재합니다.  
     - **모델 학습/스코어링**은 교차검증 후 최적 모델을 저장하고 `churn_scores.csv`를 생성합니다.  
+    - 작업은 백그라운드 프로세스에서 실행되며 한 번에 하나씩 처리됩니다(다른 작업 중이면 *대기*).  
     - **로그 표시**는 *인라인* 또는 *팝업* 중에서 선택할 수 있습니다.  
     """)
     st.markdown("</div>", unsafe_allow_html=True)
@@ -220,7 +287,9 @@ with left:
         with c1:
             if st.button("📥 CSV → DB 적재", use_container_width=True,
                          help="데이터셋을 가공하고 DB에 적재합니다 (Docker 필수)"):
-                run_task("CSV 적재", do_csv_to_db, capture_log=True, hide_log_on_done=True)
+                submit_job("ingest")
+                try: st.rerun()
+                except AttributeError: st.experimental_rerun()
         with c2:
             if st.button("♻️ 예비 버튼", use_container_width=True, help="예비 호출 자리"):
                 st.toast("예비 작업 슬롯입니다.", icon="🛠️")
@@ -243,61 +312,41 @@ with right:
         except AttributeError: st.experimental_rerun()
     st.markdown("</div>", unsafe_allow_html=True)
 
+    prof_path=latest_profile_path()
+    if prof_path is not None:
+        with st.expander(f"⏱️ 최근 실행 프로파일 · {prof_path.name}", expanded=False):
+            render_profile(prof_path)
+
+    with st.expander("🗂️ 최근 작업", expanded=False):
+        render_recent_jobs()
+
 st.write("---"); st.caption("© 2025 BCMS")
 
 # ───────────────────────────────────────────────────────────────
-# 실행 트리거: 인라인/팝업 모드 처리
-def _execute_with_inline():
-    if st.session_state["bcms_do_db"]:
-        ensure_ingest_if_needed()
-    res = run_task("모델 학습/스코어링", do_train_and_score,
-                   write_db=st.session_state["bcms_do_db"],
-                   create_view=st.session_state["bcms_do_db"],
-                   capture_log=True, hide_log_on_done=False,
-                   log_placeholder=inline_log)
-    if res:
-        st.success("모델/스코어 생성 완료!")
-        st.write("• 모델 파일:", res.get("model_pkl") or "(생성 확인 필요)")
-        st.write("• 이탈 스코어 CSV:", res.get("scores_csv"))
-
-def _execute_with_modal():
-    if hasattr(st, "dialog"):
+# 팝업 로그: dialog(신버전) / 오버레이(구버전)
+if job_id and st.session_state.get("__show_modal"):
+    st.session_state["__show_modal"]=False
+    if HAS_DIALOG:
         @st.dialog("실행 로그", width="large")
         def _modal():
-            ph = st.empty()
-            if st.session_state["bcms_do_db"]:
-                ensure_ingest_if_needed()
-            run_task("모델 학습/스코어링", do_train_and_score,
-                     write_db=st.session_state["bcms_do_db"],
-                     create_view=st.session_state["bcms_do_db"],
-                     capture_log=True, hide_log_on_done=False,
-                     log_placeholder=ph)
-            st.button("닫기", use_container_width=True, on_click=lambda: (st.rerun() if hasattr(st,"rerun") else st.experimental_rerun()))
+            job_panel(job_id)
+            st.button("닫기", use_container_width=True)
         _modal()
     else:
-        # 폴백 오버레이
         st.session_state["__show_overlay"]=True
 
-if run_clicked:
-    if st.session_state["log_mode"]=="팝업 로그" and HAS_DIALOG:
-        _execute_with_modal()
-    else:
-        _execute_with_inline()
-
-# 폴백 오버레이 렌더링(구버전)
-if st.session_state.get("__show_overlay"):
+if job_id and st.session_state.get("__show_overlay"):
     st.markdown('<div class="overlay"><div class="panel">', unsafe_allow_html=True)
     st.markdown("#### 실행 로그")
-    ph=st.empty()
-    if st.session_state["bcms_do_db"]:
-        ensure_ingest_if_needed()
-    run_task("모델 학습/스코어링", do_train_and_score,
-             write_db=st.session_state["bcms_do_db"],
-             create_view=st.session_state["bcms_do_db"],
-             capture_log=True, hide_log_on_done=False,
-             log_placeholder=ph)
+    _job_panel_body(job_id)
     if st.button("닫기", use_container_width=True):
         st.session_state["__show_overlay"]=False
         try: st.rerun()
         except AttributeError: st.experimental_rerun()
     st.markdown("</div></div>", unsafe_allow_html=True)
+
+# fragment 미지원 구버전: 작업이 끝날 때까지 전체 rerun으로 폴링
+if job_id and not hasattr(st, "fragment") and (jobs.get(job_id) or {}).get("status") in jobs.ACTIVE:
+    time.sleep(1.0)
+    try: st.rerun()
+    except AttributeError: st.experimental_rerun()
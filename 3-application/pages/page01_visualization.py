@@ -3,12 +3,10 @@ import sys
 import numpy as np
 import pandas as pd
 import streamlit as st
-from sqlalchemy import create_engine, text
 from pathlib import Path
 from pages.app_bootstrap import hide_builtin_nav, render_sidebar
-from sklearn.metrics import classification_report
-import plotly.express as px
-import plotly.graph_objects as go
+from utils.perf.page_profile import profiled, timer  # ?profile=1 구간 측정
+# sqlalchemy/plotly/sklearn/catboost는 실제 쓰는 구간에서 import (스코어/라벨이 없어 멈추는 경로는 비용 없음)
 
 # ─────────────────────────────────────────────────────────────
 # 기본 설정
@@ -120,8 +118,9 @@ with tab1:
                     st.info(f"표시할 이미지가 없습니다: {target_dir}")
                 else:
                     col_a, col_b = st.columns(2)
-                    for idx, img_path in enumerate(image_paths):
-                        (col_a if idx % 2 == 0 else col_b).image(img_path, caption=img_path.stem, width="stretch")
+                    with timer("chart", f"eda_images_{subdir}", n=len(image_paths)):
+                        for idx, img_path in enumerate(image_paths):
+                            (col_a if idx % 2 == 0 else col_b).image(img_path, caption=img_path.stem, width="stretch")
 
 # ======================================================================
 # 2) Modeling 탭
@@ -162,7 +161,9 @@ with tab2:
     # ------------------------------------------------------------
     # 헬퍼
     # ------------------------------------------------------------
+    @profiled("data")
     def get_engine():
+        from sqlalchemy import create_engine, text
         try:
             url = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
             eng = create_engine(url, pool_pre_ping=True)
@@ -176,6 +177,7 @@ with tab2:
     def table_exists(engine, tbl):
         if engine is None:
             return False
+        from sqlalchemy import text
         try:
             with engine.connect() as conn:
                 q = text("""
@@ -188,6 +190,7 @@ with tab2:
         except Exception:
             return False
 
+    @profiled("data")
     def load_scores():
         """우선순위: DB → CSV → None"""
         src = None
@@ -223,6 +226,15 @@ with tab2:
         with open(path, "rb") as f:
             return pickle.load(f)
 
+    @profiled("data")
+    def load_model_any(path):
+        """추론 전용 .npz가 있으면 catboost import/unpickle 없이 로드, 없으면 pkl."""
+        npz = path.with_suffix(".npz")
+        if npz.exists():
+            from service.model_export import CompiledModel
+            return CompiledModel(npz)
+        return load_model_pickle(path)
+
     # ------------------------------------------------------------
     # 데이터/모델 로드
     # ------------------------------------------------------------
@@ -231,7 +243,7 @@ with tab2:
     model = None
     if latest_model_path is not None:
         try:
-            model = load_model_pickle(latest_model_path)
+            model = load_model_any(latest_model_path)
         except Exception as e:
             st.warning(f"모델 로드 실패({latest_model_path.name}): {e}")
 
@@ -252,6 +264,8 @@ with tab2:
         st.error("필수 컬럼(customer_id, churn_probability)을 찾지 못했습니다.")
         st.stop()
 
+    import plotly.express as px          # 스코어가 있을 때만(아래 차트 구간)
+    import plotly.graph_objects as go
     df = df_scores.rename(columns={id_col: "customer_id", prob_col: "churn_probability"}).copy()
     df["churn_probability"] = df["churn_probability"].astype(float)
 
@@ -261,7 +275,7 @@ with tab2:
     df["Risk"] = (df["churn_probability"] >= thr).astype(int)
 
     # KPI (← 이 부분은 .card 그대로 유지해서 배경 보이게)
-    model_name = getattr(getattr(model, "__class__", None), "__name__", "N/A")
+    model_name = getattr(model, "model_class", None) or getattr(getattr(model, "__class__", None), "__name__", "N/A")
     colA, colB, colC, colD = st.columns([1.6,1,1,1])
     with colA:
         st.markdown('<div class="card"><div class="metric-title">최종 선택 모델</div>'
@@ -285,8 +299,10 @@ with tab2:
     df_meta = None
     if load_csv_from_data and engineer_features:
         try:
-            raw = load_csv_from_data()           # Customer-Churn-Records.csv 자동 탐색
-            meta = engineer_features(raw).copy() # 학습 파이프라인 동일
+            with timer("data", "load_csv_from_data"):
+                raw = load_csv_from_data()           # Customer-Churn-Records.csv 자동 탐색
+            with timer("transform", "engineer_features", rows=len(raw)):
+                meta = engineer_features(raw).copy() # 학습 파이프라인 동일
 
             # CustomerId → customer_id 로 안전히 합치기 (중복 방지)
             if "CustomerId" in raw.columns:
@@ -311,7 +327,34 @@ with tab2:
         st.markdown('<div class="card ghost">', unsafe_allow_html=True)
 
         fi_ok = False
-        if model is not None and df_meta is not None:
+        explain_global = None
+        if latest_model_path is not None:
+            try:
+                # 스코어링 때 모델당 1회 저장한 평균 |SHAP|(service/explain_batch.py) — 파일 읽기만
+                from service.explain_batch import load_global
+                explain_global = load_global(latest_model_path)
+            except Exception:
+                explain_global = None
+        if explain_global is not None:
+            with timer("chart", "feature_importance"):
+                fi = (pd.DataFrame({"Feature": explain_global["features"],
+                                    "Importance": explain_global["mean_abs_shap"]})
+                      .sort_values("Importance").tail(20))
+                fig_fi = px.bar(fi, x="Importance", y="Feature", orientation="h", height=420,
+                                labels={"Importance": "평균 |SHAP|"})
+                fig_fi.update_layout(margin=dict(l=8,r=8,t=6,b=6), showlegend=False)
+                st.plotly_chart(fig_fi, width="stretch")
+            fi_ok = True
+        elif model is not None and hasattr(model, "feature_importance"):
+            # .npz에 저장된 학습 시점 Feature Importance 사용(catboost 불필요)
+            with timer("chart", "feature_importance"):
+                fi = (pd.DataFrame({"Feature": model.feature_names, "Importance": model.feature_importance})
+                      .sort_values("Importance").tail(20))
+                fig_fi = px.bar(fi, x="Importance", y="Feature", orientation="h", height=420)
+                fig_fi.update_layout(margin=dict(l=8,r=8,t=6,b=6), showlegend=False)
+                st.plotly_chart(fig_fi, width="stretch")
+            fi_ok = True
+        elif model is not None and df_meta is not None:
             try:
                 from catboost import Pool
                 feature_cols = [c for c in RECOMMENDED_COLS if c in df_meta.columns]
@@ -322,14 +365,16 @@ with tab2:
                         X_tmp[c] = X_tmp[c].astype(str).fillna("NA")
                     for c in X_tmp.columns.difference(cat_cols):
                         X_tmp[c] = pd.to_numeric(X_tmp[c], errors="coerce").fillna(0)
-                    pool = Pool(X_tmp, cat_features=[X_tmp.columns.get_loc(c) for c in cat_cols])
-                    importances = model.get_feature_importance(pool)
+                    with timer("transform", "catboost_feature_importance"):
+                        pool = Pool(X_tmp, cat_features=[X_tmp.columns.get_loc(c) for c in cat_cols])
+                        importances = model.get_feature_importance(pool)
                     if len(importances) == len(feature_cols):
                         fi = (pd.DataFrame({"Feature": feature_cols, "Importance": importances})
                               .sort_values("Importance").tail(20))
-                        fig_fi = px.bar(fi, x="Importance", y="Feature", orientation="h", height=420)
-                        fig_fi.update_layout(margin=dict(l=8,r=8,t=6,b=6), showlegend=False)
-                        st.plotly_chart(fig_fi, width="stretch")
+                        with timer("chart", "feature_importance"):
+                            fig_fi = px.bar(fi, x="Importance", y="Feature", orientation="h", height=420)
+                            fig_fi.update_layout(margin=dict(l=8,r=8,t=6,b=6), showlegend=False)
+                            st.plotly_chart(fig_fi, width="stretch")
                         fi_ok = True
             except Exception:
                 fi_ok = False
@@ -362,10 +407,11 @@ with tab2:
             if c in top.columns:
                 fmt[c] = "{:,.0f}"
 
-        try:
-            st.dataframe(top[show_cols].style.format(fmt), height=420, width="stretch")
-        except Exception:
-            st.dataframe(top[show_cols], height=420, width="stretch")
+        with timer("chart", "top50_table"):
+            try:
+                st.dataframe(top[show_cols].style.format(fmt), height=420, width="stretch")
+            except Exception:
+                st.dataframe(top[show_cols], height=420, width="stretch")
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -384,9 +430,10 @@ with tab2:
         gcol = next((c for c in df_risk.columns if c.lower() in ["gender","sex"]), None)
         if gcol and not df_risk.empty:
             g = df_risk[gcol].astype(str).value_counts().rename_axis("Gender").reset_index(name="Count")
-            fig = px.pie(g, names="Gender", values="Count", height=240, hole=.45)
-            fig.update_layout(margin=dict(l=6,r=6,t=6,b=6), showlegend=True)
-            st.plotly_chart(fig, width="stretch")
+            with timer("chart", "risk_gender_pie"):
+                fig = px.pie(g, names="Gender", values="Count", height=240, hole=.45)
+                fig.update_layout(margin=dict(l=6,r=6,t=6,b=6), showlegend=True)
+                st.plotly_chart(fig, width="stretch")
         else:
             st.markdown('<div class="placeholder">🙈 <span class="small">표시할 성별 컬럼이 없습니다.</span></div>',
                         unsafe_allow_html=True)
@@ -403,10 +450,11 @@ with tab2:
                       "독일":(51.16,10.45), "프랑스":(46.23,2.21), "스페인":(40.46,-3.75)}
             geo["lat"] = geo["Country"].map(lambda x: latlon.get(x, (0,0))[0])
             geo["lon"] = geo["Country"].map(lambda x: latlon.get(x, (0,0))[1])
-            fig = px.scatter_geo(geo, lat="lat", lon="lon", size="Count",
-                                 hover_name="Country", projection="natural earth", height=240)
-            fig.update_layout(margin=dict(l=6,r=6,t=6,b=6), showlegend=False)
-            st.plotly_chart(fig, width="stretch")
+            with timer("chart", "risk_geo_map"):
+                fig = px.scatter_geo(geo, lat="lat", lon="lon", size="Count",
+                                     hover_name="Country", projection="natural earth", height=240)
+                fig.update_layout(margin=dict(l=6,r=6,t=6,b=6), showlegend=False)
+                st.plotly_chart(fig, width="stretch")
         else:
             st.markdown('<div class="placeholder">🗺️ <span class="small">표시할 국가/지역 컬럼이 없습니다.</span></div>',
                         unsafe_allow_html=True)
@@ -420,10 +468,11 @@ with tab2:
         if pcol and not df_risk.empty:
             prod = df_risk[pcol].astype(str).value_counts().sort_index().reset_index()
             prod.columns = ["Products","Count"]
-            fig = px.bar(prod, x="Products", y="Count", height=240,
-                         color="Count", color_continuous_scale="Reds")
-            fig.update_layout(coloraxis_showscale=False, margin=dict(l=8,r=8,t=8,b=8))
-            st.plotly_chart(fig, width="stretch")
+            with timer("chart", "risk_products_bar"):
+                fig = px.bar(prod, x="Products", y="Count", height=240,
+                             color="Count", color_continuous_scale="Reds")
+                fig.update_layout(coloraxis_showscale=False, margin=dict(l=8,r=8,t=8,b=8))
+                st.plotly_chart(fig, width="stretch")
         else:
             st.markdown('<div class="placeholder">📦 <span class="small">표시할 보유상품수 컬럼이 없습니다.</span></div>',
                         unsafe_allow_html=True)
@@ -446,10 +495,11 @@ with tab2:
             ["Excellent","Good","Fair","Poor","Very Poor"]
         ).fillna(0).reset_index()
         cred.columns = ["Grade","Count"]
-        fig = px.bar(cred, x="Grade", y="Count", height=260,
-                     color="Count", color_continuous_scale="Reds")
-        fig.update_layout(coloraxis_showscale=False, margin=dict(l=10,r=10,t=10,b=10))
-        st.plotly_chart(fig, width="stretch")
+        with timer("chart", "risk_credit_bar"):
+            fig = px.bar(cred, x="Grade", y="Count", height=260,
+                         color="Count", color_continuous_scale="Reds")
+            fig.update_layout(coloraxis_showscale=False, margin=dict(l=10,r=10,t=10,b=10))
+            st.plotly_chart(fig, width="stretch")
     else:
         st.markdown('<div class="placeholder">💳 <span class="small">표시할 신용점수 컬럼이 없습니다.</span></div>',
                     unsafe_allow_html=True)
@@ -463,8 +513,6 @@ with tab2:
     b1, b2, b3 = st.columns([1.0, 1.2, 1.3])
 
     # ----- 성능계산 준비 (y_true, y_pred가 만들어진 뒤 정확도 계산) -----
-    from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-
     # 라벨 컬럼 찾기
     y_col = None
     if df_meta is not None:
@@ -476,6 +524,8 @@ with tab2:
     # 정확도 계산 (있을 때만)
     acc_str = "N/A"
     if y_col:
+        # sklearn.metrics import ~1s → 정답 라벨이 있을 때만
+        from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
         df_eval = pd.merge(df, df_meta[["customer_id", y_col]], on="customer_id", how="inner")
         y_true = df_eval[y_col].astype(int)
         y_pred = (df_eval["churn_probability"] >= thr).astype(int)
@@ -530,13 +580,14 @@ with tab2:
         with b3:
             st.markdown('<div class="card ghost">', unsafe_allow_html=True)
             st.caption("혼동행렬(%)")
-            fig_cm = go.Figure(data=go.Heatmap(
-                z=z, x=["Pred=1", "Pred=0"], y=["True=1", "True=0"],
-                colorscale="Blues", text=z.astype(str) + "%", texttemplate="%{text}",
-                showscale=False, hoverinfo="skip"
-            ))
-            fig_cm.update_layout(height=240, margin=dict(l=10, r=10, t=10, b=10))
-            st.plotly_chart(fig_cm, width="stretch")
+            with timer("chart", "confusion_matrix"):
+                fig_cm = go.Figure(data=go.Heatmap(
+                    z=z, x=["Pred=1", "Pred=0"], y=["True=1", "True=0"],
+                    colorscale="Blues", text=z.astype(str) + "%", texttemplate="%{text}",
+                    showscale=False, hoverinfo="skip"
+                ))
+                fig_cm.update_layout(height=240, margin=dict(l=10, r=10, t=10, b=10))
+                st.plotly_chart(fig_cm, width="stretch")
             st.markdown('</div>', unsafe_allow_html=True)
     else:
         with b2:
@@ -1,19 +1,22 @@
 import os
+import time
 import streamlit as st
 import pandas as pd
 from pathlib import Path
 from pages.app_bootstrap import hide_builtin_nav, render_sidebar  # 필수
-from st_aggrid import AgGrid, GridOptionsBuilder  # 리스트 클릭 상호작용
+from utils.perf.page_profile import cache_data, profiled, timer  # ?profile=1 구간 측정
 from dotenv import load_dotenv
-import pymysql
+# st_aggrid(그리드 렌더)·pymysql(DB 조회)은 사용하는 코드 경로에서 import — 페이지 시작 비용 절감
 
 # ───────────────────────────────────────────────────────────────
 # LLM 추천 래퍼 (키가 없거나 에러여도 내부 폴백으로 안전 동작)
 try:
-    from utils.llm.reco_templates import recommend_for_user, PRODUCT_CATALOG
+    from utils.llm.reco_templates import (recommend_for_user_stream, recommend_for_users_bulk,
+                                          reco_from_row, PRODUCT_CATALOG, USE_LLM)
     _PROD_MAP = {p["code"]: p for p in PRODUCT_CATALOG}
 except Exception:
-    recommend_for_user = None
+    recommend_for_user_stream = recommend_for_users_bulk = reco_from_row = None
+    USE_LLM = False
     PRODUCT_CATALOG = []
     _PROD_MAP = {}
 
@@ -28,6 +31,7 @@ st.title("📊 고객 이탈률")
 #------ 데이터 획득 영역-------
 load_dotenv()
 def _get_conn_tuple():
+    import pymysql
     return pymysql.connect(
         host=os.getenv("DB_HOST", "127.0.0.1"),
         port=int(os.getenv("DB_PORT", "3306")),
@@ -40,6 +44,7 @@ def _get_conn_tuple():
     )
 
 
+@profiled("data")
 def read_df(sql: str, params=None) -> pd.DataFrame:
     conn = _get_conn_tuple()
     try:
@@ -47,7 +52,7 @@ def read_df(sql: str, params=None) -> pd.DataFrame:
     finally:
         conn.close()
 
-@st.cache_data(ttl=60)
+@cache_data(ttl=60)
 def load_from_db() -> pd.DataFrame:
     sql = """
     SELECT
@@ -65,6 +70,74 @@ def load_from_db() -> pd.DataFrame:
         df["predicted_exited"] = (df["predicted_proba"] >= 0.5).astype(int)
     return df
 
+RECO_TABLE = os.getenv("DB_RECO_TABLE", "customer_reco")
+
+@cache_data(ttl=60)
+def load_reco_row(customer_id) -> dict | None:
+    """스코어링 때 사전계산된 규칙 기반 추천(service/reco_batch.py) 1행. 테이블이 없으면 None."""
+    try:
+        d = read_df(f"SELECT * FROM {RECO_TABLE} WHERE customer_id = %s", params=(int(customer_id),))
+    except Exception:
+        return None
+    return d.iloc[0].to_dict() if len(d) else None
+
+EXPLAIN_TABLE = os.getenv("DB_EXPLAIN_TABLE", "customer_explain")
+
+@cache_data(ttl=60)
+def load_explain_row(customer_id) -> dict | None:
+    """스코어링 때 사전계산된 SHAP 상위 피처(service/explain_batch.py) 1행. 테이블이 없으면 None."""
+    try:
+        d = read_df(f"SELECT * FROM {EXPLAIN_TABLE} WHERE customer_id = %s", params=(int(customer_id),))
+    except Exception:
+        return None
+    return d.iloc[0].to_dict() if len(d) else None
+
+def explain_frame(row: dict) -> pd.DataFrame:
+    """customer_explain 1행 → (피처, 값, 기여도, 방향) 표. 기여도는 로그 오즈 단위."""
+    out = []
+    k = 1
+    while f"feature_{k}" in row:
+        if row.get(f"feature_{k}") is not None:
+            s = float(row[f"shap_{k}"])
+            out.append({"피처": row[f"feature_{k}"], "값": str(row[f"value_{k}"]),
+                        "기여도(SHAP)": round(s, 4), "방향": "▲ 이탈 위험 증가" if s > 0 else "▼ 이탈 위험 감소"})
+        k += 1
+    return pd.DataFrame(out)
+
+STREAM_REDRAW_S = 0.08   # 스트리밍 중 재렌더 최소 간격(토큰마다 그리지 않음)
+
+def render_reco(reco: dict) -> None:
+    """추천 결과(단건/사전계산/스트리밍 중간 상태 공용) 렌더."""
+    colA, colB = st.columns([1, 2])
+    with colA:
+        st.metric("위험도", reco.get("risk_level", "N/A"))
+    with colB:
+        st.info(reco.get("summary") or ("요약 생성 중…" if reco.get("done") is False else "요약 없음"))
+
+    recs = reco.get("top_products", [])
+    if recs:
+        for r in recs:
+            code = r.get("code", "")
+            name = _PROD_MAP.get(code, {}).get("name", code)
+            reason = r.get("reason", "")
+            st.markdown(
+                f"""
+                <div style="border:1px solid #e5e7eb; border-radius:12px; padding:12px; margin-bottom:8px;">
+                  <div style="font-weight:700;">{name} <span style="opacity:.6">({code})</span></div>
+                  <div style="opacity:.85;">{reason}</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+    else:
+        st.write("- (추천 없음)")
+
+    acts = reco.get("next_actions", [])
+    if acts:
+        st.markdown("**다음 액션**")
+        st.markdown("\n".join([f"- {a}" for a in acts]))
+
+
 def detect_score_cols(df: pd.DataFrame) -> tuple[str, str]:
     proba_candidates = ["predicted_proba_oof", "predicted_proba"]
     label_candidates = ["predicted_exited_oof", "predicted_exited"]
@@ -74,6 +147,27 @@ def detect_score_cols(df: pd.DataFrame) -> tuple[str, str]:
         raise ValueError("예측 컬럼을 찾을 수 없습니다")
     return proba_col, label_col
 
+def row_for_prompt(rec: dict, proba_col: str) -> dict:
+    """원본 레코드(dict) → LLM 추천 입력(단건/일괄 공용)."""
+    def g(col, default=0):
+        val = rec.get(col, default)
+        return default if pd.isna(val) else val
+    return {
+        "CustomerId": g("CustomerId", "N/A"),
+        "Surname": g("Surname", "N/A"),
+        "Geography": g("Geography", "N/A"),
+        "Gender": g("Gender", "N/A"),
+        "Age": float(g("Age") or 0),
+        "Tenure": float(g("Tenure") or 0),
+        "Balance": float(g("Balance") or 0),
+        "NumOfProducts": int(g("NumOfProducts") or 0),
+        "HasCrCard": int(g("HasCrCard") or 0),
+        "IsActiveMember": int(g("IsActiveMember") or 0),
+        "EstimatedSalary": float(g("EstimatedSalary") or 0),
+        "CreditScore": float(g("CreditScore") or 0),
+        "churn_probability": float(g(proba_col) or 0),
+    }
+
 #------ 데이터 표출 영역-------
 df = load_from_db()
 proba_col, label_col = detect_score_cols(df)
@@ -200,41 +294,43 @@ display_df = list_df.reset_index(drop=True).copy()
 if "_orig_idx" not in display_df.columns:
     display_df.insert(0, "_orig_idx", display_df.index)
 
-# ---- AgGrid 옵션 구성
-gob = GridOptionsBuilder.from_dataframe(display_df)
-gob.configure_column(
-    "이탈율",
-    type=["numericColumn"],
-    valueFormatter="(value == null) ? '' : (value * 100).toFixed(2) + ' %'"
-)
-gob.configure_column(
-    "Complain",
-    valueFormatter="(value == 1) ? 'Yes' : (value == 0 ? 'No' : value)"
-)
-gob.configure_default_column(sortable=True, filter=True, resizable=True)
-gob.configure_selection(selection_mode="single", use_checkbox=False)
-if show_all:
-    gob.configure_grid_options(pagination=False)
-    gob.configure_pagination(enabled=False)
-else:
-    gob.configure_pagination(paginationAutoPageSize=False, paginationPageSize=page_size)
-gob.configure_column("_orig_idx", hide=True)
-grid_options = gob.build()
-
-grid_resp = AgGrid(
-    display_df,
-    gridOptions=grid_options,
-    height=600 if show_all else 420,
-    fit_columns_on_grid_load=True,
-    update_on=["selectionChanged"],
-    allow_unsafe_jscode=True,
-    enable_enterprise_modules=False,
-    key="customers_grid",
-    custom_css={
-        ".ag-cell-focus": {"border": "none !important", "outline": "none !important"},
-        ".ag-row-selected": {"background-color": "rgba(255, 99, 132, 0.12) !important"},
-    },
-)
+# ---- AgGrid 옵션 구성 + 렌더
+with timer("chart", "customers_grid", rows=len(display_df)):
+    from st_aggrid import AgGrid, GridOptionsBuilder  # 리스트 클릭 상호작용
+    gob = GridOptionsBuilder.from_dataframe(display_df)
+    gob.configure_column(
+        "이탈율",
+        type=["numericColumn"],
+        valueFormatter="(value == null) ? '' : (value * 100).toFixed(2) + ' %'"
+    )
+    gob.configure_column(
+        "Complain",
+        valueFormatter="(value == 1) ? 'Yes' : (value == 0 ? 'No' : value)"
+    )
+    gob.configure_default_column(sortable=True, filter=True, resizable=True)
+    gob.configure_selection(selection_mode="single", use_checkbox=False)
+    if show_all:
+        gob.configure_grid_options(pagination=False)
+        gob.configure_pagination(enabled=False)
+    else:
+        gob.configure_pagination(paginationAutoPageSize=False, paginationPageSize=page_size)
+    gob.configure_column("_orig_idx", hide=True)
+    grid_options = gob.build()
+
+    grid_resp = AgGrid(
+        display_df,
+        gridOptions=grid_options,
+        height=600 if show_all else 420,
+        fit_columns_on_grid_load=True,
+        update_on=["selectionChanged"],
+        allow_unsafe_jscode=True,
+        enable_enterprise_modules=False,
+        key="customers_grid",
+        custom_css={
+            ".ag-cell-focus": {"border": "none !important", "outline": "none !important"},
+            ".ag-row-selected": {"background-color": "rgba(255, 99, 132, 0.12) !important"},
+        },
+    )
 
 # 선택된 행
 selected_rows = grid_resp.get("selected_rows", [])
@@ -246,6 +342,33 @@ if selected_rows:
 else:
     sel_id = None
 
+# ---- 일괄 추천: 현재 필터/정렬 기준 상위 N명을 동시에 요청(항목별 실패는 정책 기반 폴백)
+if recommend_for_users_bulk is not None:
+    with st.expander("📦 상위 고객 일괄 추천"):
+        b1, b2 = st.columns([1, 1])
+        with b1:
+            bulk_n = st.number_input("대상 고객 수(리스트 상위)", min_value=1, max_value=200, value=20, step=5)
+        with b2:
+            st.write("")
+            run_bulk = st.button("일괄 추천 실행", width="stretch")
+        if run_bulk:
+            ids = list_df["CustomerId"].head(int(bulk_n)).tolist()
+            recs_df = df[df["CustomerId"].isin(ids)].set_index("CustomerId").reindex(ids).reset_index()
+            rows = [row_for_prompt(r, proba_col) for r in recs_df.to_dict("records")]
+            with timer("llm", "recommend_for_users_bulk", rows=len(rows)):
+                outs = recommend_for_users_bulk(rows)
+            st.session_state["bulk_reco"] = pd.DataFrame([{
+                "CustomerId": r["CustomerId"],
+                "이탈율": r["churn_probability"],
+                "위험도": o.get("risk_level", "N/A"),
+                "추천 상품": ", ".join(_PROD_MAP.get(t.get("code", ""), {}).get("name", t.get("code", ""))
+                                    for t in o.get("top_products", [])),
+                "요약": o.get("summary", ""),
+            } for r, o in zip(rows, outs)])
+        if "bulk_reco" in st.session_state:
+            st.dataframe(st.session_state["bulk_reco"], width="stretch", hide_index=True,
+                         column_config={"이탈율": st.column_config.NumberColumn(format="%.3f")})
+
 st.markdown("---")
 
 # ---------- 디테일(선택 고객 상세 + LLM 추천) ----------
@@ -319,62 +442,35 @@ else:
         fin["predicted_label"] = label_val
         st.table(pd.DataFrame(fin.items(), columns=["항목", "값"]).astype({"값": "string"}))
 
+    # 예측 근거: 사전계산된 SHAP 상위 피처(단일 PK 조회, 테이블 없으면 생략)
+    explain = load_explain_row(v("CustomerId"))
+    if explain is not None:
+        st.markdown("**예측 근거 (SHAP 상위 피처)**")
+        st.table(explain_frame(explain).astype({"값": "string"}))
+
     with st.expander("원본 레코드 전체 보기"):
         st.dataframe(detail_row.T, width="stretch")
 
     # ── LLM 추천 (래퍼 사용: 내부에서 키 없으면 자동 폴백)
     st.subheader("🤖 추천 상품")
 
-    row_for_prompt = {
-        "CustomerId": v("CustomerId"),
-        "Surname": v("Surname"),
-        "Geography": v("Geography"),
-        "Gender": v("Gender"),
-        "Age": float(v("Age", 0) or 0),
-        "Tenure": float(v("Tenure", 0) or 0),
-        "Balance": float(v("Balance", 0) or 0),
-        "NumOfProducts": int(v("NumOfProducts", 0) or 0),
-        "HasCrCard": int(v("HasCrCard", 0) or 0),
-        "IsActiveMember": int(v("IsActiveMember", 0) or 0),
-        "EstimatedSalary": float(v("EstimatedSalary", 0) or 0),
-        "CreditScore": float(v("CreditScore", 0) or 0),
-        "churn_probability": float(detail_row[proba_col].values[0]),
-    }
-
-    if recommend_for_user is not None:
-        reco = recommend_for_user(row_for_prompt)
-    else:
-        reco = {"summary": "LLM 모듈이 없습니다.", "top_products": [], "next_actions": [], "risk_level": "N/A"}
-
-    # 렌더링
-    colA, colB = st.columns([1, 2])
-    with colA:
-        st.metric("위험도", reco.get("risk_level", "N/A"))
-    with colB:
-        st.info(reco.get("summary", "요약 없음"))
-
-    recs = reco.get("top_products", [])
-    if recs:
-        for r in recs:
-            code = r.get("code", "")
-            name = _PROD_MAP.get(code, {}).get("name", code)
-            reason = r.get("reason", "")
-            st.markdown(
-                f"""
-                <div style="border:1px solid #e5e7eb; border-radius:12px; padding:12px; margin-bottom:8px;">
-                  <div style="font-weight:700;">{name} <span style="opacity:.6">({code})</span></div>
-                  <div style="opacity:.85;">{reason}</div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+    # LLM 미사용이면 사전계산 행을 그대로 사용(없으면 규칙 즉석 계산)
+    stored = None if USE_LLM or reco_from_row is None else load_reco_row(v("CustomerId"))
+    if stored is not None:
+        render_reco(reco_from_row(stored))
+    elif recommend_for_user_stream is not None:
+        # 규칙 기반 카드는 즉시, LLM 요약/근거는 토큰이 도착하는 대로 같은 자리에 갱신
+        slot = st.empty()
+        last_draw = 0.0
+        with timer("llm", "recommend_for_user"):
+            for reco in recommend_for_user_stream(row_for_prompt(detail_row.iloc[0].to_dict(), proba_col)):
+                now = time.perf_counter()
+                if reco.get("done") or now - last_draw >= STREAM_REDRAW_S:
+                    with slot.container():
+                        render_reco(reco)
+                    last_draw = now
     else:
-        st.write("- (추천 없음)")
-
-    acts = reco.get("next_actions", [])
-    if acts:
-        st.markdown("**다음 액션**")
-        st.markdown("\n".join([f"- {a}" for a in acts]))
+        render_reco({"summary": "LLM 모듈이 없습니다.", "top_products": [], "next_actions": [], "risk_level": "N/A"})
 
     # 키가 없으면 가이드 표시(UX 방해 X)
     if not os.getenv("OPENAI_API_KEY"):
@@ -0,0 +1,184 @@
+# config.py
+# ------------------------------------------------------------
+# 목적: 학습/스코어링 실행 설정을 명시적 객체로 전달(full_scoring.main(config))
+# - 모듈 import 시점 환경변수 고정/os.environ 변경/importlib.reload 없이 실행마다 다른 설정 사용
+# - RunConfig.from_env(): CLI/기존 환경변수(N_FOLDS, RANDOM_STATE, WRITE_DB, OUT_CSV, DB_* 등) 호환
+# - RunConfig.replace(n_folds=2): 일부만 바꾼 사본(frozen → 여러 실행이 한 프로세스에서 공유해도 안전)
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import dataclasses
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+APP_DIR = Path(__file__).resolve().parents[1]           # 3-application/
+ASSETS_DIR = APP_DIR / "assets" / "data"
+MODELS_DIR = APP_DIR / "models"
+VARIANTS = ("smote", "balanced")
+VARIANT_LABELS = {"smote": "SMOTENC", "balanced": "Balanced"}   # 로그/리포트 표기
+# 후보 변형에 덮어쓸 수 있는 CatBoost 파라미터: "balanced:depth=8,learning_rate=0.03"
+VARIANT_PARAMS = {"depth": int, "learning_rate": float, "iterations": int, "l2_leaf_reg": float}
+SELECTIONS = ("race", "full")
+MODES = ("full", "incremental")
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+def split_variants(text: str) -> Tuple[str, ...]:
+    """'smote,balanced' / 'balanced;balanced:depth=8,learning_rate=0.03' → 변형 목록.
+    ';'가 있으면 ';'로 구분(변형 내부 덮어쓰기가 ','를 쓰므로), 없으면 ','로 구분."""
+    sep = ";" if ";" in text or ":" in text else ","
+    return tuple(v.strip() for v in text.split(sep) if v.strip())
+
+def parse_variant(spec: str) -> Tuple[str, Dict[str, Any]]:
+    """'smote' / 'balanced:depth=8,learning_rate=0.03' → (기본 변형, 파라미터 덮어쓰기)."""
+    base, _, rest = spec.partition(":")
+    if base not in VARIANTS:
+        raise ValueError(f"unknown variant {base!r} (expected one of {VARIANTS})")
+    overrides: Dict[str, Any] = {}
+    for item in filter(None, (x.strip() for x in rest.split(","))):
+        k, _, v = item.partition("=")
+        if k not in VARIANT_PARAMS or not v:
+            raise ValueError(f"bad variant override {item!r} in {spec!r} (keys: {list(VARIANT_PARAMS)})")
+        overrides[k] = VARIANT_PARAMS[k](v)
+    return base, overrides
+
+def variant_label(spec: str) -> str:
+    """'balanced:depth=8' → 'Balanced(depth=8)' (로그/리포트 표기, jobs 진행률 마일스톤과 공유)."""
+    base, overrides = parse_variant(spec)
+    extra = ",".join(f"{k}={v}" for k, v in overrides.items())
+    return VARIANT_LABELS[base] + (f"({extra})" if extra else "")
+
+
+@dataclass(frozen=True)
+class DBConfig:
+    host: str = "127.0.0.1"
+    port: int = 3306
+    user: str = "root"
+    password: str = field(default="root1234", repr=False)
+    name: str = "sknproject2"
+    table: str = "stg_churn_score"
+    reco_table: str = "customer_reco"       # 규칙 기반 추천 사전계산(service/reco_batch.py)
+    explain_table: str = "customer_explain" # 고객별 SHAP 상위 피처 사전계산(service/explain_batch.py)
+
+    @property
+    def url(self) -> str:
+        return f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
+
+    @classmethod
+    def from_env(cls) -> "DBConfig":
+        return cls(host=os.getenv("DB_HOST", cls.host), port=int(os.getenv("DB_PORT", str(cls.port))),
+                   user=os.getenv("DB_USER", cls.user), password=os.getenv("DB_PASS", cls.password),
+                   name=os.getenv("DB_NAME", cls.name), table=os.getenv("DB_TABLE", cls.table),
+                   reco_table=os.getenv("DB_RECO_TABLE", cls.reco_table),
+                   explain_table=os.getenv("DB_EXPLAIN_TABLE", cls.explain_table))
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """full_scoring 실행 1회 설정."""
+    # 교차검증/모델
+    n_folds: int = 5
+    random_state: int = 42
+    variants: Tuple[str, ...] = VARIANTS     # 비교할 CatBoost 변형(smote | balanced[:depth=8,...])
+    selection: str = "race"                  # race: fold 단위 레이싱(열세 후보 조기 탈락) | full: 전 fold 비교
+    race_confidence: float = 0.95            # 탈락 기준 P(선두 > 후보)
+    race_min_folds: int = 2                  # 탈락 판정 전 최소 fold 수
+    iterations: int = 800
+    learning_rate: float = 0.05
+    depth: int = 6
+    early_stopping_rounds: int = 100
+    thread_count: int = -1                   # CatBoost 학습 스레드(-1 = 전체 코어)
+    cv_cache: bool = True                    # 이미 계산된 CV fold 재사용(service/cv_store.py)
+    quantized_pool: bool = True              # 전체 데이터 1회 양자화 → fold/최종 학습 공유(service/pool_cache.py)
+    # 증분 갱신(service/incremental.py) — 가드레일에 걸리면 전체 재학습
+    mode: str = "full"                       # full: CV 선택+전체 학습 | incremental: 최신 모델에서 delta만 이어 학습
+    warm_iterations: int = 200               # 증분 1회 추가 트리 수
+    warm_max_delta: float = 0.3              # delta 비율이 이보다 크면 전체 재학습
+    warm_max_generations: int = 5            # 연속 증분 허용 횟수(이후 전체 재학습)
+    warm_max_auc_drop: float = 0.005         # 검증 AUC 허용 하락폭(직전 모델 대비)
+    drift_psi: float = 0.2                   # delta 피처 PSI가 이보다 크면 drift로 보고 전체 재학습
+    # SHAP 설명 사전계산(service/explain_batch.py) — 고객별 상위 k 피처 + 전역 중요도, 0이면 끔
+    explain_top_k: int = 3
+    # 입출력
+    data_csv: Optional[Path] = None          # None이면 assets/data 자동 탐색
+    out_csv: Path = ASSETS_DIR / "churn_scores.csv"
+    models_dir: Path = MODELS_DIR
+    # DB 적재/뷰
+    write_db: bool = False
+    create_view: bool = False
+    db: DBConfig = field(default_factory=DBConfig)
+
+    def __post_init__(self) -> None:
+        # 문자열/리스트로 들어와도 정규화(frozen이므로 object.__setattr__)
+        object.__setattr__(self, "variants", tuple(self.variants))
+        object.__setattr__(self, "out_csv", Path(self.out_csv))
+        object.__setattr__(self, "models_dir", Path(self.models_dir))
+        if self.data_csv is not None:
+            object.__setattr__(self, "data_csv", Path(self.data_csv))
+        if not self.variants or len(set(self.variants)) != len(self.variants):
+            raise ValueError(f"variants must be non-empty and unique (got {self.variants})")
+        for spec in self.variants:
+            parse_variant(spec)
+        if self.selection not in SELECTIONS:
+            raise ValueError(f"selection must be one of {SELECTIONS} (got {self.selection!r})")
+        if self.mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES} (got {self.mode!r})")
+        if self.explain_top_k < 0:
+            raise ValueError(f"explain_top_k must be >= 0 (got {self.explain_top_k})")
+        if self.n_folds < 2:
+            raise ValueError(f"n_folds must be >= 2 (got {self.n_folds})")
+
+    def replace(self, **changes: Any) -> "RunConfig":
+        return dataclasses.replace(self, **changes)
+
+    def catboost_params(self) -> Dict[str, Any]:
+        return dict(
+            loss_function="Logloss",
+            eval_metric="AUC",
+            iterations=self.iterations,
+            learning_rate=self.learning_rate,
+            depth=self.depth,
+            l2_leaf_reg=3.0,
+            random_state=self.random_state,
+            thread_count=self.thread_count,
+            verbose=False,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """meta/profile 기록용(비밀번호 제외)."""
+        d = dataclasses.asdict(self)
+        d["db"].pop("password", None)
+        return {k: (str(v) if isinstance(v, Path) else list(v) if isinstance(v, tuple) else v)
+                for k, v in d.items()}
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "RunConfig":
+        """기존 환경변수 호환 생성(CLI 진입점 전용). overrides가 환경변수보다 우선."""
+        env: Dict[str, Any] = {
+            "n_folds": int(os.getenv("N_FOLDS", str(cls.n_folds))),
+            "random_state": int(os.getenv("RANDOM_STATE", str(cls.random_state))),
+            "write_db": _env_flag("WRITE_DB"),
+            "create_view": _env_flag("CREATE_VIEW"),
+            "cv_cache": _env_flag("CV_CACHE", "true"),
+            "quantized_pool": _env_flag("QUANTIZED_POOL", "true"),
+            "db": DBConfig.from_env(),
+        }
+        if os.getenv("VARIANTS"):
+            env["variants"] = split_variants(os.environ["VARIANTS"])
+        if os.getenv("SELECTION"):
+            env["selection"] = os.environ["SELECTION"]
+        if os.getenv("TRAIN_MODE"):
+            env["mode"] = os.environ["TRAIN_MODE"]
+        if os.getenv("CB_ITERATIONS"):
+            env["iterations"] = int(os.environ["CB_ITERATIONS"])
+        if os.getenv("CB_THREAD_COUNT"):
+            env["thread_count"] = int(os.environ["CB_THREAD_COUNT"])
+        if os.getenv("EXPLAIN_TOP_K"):
+            env["explain_top_k"] = int(os.environ["EXPLAIN_TOP_K"])
+        if os.getenv("OUT_CSV"):
+            env["out_csv"] = Path(os.environ["OUT_CSV"])
+        env.update(overrides)
+        return cls(**env)
@@ -0,0 +1,179 @@
+# cv_store.py
+# ------------------------------------------------------------
+# 목적: full_scoring 교차검증 결과 fold 단위 메모이제이션
+# - 키: sha256(입력 데이터(X, y) 해시 + 피처/범주형 목록 + 변형 + 결과에 영향을 주는 파라미터 + fold 수/seed
+#         + catboost/sklearn/imblearn 버전 — 라이브러리 업그레이드 후 이전 결과를 재사용하지 않음)
+#   (thread_count/verbose처럼 결과와 무관한 값은 제외 → 스레드 수만 바꾼 재실행도 캐시 사용)
+# - 저장: <CV_CACHE_DIR>/<key>/fold_<k>.npz (test 인덱스, OOF 확률, fold 지표) + key.json(키 구성 요소)
+#         CV_CACHE_MODELS=1 이면 fold 모델(fold_<k>.cbm)도 저장
+# - 이미 계산된 fold는 건너뜀 → 변경 없는 재실행은 CV 학습 0회, 파라미터 변경 시 해당 변형만 재계산
+# - 정리(<CV_CACHE_DIR>/pools 양자화 Pool 포함): 새 키/Pool을 만들 때마다 마지막 사용 후 CV_CACHE_MAX_AGE_DAYS(기본 30일) 지난 항목 삭제,
+#         총 크기가 CV_CACHE_MAX_MB(기본 2048)를 넘으면 오래 안 쓴 순(LRU)으로 삭제
+# 사용: python service/cv_store.py list | purge | clear
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+import json
+import shutil
+import hashlib
+import importlib
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parents[1]           # 3-application/
+CV_CACHE_DIR = Path(os.getenv("CV_CACHE_DIR", str(APP_DIR / "assets" / "logs" / "cv_cache")))
+SAVE_MODELS = os.getenv("CV_CACHE_MODELS", "false").lower() in ("1", "true", "yes")
+STORE_VERSION = 1                                        # fold 계산 방식이 바뀌면 올릴 것
+_IGNORED_PARAMS = ("thread_count", "verbose")
+MAX_AGE_DAYS = float(os.getenv("CV_CACHE_MAX_AGE_DAYS", "30"))
+MAX_MB = float(os.getenv("CV_CACHE_MAX_MB", "2048"))
+
+
+def data_hash(X: pd.DataFrame, y: np.ndarray) -> str:
+    h = hashlib.sha256()
+    h.update(json.dumps([list(map(str, X.columns)), [str(t) for t in X.dtypes]]).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    h.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def lib_versions() -> Dict[str, Optional[str]]:
+    """fold 결과에 영향을 주는 라이브러리 버전(미설치는 None)."""
+    out: Dict[str, Optional[str]] = {}
+    for name in ("catboost", "sklearn", "imblearn"):
+        try:
+            out[name] = importlib.import_module(name).__version__
+        except ImportError:
+            out[name] = None
+    return out
+
+
+class CVStore:
+    def __init__(self, root: Path = CV_CACHE_DIR, save_models: bool = SAVE_MODELS) -> None:
+        self.root, self.save_models = Path(root), save_models
+
+    def run_key(self, X: pd.DataFrame, y: np.ndarray, *, variant: str, params: Dict[str, Any],
+                n_folds: int, seed: int, extra: Optional[Dict[str, Any]] = None) -> str:
+        """CV 실행 1회(변형 1개)의 키. 같은 키 = 같은 fold 분할/학습/지표."""
+        parts = {
+            "version": STORE_VERSION,
+            "data": data_hash(X, y),
+            "features": list(map(str, X.columns)),
+            "variant": variant,
+            "params": {k: v for k, v in sorted(params.items()) if k not in _IGNORED_PARAMS},
+            "n_folds": int(n_folds),
+            "seed": int(seed),
+            "libs": lib_versions(),
+            "extra": extra or {},
+        }
+        key = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:24]
+        d = self.root / key
+        if (d / "key.json").exists():
+            os.utime(d / "key.json")            # 마지막 사용 시각(정리 기준)
+        else:
+            d.mkdir(parents=True, exist_ok=True)
+            _atomic_write(d / "key.json", json.dumps(parts, ensure_ascii=False, indent=2, default=str).encode())
+            self.purge(keep=[d])
+        return key
+
+    def _fold_path(self, key: str, fold: int) -> Path:
+        return self.root / key / f"fold_{fold}.npz"
+
+    def load_fold(self, key: str, fold: int) -> Optional[Dict[str, Any]]:
+        path = self._fold_path(key, fold)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                return {"te_idx": z["te_idx"], "proba": z["proba"],
+                        "metrics": json.loads(str(z["metrics"]))}
+        except Exception:
+            return None        # 깨진 파일은 미스로 취급(다시 계산해 덮어씀)
+
+    def save_fold(self, key: str, fold: int, te_idx: np.ndarray, proba: np.ndarray,
+                  metrics: Dict[str, float], model: Any = None) -> None:
+        path = self._fold_path(key, fold)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, te_idx=np.asarray(te_idx, dtype=np.int64), proba=np.asarray(proba, dtype=np.float64),
+                 metrics=np.array(json.dumps(metrics)))
+        os.replace(tmp, path)
+        if model is not None and self.save_models:
+            model.save_model(str(path.with_suffix(".cbm")))
+
+    def entries(self) -> List[Dict[str, Any]]:
+        out = []
+        for d in sorted(self.root.glob("*/key.json")):
+            parts = json.loads(d.read_text(encoding="utf-8"))
+            folds = sorted(int(p.stem.split("_")[1]) for p in d.parent.glob("fold_*.npz"))
+            out.append({"key": d.parent.name, "variant": parts.get("variant"), "n_folds": parts.get("n_folds"),
+                        "folds_done": folds, "data": str(parts.get("data", ""))[:12]})
+        return out
+
+    def _usage(self) -> List[Dict[str, Any]]:
+        """정리 대상 항목: 경로, 마지막 사용 시각, 크기(bytes)."""
+        out = []
+        for kj in self.root.glob("*/key.json"):
+            try:
+                size = sum(f.stat().st_size for f in kj.parent.iterdir() if f.is_file())
+                out.append({"path": kj.parent, "used": kj.stat().st_mtime, "bytes": size})
+            except OSError:
+                continue                        # 다른 프로세스가 동시에 삭제 중
+        for qp in self.root.glob("pools/*.qpool"):  # service/pool_cache.py 양자화 Pool(같은 정책)
+            try:
+                st = qp.stat()
+                out.append({"path": qp, "used": st.st_mtime, "bytes": st.st_size})
+            except OSError:
+                continue
+        return out
+
+    def purge(self, max_age_days: float = MAX_AGE_DAYS, max_mb: float = MAX_MB,
+              keep: Iterable[Path] = ()) -> int:
+        """마지막 사용이 max_age_days보다 오래된 항목 삭제 후, 총 크기 > max_mb면 LRU 순 삭제. 삭제 건수."""
+        keep = {Path(p) for p in keep}
+        items = sorted(self._usage(), key=lambda e: e["used"])
+        cutoff, budget = time.time() - max_age_days * 86400, max_mb * 1024 * 1024
+        total, removed = sum(e["bytes"] for e in items), 0
+        for e in items:
+            if e["path"] in keep or (e["used"] >= cutoff and total <= budget):
+                continue
+            if e["path"].is_dir():
+                shutil.rmtree(e["path"], ignore_errors=True)
+            else:
+                e["path"].unlink(missing_ok=True)
+            total -= e["bytes"]
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "list"
+    store = CVStore()
+    if cmd == "list":
+        for e in store.entries():
+            print(f"{e['key']}  {e['variant']:<9} data={e['data']}  folds {len(e['folds_done'])}/{e['n_folds']}")
+    elif cmd == "purge":
+        print(f"[INFO] 오래된/용량 초과 항목 삭제: {store.purge()}건 "
+              f"(최대 {MAX_AGE_DAYS:g}일, {MAX_MB:g}MB)")
+    elif cmd == "clear":
+        store.clear()
+        print(f"[INFO] CV 캐시 삭제: {store.root}")
+    else:
+        print("사용: python service/cv_store.py list|purge|clear")
+        sys.exit(2)
@@ -0,0 +1,147 @@
+# explain_batch.py
+# ------------------------------------------------------------
+# 목적: 스코어링된 전체 고객의 SHAP 기여도(CatBoost ShapValues)를 한 번에 사전계산
+#       → 고객별 상위 k개 피처는 DB customer_explain 테이블(상세 패널은 1행 조회)
+#       → 전역 중요도(피처별 평균 |SHAP|)는 모델당 1회 <model>.explain.json (대시보드는 파일만 읽음)
+# - ShapValues는 청크(chunk_rows) 단위로 계산 → 메모리는 (청크 행 × 피처 수)에 비례
+# - 기여도 단위: 로그 오즈(raw). 양수 = 이탈 확률을 올림, base_value + 전체 합 = 모델 raw 예측
+# - full_scoring 실행 끝에 자동 갱신(explain_top_k > 0), 단독 실행도 가능
+# 입력: 최신(또는 --model) best_model_*.pkl + 원본 CSV
+# 출력: customer_id, base_value, feature_1..k, value_1..k, shap_1..k, generated_at
+# 사용: python service/explain_batch.py
+#       python service/explain_batch.py --no-write-db --out-csv customer_explain.csv --top-k 5
+# ------------------------------------------------------------
+from __future__ import annotations
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.config import RunConfig, DBConfig
+from utils.perf import metrics
+
+EXPLAIN_SUFFIX = ".explain.json"
+CHUNK_ROWS = 20_000
+
+EXPLAIN_ROWS = metrics.counter("explain_batch_rows", "SHAP 설명을 사전계산한 행 수")
+EXPLAIN_SECONDS = metrics.histogram("explain_batch_seconds", "SHAP 사전계산 단계별 소요(초)", ["stage"])
+
+
+def shap_values(model, X: pd.DataFrame, cat_idx: Sequence[int], chunk_rows: int = CHUNK_ROWS):
+    """(청크 DataFrame, (청크 행 × (피처 수 + 1)) SHAP) 순회 — 마지막 열은 base value."""
+    from catboost import Pool
+    for start in range(0, len(X), chunk_rows):
+        chunk = X.iloc[start:start + chunk_rows]
+        yield chunk, model.get_feature_importance(Pool(chunk, cat_features=list(cat_idx)), type="ShapValues")
+
+def build_explain(model, X: pd.DataFrame, ids: Sequence, cat_idx: Sequence[int], top_k: int = 3,
+                  chunk_rows: int = CHUNK_ROWS) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """학습 피처 행렬 X → (고객별 상위 k 기여 피처 행, 전역 중요도 dict)."""
+    features = list(X.columns)
+    k = max(1, min(top_k, len(features)))
+    names = np.asarray(features, dtype=object)
+    ids = np.asarray(ids)
+    abs_sum = np.zeros(len(features))
+    parts: List[pd.DataFrame] = []
+    base, start = float("nan"), 0
+    with EXPLAIN_SECONDS.time(stage="build"):
+        for chunk, sv in shap_values(model, X, cat_idx, chunk_rows):
+            contrib, base = sv[:, :-1], float(sv[0, -1])
+            mag = np.abs(contrib)
+            abs_sum += mag.sum(axis=0)
+            # |SHAP| 상위 k개: argpartition 후 k개만 내림차순 정렬
+            top = np.argpartition(-mag, k - 1, axis=1)[:, :k]
+            top = np.take_along_axis(top, np.argsort(-np.take_along_axis(mag, top, axis=1), axis=1), axis=1)
+            values = chunk.astype(str).to_numpy()             # 표시용 원래 값(범주/수치 공통 문자열)
+            idx = np.arange(len(chunk))
+            part = {"customer_id": ids[start:start + len(chunk)], "base_value": np.full(len(chunk), round(base, 6))}
+            for r in range(k):
+                part[f"feature_{r + 1}"] = names[top[:, r]]
+                part[f"value_{r + 1}"] = values[idx, top[:, r]]
+                part[f"shap_{r + 1}"] = contrib[idx, top[:, r]].round(6)
+            parts.append(pd.DataFrame(part))
+            start += len(chunk)
+    out = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    out["generated_at"] = datetime.now().replace(microsecond=0)
+    glob = {"features": features,
+            "mean_abs_shap": [round(float(v), 6) for v in abs_sum / max(len(X), 1)],
+            "expected_value": round(base, 6), "rows": int(len(X)), "top_k": k,
+            "generated_at": datetime.now().replace(microsecond=0).isoformat()}
+    EXPLAIN_ROWS.inc(len(out))
+    return out, glob
+
+def save_global(model_path: Path, glob: Dict[str, Any]) -> Path:
+    path = Path(model_path).with_suffix(EXPLAIN_SUFFIX)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(glob, f, ensure_ascii=False, indent=2)
+    return path
+
+def load_global(model_path: Path) -> Optional[Dict[str, Any]]:
+    """<model>.explain.json(없으면 None) — 대시보드 전역 중요도용."""
+    path = Path(model_path).with_suffix(EXPLAIN_SUFFIX)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def write_explain(df_explain: pd.DataFrame, db: DBConfig, engine=None) -> None:
+    """customer_explain 교체 적재(customer_reco와 같은 방식) + MySQL이면 PK."""
+    from sqlalchemy import create_engine
+    eng = engine or create_engine(db.url, pool_pre_ping=True)
+    with EXPLAIN_SECONDS.time(stage="db_write"):
+        df_explain.to_sql(db.explain_table, con=eng, if_exists="replace", index=False,
+                          chunksize=5_000, method="multi")
+        if eng.dialect.name == "mysql":
+            with eng.begin() as conn:
+                conn.exec_driver_sql(f"ALTER TABLE {db.explain_table} MODIFY customer_id BIGINT NOT NULL, "
+                                     f"ADD PRIMARY KEY (customer_id)")
+    print(f"[DB] wrote {len(df_explain):,} rows -> {db.name}.{db.explain_table}")
+
+def run(config: RunConfig, model_path: Optional[Path] = None, top_k: int = 3, chunk_rows: int = CHUNK_ROWS,
+        out_csv: Optional[Path] = None) -> pd.DataFrame:
+    """사전계산 1회: 모델(기본 최신) + 원본 CSV → 고객별 상위 k 행(+ 전역 중요도 파일)."""
+    from service.scoring import load_model, latest_model_path
+    from utils.process import load_csv_from_data
+    t0 = time.perf_counter()
+    # ShapValues는 catboost 모델 필요(.npz 추론 포맷 사용 안 함)
+    bundle = load_model(model_path or latest_model_path(config.models_dir), backend="catboost")
+    if config.data_csv is not None:
+        raw = load_csv_from_data(config.data_csv.name, data_dir=config.data_csv.parent)
+    else:
+        raw = load_csv_from_data()
+    X = bundle.prepare(raw)
+    cat_idx = [X.columns.get_loc(c) for c in bundle.cat_features]
+    explain, glob = build_explain(bundle.model, X, raw["CustomerId"].to_numpy(), cat_idx, top_k, chunk_rows)
+    print(f"[SAVE] explain global -> {save_global(bundle.path, glob)}")
+    print(f"[INFO] explain rows={len(explain):,} top_k={glob['top_k']} ({time.perf_counter() - t0:.2f}s)")
+    if out_csv is not None:
+        Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
+        explain.to_csv(out_csv, index=False)
+        print(f"[SAVE] explain -> {out_csv}")
+    if config.write_db:
+        write_explain(explain, config.db)
+    return explain
+
+
+if __name__ == "__main__":
+    base = RunConfig.from_env(write_db=True)
+    ap = argparse.ArgumentParser(description="고객별 SHAP 상위 피처 + 전역 중요도 사전계산 → customer_explain")
+    ap.add_argument("--model", default=None, help="best_model_*.pkl(기본 최신)")
+    ap.add_argument("--data-csv", default=base.data_csv, help="원본 CSV(기본 assets/data 자동 탐색)")
+    ap.add_argument("--top-k", type=int, default=base.explain_top_k or 3)
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    ap.add_argument("--out-csv", default=None, help="결과 CSV(선택)")
+    ap.add_argument("--write-db", action=argparse.BooleanOptionalAction, default=True)
+    a = ap.parse_args()
+    config = base.replace(data_csv=a.data_csv, write_db=a.write_db)
+    run(config, Path(a.model) if a.model else None, top_k=a.top_k, chunk_rows=a.chunk_rows, out_csv=a.out_csv)
+    metrics.flush()
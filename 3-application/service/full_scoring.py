@@ -2,12 +2,16 @@
 # ------------------------------------------------------------
 # 목적: CatBoost 2가지 설정(SMOTENC vs Balanced) 중 5-Fold ACC가 높은 모델 채택
 # 입력: assets/data/Customer-Churn-Records.csv (기본, auto-discover)
-# 출력: models/best_model_YYYYMMDD_HHMMSS.pkl, assets/data/churn_scores.csv
-# 옵션: stg_churn_score 테이블 적재, vw_rfm_for_app 뷰 생성
+# 출력: models/best_model_YYYYMMDD_HHMMSS.pkl (+ .meta.json, .npz 추론 전용, .profile.json 단계별 소요), assets/data/churn_scores.csv
+# 옵션: stg_churn_score 테이블 적재(+ customer_reco 추천 / customer_explain SHAP 사전계산), vw_rfm_for_app 뷰 생성
+# 증분: --mode incremental → 최신 모델에서 신규/변경 행만 이어 학습(가드레일 실패 시 전체 재학습, service/incremental.py)
+# 설정: main(RunConfig(...)) 명시 전달(service/config.py), CLI는 인자/기존 환경변수로 RunConfig 생성
 # ------------------------------------------------------------
-import os
 import sys
+import json
+import time
 import pickle
+import argparse
 from pathlib import Path
 from datetime import datetime
 
@@ -22,38 +26,28 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 # --- import 경로 보정 (3-application를 sys.path에 추가) ---
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-# 프로젝트 경로 ------------------------------------------------
-HERE = Path(__file__).resolve()
-APP_DIR = HERE.parent.parent            # 3-application/
-ASSETS_DIR = APP_DIR / "assets" / "data"
-MODELS_DIR = APP_DIR / "models"
-ASSETS_DIR.mkdir(parents=True, exist_ok=True)
-MODELS_DIR.mkdir(parents=True, exist_ok=True)
-
-# ENV ---------------------------------------------------------
-OUT_CSV       = os.getenv("OUT_CSV",  str(ASSETS_DIR / "churn_scores.csv"))
-RANDOM_STATE  = int(os.getenv("RANDOM_STATE", "42"))
-N_FOLDS       = int(os.getenv("N_FOLDS", "5"))
-DB_USER       = os.getenv("DB_USER", "root")
-DB_PASS       = os.getenv("DB_PASS", "root1234")
-DB_HOST       = os.getenv("DB_HOST", "127.0.0.1")
-DB_PORT       = os.getenv("DB_PORT", "3306")
-DB_NAME       = os.getenv("DB_NAME", "sknproject2")
-DB_TABLE      = os.getenv("DB_TABLE", "stg_churn_score")
-
-def _flag(name: str, default="false") -> bool:
-    """런타임에 환경변수를 읽어 불리언으로 반환(토글 반영 보장)."""
-    return os.getenv(name, default).lower() in ("1", "true", "yes")
+from service.config import RunConfig, DBConfig, VARIANTS, SELECTIONS, MODES, parse_variant, split_variants, variant_label
+from service.cv_store import CVStore
+from service.racing import race
+from service.pool_cache import QuantizedPool
+from service.incremental import previous_model, row_hashes, reference_profile, save_rows
+from service.incremental import update as incremental_update
 
 # utils.process 모듈 사용(데이터 로드/피처엔지니어링) -------------------------
-from utils.process import load_csv_from_data, engineer_features
+from utils.process import load_csv_from_data, engineer_features, fit_feature_params
+from utils.perf import trace_run, span, PROFILE_SUFFIX
+from utils.perf import metrics
+
+CV_FOLD_SECONDS = metrics.histogram("cv_fold_seconds", "CV fold 1회 학습+평가 소요(초)", ["variant"])
+MODEL_CV_AUC = metrics.gauge("model_cv_auc", "최근 CV 평균 ROC AUC", ["variant"])
+MODEL_CV_ACC = metrics.gauge("model_cv_accuracy", "최근 CV 평균 정확도", ["variant"])
+DB_WRITE_SECONDS = metrics.histogram("db_write_seconds", "점수 테이블 DB 쓰기 지연(초)", ["table"])
+DB_WRITE_ROWS = metrics.counter("db_write_rows", "점수 테이블 DB 쓰기 행 수", ["table"])
+CV_FOLD_CACHE = metrics.counter("cv_fold_cache", "CV fold 결과 캐시 조회(result=hit|miss)", ["variant", "result"])
 
 # CatBoost / SMOTENC ------------------------------------------
 from catboost import CatBoostClassifier, Pool
-try:
-    from imblearn.over_sampling import SMOTENC
-except Exception:
-    SMOTENC = None  # imblearn 미설치 환경에서도 동작하도록
+from service.resample import SMOTENC, smotenc_resample   # SMOTENC: imblearn 미설치면 None
 
 # 추천/상호작용 피처(노트북 기준) -------------------------------------------
 RECOMMENDED_COLS = [
@@ -75,104 +69,233 @@ def _cat_cols_and_idx(X: pd.DataFrame):
     cat_idx = [X.columns.get_loc(c) for c in cat_cols]
     return cat_cols, cat_idx
 
-def _evaluate_catboost_cv(X: pd.DataFrame, y: np.ndarray, variant: str, cat_idx, random_state=42):
-    """
-    variant: 'smote' or 'balanced'
-    반환: (metrics_dict, oof_best_threshold, mean_acc)
-    """
-    skf = StratifiedKFold(n_splits=N_FOLDS, shuffle=True, random_state=random_state)
-
-    accs, f1s, precs, recs, aucs = [], [], [], [], []
-    oof_proba = np.zeros(len(y), dtype=float)
-    oof_true  = np.zeros(len(y), dtype=int)
-
-    for tr_idx, te_idx in skf.split(X, y):
-        X_tr, X_te = X.iloc[tr_idx].copy(), X.iloc[te_idx].copy()
-        y_tr, y_te = y[tr_idx], y[te_idx]
-
-        # SMOTENC 적용
-        if variant == "smote":
-            if SMOTENC is None:
-                raise RuntimeError("SMOTENC가 설치되지 않았습니다 (pip install imbalanced-learn).")
-            smote = SMOTENC(categorical_features=cat_idx, sampling_strategy=0.67,
-                            random_state=random_state, k_neighbors=5)
-            X_res, y_res = smote.fit_resample(X_tr.values, y_tr)
-            X_tr = pd.DataFrame(X_res, columns=X.columns)
-            y_tr = y_res
-            # resample 후 범주형 다시 문자열 보장
-            for i in cat_idx:
-                X_tr.iloc[:, i] = X_tr.iloc[:, i].astype(str)
-                X_te.iloc[:, i] = X_te.iloc[:, i].astype(str)
-
-        # CatBoost Pool
-        train_pool = Pool(X_tr, y_tr, cat_features=cat_idx)
-        test_pool  = Pool(X_te, y_te, cat_features=cat_idx)
-
-        # 모델 설정
-        params = dict(
-            loss_function="Logloss",
-            eval_metric="AUC",
-            iterations=800,
-            learning_rate=0.05,
-            depth=6,
-            l2_leaf_reg=3.0,
-            random_state=random_state,
-            verbose=False,
-        )
-        if variant == "balanced":
-            params["auto_class_weights"] = "Balanced"
+VARIANT_TITLES = {"smote": "CatBoost + SMOTENC", "balanced": "CatBoost (auto_class_weights='Balanced')"}
+VARIANT_THRESHOLDS = {"smote": 0.39, "balanced": 0.62}    # 임시 고정 임계값(노트북 기준)로 1차 점수
+SMOTE_KW = dict(sampling_strategy=0.67, k_neighbors=5)
+
+_label = variant_label
+
+def _variant_params(spec: str, config: RunConfig) -> dict:
+    base, overrides = parse_variant(spec)
+    params = config.catboost_params()
+    params.update(overrides)
+    if base == "balanced":
+        params["auto_class_weights"] = "Balanced"
+    return params
 
+def _fit_fold(X: pd.DataFrame, y: np.ndarray, tr_idx, te_idx, variant: str, cat_idx, params: dict,
+              config: RunConfig, qpool: QuantizedPool | None = None):
+    """fold 1개 학습 → (test 확률, 모델). variant는 기본 변형(smote | balanced)."""
+    if qpool is not None and variant != "smote":
+        # 양자화된 전체 Pool에서 잘라 씀(행 복사/Pool 재생성/재양자화 없음), 예측만 원본 피처
         model = CatBoostClassifier(**params)
-        model.fit(train_pool, eval_set=test_pool, use_best_model=True, early_stopping_rounds=100, verbose=False)
+        with span("fit", rows=len(tr_idx), pool="quantized"):
+            model.fit(qpool.slice(tr_idx), eval_set=qpool.slice(te_idx), use_best_model=True,
+                      early_stopping_rounds=config.early_stopping_rounds, verbose=False)
+        with span("predict", rows=len(te_idx)):
+            proba = model.predict_proba(Pool(X.iloc[te_idx], cat_features=cat_idx))[:, 1]
+        return proba, model
+
+    X_tr, X_te = X.iloc[tr_idx].copy(), X.iloc[te_idx].copy()
+    y_tr, y_te = y[tr_idx], y[te_idx]
+
+    # SMOTENC 적용
+    if variant == "smote":
+        if SMOTENC is None:
+            raise RuntimeError("SMOTENC가 설치되지 않았습니다 (pip install imbalanced-learn).")
+        with span("smote_resample", rows=len(X_tr)):
+            # 범주형 정수 코드 + 수치형 float64 배열로 실행 → 범주형은 문자열로 복원되어 돌아옴
+            X_tr, y_tr = smotenc_resample(X_tr, y_tr, cat_idx, random_state=config.random_state, **SMOTE_KW)
+
+    # CatBoost Pool
+    train_pool = Pool(X_tr, y_tr, cat_features=cat_idx)
+    test_pool  = Pool(X_te, y_te, cat_features=cat_idx)
+
+    model = CatBoostClassifier(**params)
+    with span("fit", rows=len(X_tr)):
+        model.fit(train_pool, eval_set=test_pool, use_best_model=True, early_stopping_rounds=config.early_stopping_rounds, verbose=False)
 
+    with span("predict", rows=len(X_te)):
         proba = model.predict_proba(test_pool)[:, 1]
-        # 임시 고정 임계값(노트북 기준)로 1차 점수
-        thr = 0.39 if variant == "smote" else 0.62
-        pred = (proba >= thr).astype(int)
-
-        oof_proba[te_idx] = proba
-        oof_true[te_idx]  = y_te
-
-        accs.append(accuracy_score(y_te, pred))
-        f1s.append(f1_score(y_te, pred))
-        precs.append(precision_score(y_te, pred, zero_division=0))
-        recs.append(recall_score(y_te, pred))
-        aucs.append(roc_auc_score(y_te, proba))
-
-    # OOF 기준 최적 threshold 탐색(참고 정보)
-    best_th, best_f1 = 0.5, 0.0
-    for th in np.linspace(0.2, 0.8, 61):
-        f1 = f1_score(oof_true, (oof_proba >= th).astype(int))
-        if f1 > best_f1:
-            best_f1, best_th = f1, th
-
-    def fmt(arr): return f"{np.mean(arr):.4f} ± {np.std(arr):.4f}"
-    report = {"ACC": fmt(accs), "F1": fmt(f1s), "Precision": fmt(precs), "Recall": fmt(recs), "ROC_AUC": fmt(aucs)}
-    return report, float(best_th), float(np.mean(accs))
+    return proba, model
+
+
+class _CVRun:
+    """변형 1개의 fold 단위 CV 진행 상태(fold 캐시 + OOF 누적). 레이싱/전체 비교 공용."""
+    def __init__(self, X: pd.DataFrame, y: np.ndarray, spec: str, cat_idx, config: RunConfig, splits,
+                 qpool: QuantizedPool | None = None) -> None:
+        self.X, self.y, self.spec, self.cat_idx, self.config, self.splits = X, y, spec, cat_idx, config, splits
+        self.variant, _ = parse_variant(spec)
+        self.qpool = qpool if self.variant != "smote" else None
+        self.params = _variant_params(spec, config)
+        self.thr = VARIANT_THRESHOLDS[self.variant]
+        self.store = CVStore() if config.cv_cache else None
+        self.key = self.store.run_key(
+            X, y, variant=self.variant, params=self.params, n_folds=config.n_folds, seed=config.random_state,
+            extra={"early_stopping_rounds": config.early_stopping_rounds, "threshold": self.thr,
+                   "smote": SMOTE_KW if self.variant == "smote" else None,
+                   # 전체 데이터 기준 border로 학습하면 결과가 달라지므로 키에 포함
+                   "pool": "quantized" if self.qpool is not None else "raw"}) if self.store else None
+        self.fold_metrics: dict = {}                    # fold 번호 → 지표
+        self.oof_proba = np.zeros(len(y), dtype=float)
+        self.done = np.zeros(len(y), dtype=bool)
+        self.hits = 0
+
+    def run_fold(self, fold: int) -> float:
+        """fold 번호(1부터) 평가 → ACC (레이싱 점수)."""
+        if fold in self.fold_metrics:
+            return self.fold_metrics[fold]["ACC"]
+        tr_idx, te_idx = self.splits[fold - 1]
+        y_te = self.y[te_idx]
+        cached = self.store.load_fold(self.key, fold) if self.store else None
+        if cached is not None and np.array_equal(cached["te_idx"], te_idx):
+            # 같은 데이터/피처/파라미터/분할로 이미 계산된 fold → 학습 생략
+            CV_FOLD_CACHE.inc(variant=self.spec, result="hit")
+            self.hits += 1
+            proba, m = cached["proba"], cached["metrics"]
+        else:
+            t_fold = time.perf_counter()
+            with span("cv_fold", variant=self.spec, fold=fold, train_rows=len(tr_idx), test_rows=len(te_idx)):
+                proba, model = _fit_fold(self.X, self.y, tr_idx, te_idx, self.variant, self.cat_idx,
+                                         self.params, self.config, self.qpool)
+                pred = (proba >= self.thr).astype(int)
+                m = {"ACC": accuracy_score(y_te, pred), "F1": f1_score(y_te, pred),
+                     "Precision": precision_score(y_te, pred, zero_division=0),
+                     "Recall": recall_score(y_te, pred), "ROC_AUC": roc_auc_score(y_te, proba)}
+            CV_FOLD_SECONDS.observe(time.perf_counter() - t_fold, variant=self.spec)
+            if self.store:
+                CV_FOLD_CACHE.inc(variant=self.spec, result="miss")
+                self.store.save_fold(self.key, fold, te_idx, proba, m, model=model)
+        self.oof_proba[te_idx] = proba
+        self.done[te_idx] = True
+        self.fold_metrics[fold] = m
+        return m["ACC"]
+
+    def complete(self) -> None:
+        for fold in range(1, len(self.splits) + 1):
+            self.run_fold(fold)
+
+    def report(self):
+        """평가한 fold 기준 (metrics_dict, oof_best_threshold, mean_acc)."""
+        ms = [self.fold_metrics[k] for k in sorted(self.fold_metrics)]
+        col = lambda name: [m[name] for m in ms]
+        MODEL_CV_AUC.set(np.mean(col("ROC_AUC")), variant=self.spec)
+        MODEL_CV_ACC.set(np.mean(col("ACC")), variant=self.spec)
+
+        # OOF 기준 최적 threshold 탐색(참고 정보)
+        oof_true, oof_proba = self.y[self.done], self.oof_proba[self.done]
+        best_th, best_f1 = 0.5, 0.0
+        for th in np.linspace(0.2, 0.8, 61):
+            f1 = f1_score(oof_true, (oof_proba >= th).astype(int))
+            if f1 > best_f1:
+                best_f1, best_th = f1, th
+
+        def fmt(arr): return f"{np.mean(arr):.4f} ± {np.std(arr):.4f}"
+        report = {"ACC": fmt(col("ACC")), "F1": fmt(col("F1")), "Precision": fmt(col("Precision")),
+                  "Recall": fmt(col("Recall")), "ROC_AUC": fmt(col("ROC_AUC"))}
+        if len(ms) < len(self.splits):
+            report["folds"] = f"{len(ms)}/{len(self.splits)}"
+        return report, float(best_th), float(np.mean(col("ACC")))
+
+
+def _cv_splits(X: pd.DataFrame, y: np.ndarray, config: RunConfig):
+    skf = StratifiedKFold(n_splits=config.n_folds, shuffle=True, random_state=config.random_state)
+    return list(skf.split(X, y))
+
+def _quantized_pool(X: pd.DataFrame, y: np.ndarray, cat_idx, config: RunConfig, variants) -> QuantizedPool | None:
+    """설정이 켜져 있고 smote가 아닌 변형이 있으면 전체 데이터를 1회 양자화(파일 캐시)."""
+    if not config.quantized_pool or all(parse_variant(v)[0] == "smote" for v in variants):
+        return None
+    with span("quantize_pool", rows=len(X)) as sp:
+        qpool = QuantizedPool(X, y, cat_idx)
+        if sp is not None:
+            sp["attrs"]["loaded"] = qpool.loaded
+    print(f"[INFO] quantized pool {'loaded' if qpool.loaded else 'built'}: {qpool.path.name}")
+    return qpool
+
+def _evaluate_catboost_cv(X: pd.DataFrame, y: np.ndarray, variant: str, cat_idx, config: RunConfig):
+    """
+    variant: 'smote' or 'balanced' (+ ':depth=8,...' 덮어쓰기)
+    반환: (metrics_dict, oof_best_threshold, mean_acc) — 전 fold 평가
+    """
+    run = _CVRun(X, y, variant, cat_idx, config, _cv_splits(X, y, config),
+                 _quantized_pool(X, y, cat_idx, config, [variant]))
+    run.complete()
+    if run.store:
+        print(f"[CV] {_label(variant)} cache {run.key}: {run.hits}/{config.n_folds} folds reused")
+    return run.report()
+
+def _select_variant(X: pd.DataFrame, y: np.ndarray, cat_idx, config: RunConfig,
+                    qpool: QuantizedPool | None = None):
+    """
+    변형 선택. race: fold 단위로 번갈아 평가하며 열세 변형 조기 탈락(service/racing.py) → 승자만 전 fold 완료
+               full: 모든 변형 전 fold 평가 후 ACC 평균 최고(동률이면 config.variants 순서 우선)
+    반환: (best_spec, reports, best_ths, accs, selection_info)
+    """
+    splits = _cv_splits(X, y, config)
+    runs, failed = {}, {}
+    for spec in config.variants:
+        print(f"[CV] Evaluate {VARIANT_TITLES[parse_variant(spec)[0]]}"
+              + (f" [{spec}]" if ":" in spec else "") + " …")
+        runs[spec] = _CVRun(X, y, spec, cat_idx, config, splits, qpool)
+
+    if config.selection == "race" and len(runs) > 1:
+        with span("cv_race", candidates=len(runs), folds=config.n_folds):
+            result = race(list(runs), lambda spec, fold: runs[spec].run_fold(fold), config.n_folds,
+                          confidence=config.race_confidence, min_folds=config.race_min_folds)
+        failed = dict(result.failed)
+        best = result.best
+        with span("cv", variant=best, folds=config.n_folds):
+            runs[best].complete()                     # 승자는 리포트/OOF 임계값을 위해 전 fold 완료
+        info = {"method": "race", "confidence": config.race_confidence, **result.to_dict(),
+                "folds_run": {s: len(r.fold_metrics) for s, r in runs.items()}}
+    else:
+        for spec, run in runs.items():
+            try:
+                with span("cv", variant=spec, folds=config.n_folds):
+                    run.complete()
+            except Exception as e:
+                failed[spec] = str(e)
+        ok = [s for s in config.variants if s not in failed]
+        if not ok:
+            raise RuntimeError(f"모든 변형의 CV가 실패했습니다: {list(config.variants)}")
+        best = max(ok, key=lambda s: runs[s].report()[2])          # max는 동률 시 앞쪽 유지
+        info = {"method": "full", "folds_run": {s: len(r.fold_metrics) for s, r in runs.items()}}
+
+    reports, best_ths, accs = {}, {}, {}
+    for spec, run in runs.items():
+        if spec in failed or not run.fold_metrics:
+            reports[spec], best_ths[spec], accs[spec] = None, None, -1.0
+            print(f"[CV] {_label(spec)} failed: {failed.get(spec)}")
+            continue
+        reports[spec], best_ths[spec], accs[spec] = run.report()
+        if run.store:
+            print(f"[CV] {_label(spec)} cache {run.key}: {run.hits}/{len(run.fold_metrics)} folds reused")
+        print(f"[CV] {_label(spec)}:", reports[spec], f"(OOF best_th={best_ths[spec]:.3f})")
+    return best, reports, best_ths, accs, info
 
 # --- DB 보장 & 쓰기 도우미 -----------------------------------
-def _ensure_db_and_score_table():
+def _ensure_db_and_score_table(db: DBConfig):
     """DB와 점수 테이블을 '존재 보장'한 뒤 SQLAlchemy Engine 반환."""
     # 1) DB 보장
     conn = pymysql.connect(
-        host=DB_HOST, port=int(DB_PORT), user=DB_USER, password=DB_PASS,
+        host=db.host, port=int(db.port), user=db.user, password=db.password,
         charset="utf8mb4", autocommit=True
     )
     try:
         with conn.cursor() as cur:
             cur.execute(
-                f"CREATE DATABASE IF NOT EXISTS `{DB_NAME}` "
+                f"CREATE DATABASE IF NOT EXISTS `{db.name}` "
                 "DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
             )
     finally:
         conn.close()
 
     # 2) 테이블 보장
-    url = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    eng = create_engine(url, pool_pre_ping=True)
+    eng = create_engine(db.url, pool_pre_ping=True)
     with eng.begin() as c:
         c.exec_driver_sql(f"""
-        CREATE TABLE IF NOT EXISTS {DB_TABLE} (
+        CREATE TABLE IF NOT EXISTS {db.table} (
           customer_id        BIGINT NOT NULL,
           churn_probability  DECIMAL(9,6) NOT NULL,
           _scored_at         DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -182,20 +305,23 @@ def _ensure_db_and_score_table():
         """)
     return eng
 
-def _write_scores_and_view(df_scores: pd.DataFrame):
-    eng = _ensure_db_and_score_table()  # ✅ DB/테이블 보장 후 엔진 반환
-    df_scores.to_sql(DB_TABLE, con=eng, if_exists="replace", index=False)
-    print(f"[DB] wrote {len(df_scores):,} rows -> {DB_NAME}.{DB_TABLE}")
+def _write_scores_and_view(df_scores: pd.DataFrame, config: RunConfig):
+    db = config.db
+    eng = _ensure_db_and_score_table(db)  # ✅ DB/테이블 보장 후 엔진 반환
+    with DB_WRITE_SECONDS.time(table=db.table):
+        df_scores.to_sql(db.table, con=eng, if_exists="replace", index=False)
+    DB_WRITE_ROWS.inc(len(df_scores), table=db.table)
+    print(f"[DB] wrote {len(df_scores):,} rows -> {db.name}.{db.table}")
 
-    if _flag("CREATE_VIEW", "false"):
+    if config.create_view:
         try:
             with eng.begin() as conn:
-                conn.execute(text("""
+                conn.execute(text(f"""
                 CREATE OR REPLACE VIEW vw_rfm_for_app AS
                 SELECT r.*,
                        s.churn_probability
                 FROM rfm_result_once r
-                LEFT JOIN stg_churn_score s
+                LEFT JOIN {db.table} s
                   ON s.customer_id = r.customer_id;
                 """))
             print("[DB] created/updated view: vw_rfm_for_app")
@@ -204,14 +330,12 @@ def _write_scores_and_view(df_scores: pd.DataFrame):
             print(f"[WARN] create view failed (maybe rfm_result_once missing yet): {e}")
 
 # --- 메인 -----------------------------------------------------
-def main():
-    np.random.seed(RANDOM_STATE)
-
-    # 1) CSV 자동 탐색 로드
-    df_raw = load_csv_from_data()  # 기본 경로: 3-application/assets/data/…
-
-    # 2) 피처 엔지니어링
-    df_ = engineer_features(df_raw).copy()
+def _features(df_raw: pd.DataFrame, feature_params: dict | None = None):
+    """원본 → 학습 피처 행렬. feature_params 미지정 시 이 데이터로 구간/중앙값 산출."""
+    # 2) 피처 엔지니어링 (학습 시 구간/중앙값은 스코어링 재현용으로 보관)
+    with span("feature_engineering", rows=len(df_raw)):
+        feature_params = feature_params or fit_feature_params(df_raw)
+        df_ = engineer_features(df_raw, params=feature_params).copy()
     print(f"[INFO] engineer_features 완료. 현재 컬럼 수={len(df_.columns)}")
     print(f"[INFO] 컬럼 목록: {list(df_.columns)}")
 
@@ -222,82 +346,229 @@ def main():
     print(f"[INFO] 학습에 사용할 추천 피처 {len(cols)}개: {cols}")
 
     # 4) CatBoost 범주형 처리
-    _, cat_idx = _cat_cols_and_idx(X)
-
-    # 5) 두 변형을 5-Fold로 평가하여 ACC 평균이 더 높은 쪽 채택
-    print("[CV] Evaluate CatBoost + SMOTENC …")
-    try:
-        rep_smote, best_th_smote, acc_smote = _evaluate_catboost_cv(X, y, "smote", cat_idx, RANDOM_STATE)
-        print("[CV] SMOTENC:", rep_smote, f"(OOF best_th={best_th_smote:.3f})")
-    except Exception as e:
-        rep_smote, best_th_smote, acc_smote = None, None, -1.0
-        print(f"[CV] SMOTENC failed: {e}")
-
-    print("[CV] Evaluate CatBoost (auto_class_weights='Balanced') …")
-    rep_bal, best_th_bal, acc_bal = _evaluate_catboost_cv(X, y, "balanced", cat_idx, RANDOM_STATE)
-    print("[CV] Balanced:", rep_bal, f"(OOF best_th={best_th_bal:.3f})")
-
-    # 6) 선택
-    if acc_smote >= acc_bal:
-        best_variant = "smote"
-        print(f"[BEST] Choose SMOTENC (ACC={acc_smote:.4f} ≥ {acc_bal:.4f})")
-    else:
-        best_variant = "balanced"
-        print(f"[BEST] Choose Balanced (ACC={acc_bal:.4f} > {acc_smote:.4f})")
+    cat_cols, cat_idx = _cat_cols_and_idx(X)
+    return X, y, cols, cat_cols, cat_idx, feature_params
+
+def _fit_full(X: pd.DataFrame, y: np.ndarray, cat_idx, config: RunConfig):
+    """CV 변형 선택 + 전체 데이터 최종 학습 → (model, best_variant, reports, best_ths, selection, params)."""
+    # 5) 변형 선택(기본: fold 단위 레이싱 — 열세가 확실한 변형은 남은 fold 생략)
+    #    smote가 아닌 변형의 fold/최종 학습은 1회 양자화한 Pool을 잘라 씀
+    qpool = _quantized_pool(X, y, cat_idx, config, config.variants)
+    best_variant, reports, best_ths, accs, selection = _select_variant(X, y, cat_idx, config, qpool)
+
+    # 6) 선택 결과
+    others = ", ".join(f"{_label(v)}={accs[v]:.4f}" for v in config.variants if v != best_variant)
+    print(f"[BEST] Choose {_label(best_variant)} (ACC={accs[best_variant]:.4f}"
+          + (f" vs {others})" if others else ")")
+          + f" — {sum(selection['folds_run'].values())} fold fits ({selection['method']})")
 
     # 7) 최종 학습 (전체 학습 데이터)
     X_fit = X.copy()
     y_fit = y.copy()
 
-    if best_variant == "smote":
+    if parse_variant(best_variant)[0] == "smote":
         if SMOTENC is None:
             raise RuntimeError("SMOTENC 미설치 상태에서는 smote 변형으로 최종 학습할 수 없습니다.")
-        smote = SMOTENC(categorical_features=cat_idx, sampling_strategy=0.67,
-                        random_state=RANDOM_STATE, k_neighbors=5)
-        X_res, y_res = smote.fit_resample(X_fit.values, y_fit)
-        X_fit = pd.DataFrame(X_res, columns=X.columns)
-        y_fit = y_res
-        # 범주형 문자열 보장
-        for i in cat_idx:
-            X_fit.iloc[:, i] = X_fit.iloc[:, i].astype(str)
-
-    params = dict(
-        loss_function="Logloss",
-        eval_metric="AUC",
-        iterations=800,
-        learning_rate=0.05,
-        depth=6,
-        l2_leaf_reg=3.0,
-        random_state=RANDOM_STATE,
-        verbose=False,
-    )
-    if best_variant == "balanced":
-        params["auto_class_weights"] = "Balanced"
+        with span("smote_resample", rows=len(X_fit)):
+            X_fit, y_fit = smotenc_resample(X_fit, y_fit, cat_idx, random_state=config.random_state, **SMOTE_KW)
 
-    train_pool = Pool(X_fit, y_fit, cat_features=cat_idx)
-    model = CatBoostClassifier(**params)
-    model.fit(train_pool, verbose=False)
+    params = _variant_params(best_variant, config)
 
-    # 8) 저장 (타임스탬프 파일명)
+    with span("final_fit", variant=best_variant, rows=len(X_fit)):
+        if qpool is not None and parse_variant(best_variant)[0] != "smote":
+            train_pool = qpool.slice()            # CV와 같은 양자화 결과 재사용
+        else:
+            train_pool = Pool(X_fit, y_fit, cat_features=cat_idx)
+        model = CatBoostClassifier(**params)
+        model.fit(train_pool, verbose=False)
+    return model, best_variant, reports, best_ths, selection, params
+
+def _save_model(model, meta: dict, X: pd.DataFrame, cat_cols, hashes: np.ndarray, config: RunConfig) -> Path:
+    """8) 모델(.pkl) + 추론 전용(.npz) + 메타(.meta.json) + 학습 행 스냅샷(.rows.npz) 저장."""
     ts = _timestamp()
-    model_path = MODELS_DIR / f"best_model_{ts}.pkl"
-    with open(model_path, "wb") as f:
-        pickle.dump(model, f)
+    config.models_dir.mkdir(parents=True, exist_ok=True)
+    with span("save_model"):
+        # 같은 초에 끝난 동시 실행끼리 덮어쓰지 않도록 배타 생성(x) + 접미사
+        for k in range(100):
+            model_path = config.models_dir / f"best_model_{ts}{f'_{k}' if k else ''}.pkl"
+            try:
+                f = open(model_path, "xb")
+                break
+            except FileExistsError:
+                continue
+        with f:
+            pickle.dump(model, f)
     print(f"[SAVE] model -> {model_path}")
 
+    # 스코어링(service/scoring.py)에서 재학습 없이 같은 피처를 만들 수 있도록 메타 저장
+    meta = {"timestamp": ts, "model_path": str(model_path), **meta,
+            "config": config.to_dict(), "profile": str(model_path.with_suffix(PROFILE_SUFFIX))}
+    # 추론 전용 .npz 내보내기(catboost 없이 스코어링) — predict_proba parity 통과 시에만 사용
+    try:
+        from service.model_export import export_with_parity
+        with span("export_compiled"):
+            meta["compiled"] = export_with_parity(model, X, cat_cols, model_path.with_suffix(".npz"))
+        print(f"[SAVE] compiled -> {meta['compiled']}")
+    except Exception as e:
+        print(f"[WARN] compiled export 실패(pkl로 스코어링): {e}")
+    meta_path = model_path.with_suffix(".meta.json")
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    print(f"[SAVE] meta  -> {meta_path}")
+    # 다음 증분 실행의 delta 계산 기준
+    save_rows(model_path, hashes)
+    return model_path
+
+def _train_and_score(config: RunConfig) -> Path:
+    np.random.seed(config.random_state)
+
+    # 1) CSV 자동 탐색 로드
+    with span("load") as sp:
+        if config.data_csv is not None:
+            df_raw = load_csv_from_data(config.data_csv.name, data_dir=config.data_csv.parent)
+        else:
+            df_raw = load_csv_from_data()  # 기본 경로: 3-application/assets/data/…
+        if sp is not None:
+            sp["attrs"]["rows"] = len(df_raw)
+    ids = df_raw["CustomerId"].values
+
+    # 증분 모드: 직전 모델과 같은 피처 파라미터로 피처를 만들어야 이어 학습 가능
+    prev_path, prev_meta = previous_model(config.models_dir) if config.mode == "incremental" else (None, None)
+    if config.mode == "incremental" and prev_meta is None:
+        # jobs 진행률 마일스톤이 "[INCR]"을 기다리므로 폴백도 같은 접두어로 남김
+        print(f"[INCR] full: 이어 학습할 모델/메타 없음({prev_path}) → 전체 재학습")
+    X, y, cols, cat_cols, cat_idx, feature_params = _features(
+        df_raw, prev_meta["feature_params"] if prev_meta else None)
+    hashes = row_hashes(ids, X, y)
+
+    model, update = None, None
+    if prev_meta is not None:
+        with span("incremental_update", rows=len(X)) as sp:
+            model, update = incremental_update(prev_path, prev_meta, X, y, hashes, cat_idx, config)
+            if sp is not None:
+                sp["attrs"].update(decision=update["decision"], delta=update.get("delta"))
+        print(f"[INCR] {update['decision']}: {update['reason']} (delta={update.get('delta', '-')}"
+              + (f", valid AUC {update['valid_auc_prev']} → {update['valid_auc_new']}"
+                 if "valid_auc_new" in update else "") + ")")
+
+    if update is not None and update["decision"] == "reuse":
+        # 변경분 없음 → 학습/저장 없이 직전 모델로 재스코어
+        model_path = prev_path
+        with open(prev_path, "rb") as f:
+            model = pickle.load(f)
+    else:
+        if model is not None:
+            meta = {"variant": prev_meta["variant"], "features": cols, "cat_features": cat_cols,
+                    "feature_params": feature_params, "oof_best_threshold": prev_meta.get("oof_best_threshold"),
+                    "cv": prev_meta.get("cv"), "selection": prev_meta.get("selection"),
+                    "params": update.pop("params"), "reference": prev_meta["reference"], "incremental": update}
+        else:
+            if update is not None:
+                # 직전 모델 기준 피처 파라미터 대신 현재 데이터로 다시 산출
+                X, y, cols, cat_cols, cat_idx, feature_params = _features(df_raw)
+                hashes = row_hashes(ids, X, y)
+            model, best_variant, reports, best_ths, selection, params = _fit_full(X, y, cat_idx, config)
+            meta = {"variant": best_variant, "features": cols, "cat_features": cat_cols,
+                    "feature_params": feature_params, "oof_best_threshold": best_ths[best_variant],
+                    "cv": reports, "selection": selection, "params": params,
+                    # 증분 모드 drift 기준(전체 재학습 때만 갱신)
+                    "reference": reference_profile(X, cat_cols),
+                    "incremental": {**{k: v for k, v in (update or {}).items() if k != "params"},
+                                    "decision": "full", "generation": 0}}
+        model_path = _save_model(model, meta, X, cat_cols, hashes, config)
+
     # 9) 전수 예측 확률 저장 (churn_scores.csv)
-    full_pool = Pool(X, y, cat_features=cat_idx)
-    prob = model.predict_proba(full_pool)[:, 1]
+    with span("predict", rows=len(X)):
+        full_pool = Pool(X, y, cat_features=cat_idx)
+        prob = model.predict_proba(full_pool)[:, 1]
     out = pd.DataFrame({"customer_id": df_raw["CustomerId"].values, "churn_probability": prob})
-    out.to_csv(OUT_CSV, index=False)
-    print(f"[SAVE] scores -> {OUT_CSV} ({len(out):,} rows)")
+    with span("csv_write", rows=len(out)):
+        config.out_csv.parent.mkdir(parents=True, exist_ok=True)
+        out.to_csv(config.out_csv, index=False)
+    print(f"[SAVE] scores -> {config.out_csv} ({len(out):,} rows)")
+
+    # 9-1) SHAP 설명 사전계산: 전역 중요도(<model>.explain.json) + 고객별 상위 k — 실패해도 스코어는 유지
+    explain = None
+    if config.explain_top_k > 0:
+        try:
+            from service.explain_batch import build_explain, save_global
+            with span("explain_batch", rows=len(X), top_k=config.explain_top_k):
+                explain, glob = build_explain(model, X, df_raw["CustomerId"].values, cat_idx, config.explain_top_k)
+                print(f"[SAVE] explain -> {save_global(model_path, glob)}")
+        except Exception as e:
+            print(f"[WARN] SHAP 설명 사전계산 실패: {e}")
 
-    # 10) DB 적재(+VIEW) — 런타임 토글 반영
-    if _flag("WRITE_DB", "false"):
-        _write_scores_and_view(out)
+    # 10) DB 적재(+VIEW)
+    if config.write_db:
+        with span("db_write", rows=len(out), table=config.db.table):
+            _write_scores_and_view(out, config)
+        # 11) 규칙 기반 추천 사전계산(customer_reco) — 실패해도 점수 적재는 유지
+        try:
+            from service.reco_batch import build_reco_frame, write_reco
+            with span("reco_batch", rows=len(out), table=config.db.reco_table):
+                write_reco(build_reco_frame(df_raw.assign(churn_probability=prob)), config.db)
+        except Exception as e:
+            print(f"[WARN] customer_reco 갱신 실패: {e}")
+        # 12) 고객별 SHAP 상위 피처(customer_explain)
+        if explain is not None:
+            try:
+                from service.explain_batch import write_explain
+                with span("explain_write", rows=len(explain), table=config.db.explain_table):
+                    write_explain(explain, config.db)
+            except Exception as e:
+                print(f"[WARN] customer_explain 갱신 실패: {e}")
 
     # 간단 프린트
     print(out.head(10).to_string(index=False))
+    return model_path
+
+def main(config: RunConfig | None = None) -> Path:
+    """학습/스코어링 실행 + 단계별 소요 프로파일(<model>.profile.json) 저장.
+    config 미지정 시 환경변수 기반 RunConfig.from_env()."""
+    config = config or RunConfig.from_env()
+    with trace_run("full_scoring", mode=config.mode, n_folds=config.n_folds, random_state=config.random_state,
+                   variants=list(config.variants)) as run:
+        model_path = _train_and_score(config)
+    profile_path = run.save(model_path.with_suffix(PROFILE_SUFFIX))
+    print(f"[SAVE] profile -> {profile_path} (total {run.wall_s:.1f}s)")
+    metrics.flush()
+    return model_path
+
+def parse_args(argv=None) -> RunConfig:
+    """CLI 인자 → RunConfig (미지정 항목은 환경변수/기본값)."""
+    base = RunConfig.from_env()
+    ap = argparse.ArgumentParser(description="CatBoost 변형 CV 선택 → 학습/저장 → 전수 스코어")
+    ap.add_argument("--folds", type=int, default=base.n_folds)
+    ap.add_argument("--seed", type=int, default=base.random_state)
+    ap.add_argument("--variants", default=";".join(base.variants),
+                    help=f"';' 구분({';'.join(VARIANTS)}, 변형별 덮어쓰기 예: 'balanced;balanced:depth=8')")
+    ap.add_argument("--selection", choices=SELECTIONS, default=base.selection,
+                    help="race: fold 단위 레이싱(열세 변형 조기 탈락) | full: 모든 변형 전 fold 비교")
+    ap.add_argument("--race-confidence", type=float, default=base.race_confidence)
+    ap.add_argument("--iterations", type=int, default=base.iterations)
+    ap.add_argument("--mode", choices=MODES, default=base.mode,
+                    help="full: CV 선택+전체 학습 | incremental: 최신 모델에서 신규/변경 행만 이어 학습")
+    ap.add_argument("--warm-iterations", type=int, default=base.warm_iterations, help="증분 1회 추가 트리 수")
+    ap.add_argument("--explain-top-k", type=int, default=base.explain_top_k,
+                    help="고객별 SHAP 상위 피처 수(service/explain_batch.py, 0=끔)")
+    ap.add_argument("--threads", type=int, default=base.thread_count, help="CatBoost thread_count(-1=전체)")
+    ap.add_argument("--data-csv", default=base.data_csv, help="학습 CSV(기본 assets/data 자동 탐색)")
+    ap.add_argument("--out-csv", default=base.out_csv)
+    ap.add_argument("--models-dir", default=base.models_dir)
+    ap.add_argument("--write-db", action=argparse.BooleanOptionalAction, default=base.write_db)
+    ap.add_argument("--create-view", action=argparse.BooleanOptionalAction, default=base.create_view)
+    ap.add_argument("--cv-cache", action=argparse.BooleanOptionalAction, default=base.cv_cache,
+                    help="fold 결과 캐시(service/cv_store.py) 사용")
+    ap.add_argument("--quantized-pool", action=argparse.BooleanOptionalAction, default=base.quantized_pool,
+                    help="전체 데이터 1회 양자화 후 fold/최종 학습에 재사용(service/pool_cache.py)")
+    a = ap.parse_args(argv)
+    return base.replace(n_folds=a.folds, random_state=a.seed, iterations=a.iterations, thread_count=a.threads,
+                        variants=split_variants(a.variants),
+                        selection=a.selection, race_confidence=a.race_confidence,
+                        data_csv=a.data_csv, out_csv=a.out_csv, models_dir=a.models_dir,
+                        write_db=a.write_db, create_view=a.create_view, cv_cache=a.cv_cache,
+                        quantized_pool=a.quantized_pool, mode=a.mode, warm_iterations=a.warm_iterations,
+                        explain_top_k=a.explain_top_k)
 
 if __name__ == "__main__":
-    main()
+    main(parse_args())
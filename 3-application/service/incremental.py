@@ -0,0 +1,207 @@
+# incremental.py
+# ------------------------------------------------------------
+# 목적: full_scoring 증분 모드 — 최신 best_model_*에서 이어 학습(CatBoost init_model)해 갱신 비용을 변경분(delta)에 비례시킴
+# - delta: 직전 모델 학습 행 스냅샷(<model>.rows.npz, 행 해시 = CustomerId + 피처 + 라벨)에 없는 행 = 신규/변경 고객
+# - 가드레일(하나라도 걸리면 전체 재학습으로 폴백)
+#   · 직전 모델/메타/스냅샷/기준 분포 없음, 피처 목록 변경
+#   · delta 비율 > warm_max_delta, 연속 증분 횟수 >= warm_max_generations(트리 누적 방지)
+#   · drift: delta 피처 분포 vs 전체 학습 시 기준 분포(meta["reference"]) PSI > drift_psi
+#   · 검증: 학습에서 뺀 delta 일부(두 모델 모두 처음 보는 행)로 직전/갱신 모델 ROC AUC 비교,
+#     하락 > warm_max_auc_drop (기존 행은 직전 모델의 학습 데이터라 직전 모델에 유리하므로 쓰지 않음)
+#   · 통과하면 검증 행까지 포함한 delta 전체로 직전 모델에서 다시 이어 학습(스냅샷의 모든 행이 학습된 상태 유지)
+# - delta가 없으면 학습 없이 직전 모델 재사용(decision="reuse")
+# - 기준 분포는 전체 재학습 때만 새로 잡고 증분 모델은 그대로 물려받음 → 누적 drift도 감지
+# ------------------------------------------------------------
+from __future__ import annotations
+import json
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from service.config import RunConfig
+from service.scoring import latest_model_path
+
+ROWS_SUFFIX = ".rows.npz"
+PSI_BINS = 10
+PSI_EPS = 1e-4
+VALID_FRAC = 0.2             # delta 중 검증용 비율(학습에서 제외)
+
+
+# ─────────────────────────────────────────────
+# 행 스냅샷 / 기준 분포
+# ─────────────────────────────────────────────
+def row_hashes(ids: Sequence, X: pd.DataFrame, y: np.ndarray) -> np.ndarray:
+    """고객별 (CustomerId, 피처, 라벨) 해시 — 값이 하나라도 바뀌면 다른 해시."""
+    frame = X.reset_index(drop=True).assign(_id=np.asarray(ids), _y=np.asarray(y))
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+def save_rows(model_path: Path, hashes: np.ndarray) -> Path:
+    path = Path(model_path).with_suffix(ROWS_SUFFIX)
+    np.savez_compressed(path, hashes=np.asarray(hashes, dtype=np.uint64))
+    return path
+
+def load_rows(model_path: Path) -> Optional[np.ndarray]:
+    path = Path(model_path).with_suffix(ROWS_SUFFIX)
+    if not path.exists():
+        return None
+    with np.load(path, allow_pickle=False) as z:
+        return z["hashes"]
+
+def reference_profile(X: pd.DataFrame, cat_cols: Sequence[str], bins: int = PSI_BINS) -> Dict[str, Any]:
+    """PSI 기준 분포: 수치형은 분위수 구간 경계+비율, 범주형은 값별 비율."""
+    prof: Dict[str, Any] = {}
+    for c in X.columns:
+        s = X[c]
+        if c in cat_cols:
+            freq = s.astype(str).value_counts(normalize=True)
+            prof[c] = {"kind": "cat", "freq": {str(k): float(v) for k, v in freq.items()}}
+        else:
+            v = pd.to_numeric(s, errors="coerce").dropna().to_numpy(dtype=float)
+            edges = np.unique(np.quantile(v, np.linspace(0, 1, bins + 1)[1:-1])) if len(v) else np.array([])
+            counts = np.bincount(np.searchsorted(edges, v, side="right"), minlength=len(edges) + 1)
+            prof[c] = {"kind": "num", "edges": edges.tolist(), "freq": (counts / max(len(v), 1)).tolist()}
+    return prof
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    e = np.clip(expected, PSI_EPS, None)
+    a = np.clip(actual, PSI_EPS, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+def psi_report(reference: Dict[str, Any], X: pd.DataFrame) -> Dict[str, float]:
+    """기준 분포 대비 피처별 PSI(0.1 미만 안정, 0.2 이상 유의미한 변화가 통상 기준)."""
+    out: Dict[str, float] = {}
+    for c, ref in reference.items():
+        if c not in X.columns or len(X) == 0:
+            continue
+        if ref["kind"] == "cat":
+            freq = X[c].astype(str).value_counts(normalize=True)
+            keys = sorted(set(ref["freq"]) | set(freq.index))
+            out[c] = _psi(np.array([ref["freq"].get(k, 0.0) for k in keys]),
+                          np.array([float(freq.get(k, 0.0)) for k in keys]))
+        else:
+            v = pd.to_numeric(X[c], errors="coerce").dropna().to_numpy(dtype=float)
+            counts = np.bincount(np.searchsorted(np.asarray(ref["edges"]), v, side="right"),
+                                 minlength=len(ref["freq"]))
+            out[c] = _psi(np.asarray(ref["freq"]), counts / max(len(v), 1))
+    return out
+
+
+# ─────────────────────────────────────────────
+# 직전 모델 / 증분 학습
+# ─────────────────────────────────────────────
+def previous_model(models_dir: Path) -> Tuple[Optional[Path], Optional[Dict[str, Any]]]:
+    """최신 best_model_*.pkl 경로 + 메타(없으면 (None, None))."""
+    try:
+        path = latest_model_path(models_dir)
+    except FileNotFoundError:
+        return None, None
+    meta_path = path.with_suffix(".meta.json")
+    if not meta_path.exists():
+        return path, None
+    with open(meta_path, encoding="utf-8") as f:
+        return path, json.load(f)
+
+def _auc(y: np.ndarray, p: np.ndarray) -> float:
+    from sklearn.metrics import roc_auc_score
+    return float(roc_auc_score(y, p)) if len(np.unique(y)) == 2 else float("nan")
+
+def _resample_smote(X: pd.DataFrame, y: np.ndarray, cat_idx: List[int], config: RunConfig):
+    """smote 변형: delta 학습 행에만 SMOTENC 적용(소수 클래스가 k_neighbors 이하이면 None)."""
+    from service.full_scoring import SMOTE_KW
+    from service.resample import SMOTENC, smotenc_resample
+    if SMOTENC is None or int(np.bincount(y, minlength=2).min()) <= SMOTE_KW["k_neighbors"]:
+        return None
+    return smotenc_resample(X, y, cat_idx, random_state=config.random_state, **SMOTE_KW)
+
+def update(prev_path: Path, prev_meta: Dict[str, Any], X: pd.DataFrame, y: np.ndarray, hashes: np.ndarray,
+           cat_idx: List[int], config: RunConfig) -> Tuple[Any, Dict[str, Any]]:
+    """
+    직전 모델에서 이어 학습 시도.
+    반환: (모델 또는 None, info) — info["decision"]: warm | reuse | full, info["reason"]: 사유
+    모델이 None이면 호출 측이 전체 재학습.
+    """
+    from catboost import CatBoostClassifier, Pool
+
+    info: Dict[str, Any] = {"base_model": str(prev_path), "rows": int(len(X))}
+    def full(reason: str):
+        info.update(decision="full", reason=reason)
+        return None, info
+
+    if list(prev_meta.get("features", [])) != list(X.columns):
+        return full("feature set changed")
+    if "reference" not in prev_meta:
+        return full("previous model has no reference profile")
+    prev_hashes = load_rows(prev_path)
+    if prev_hashes is None:
+        return full(f"{prev_path.with_suffix(ROWS_SUFFIX).name} missing")
+    generation = int((prev_meta.get("incremental") or {}).get("generation", 0))
+    if generation >= config.warm_max_generations:
+        return full(f"{generation} consecutive warm updates (max {config.warm_max_generations})")
+
+    is_delta = ~np.isin(hashes, prev_hashes)
+    n_delta = int(is_delta.sum())
+    info.update(delta=n_delta, delta_frac=round(n_delta / max(len(X), 1), 4), generation=generation)
+    if n_delta == 0:
+        info.update(decision="reuse", reason="no new or changed rows")
+        return None, info
+    if info["delta_frac"] > config.warm_max_delta:
+        return full(f"delta {info['delta_frac']:.1%} > {config.warm_max_delta:.0%}")
+
+    psi = psi_report(prev_meta["reference"], X[is_delta])
+    worst = max(psi, key=psi.get) if psi else None
+    info["psi"] = {k: round(v, 4) for k, v in psi.items()}
+    if worst is not None and psi[worst] > config.drift_psi:
+        return full(f"drift: PSI({worst})={psi[worst]:.3f} > {config.drift_psi}")
+
+    # delta 일부는 검증용으로 남김(직전/갱신 모델 모두 처음 보는 행)
+    rng = np.random.default_rng(config.random_state)
+    delta_idx = np.flatnonzero(is_delta)
+    hold = rng.random(len(delta_idx)) < VALID_FRAC
+    tr_idx, va_idx = delta_idx[~hold], delta_idx[hold]
+    if len(np.unique(y[tr_idx])) < 2 or len(np.unique(y[va_idx])) < 2:
+        return full("delta too small to train/validate (needs both classes)")
+
+    with open(prev_path, "rb") as f:
+        prev_model = pickle.load(f)
+    params = dict(prev_meta.get("params") or config.catboost_params())
+    params.update(iterations=config.warm_iterations, thread_count=config.thread_count)
+    if params.pop("auto_class_weights", None):
+        # 이어 붙일 트리는 클래스 가중치가 같아야 함 → delta 비율로 다시 계산하지 않고 직전 값 고정
+        params["class_weights"] = prev_model.get_all_params()["class_weights"]
+    smote = str(prev_meta.get("variant", "")).split(":")[0] == "smote"
+
+    def fit_warm(idx: np.ndarray):
+        X_tr, y_tr = X.iloc[idx], y[idx]
+        if smote:
+            res = _resample_smote(X_tr, y_tr, cat_idx, config)
+            if res is None:
+                return None
+            X_tr, y_tr = res
+        model = CatBoostClassifier(**params)
+        # 라벨 타입도 직전 모델과 같아야 함(quantized Pool로 학습한 모델은 float 라벨)
+        y_tr = np.asarray(y_tr).astype(prev_model.classes_.dtype)
+        model.fit(Pool(X_tr, y_tr, cat_features=cat_idx), init_model=prev_model, verbose=False)
+        # catboost 1.2: init_model로 합쳐진 직후의 메모리 모델은 CTR 테이블 상태가 불완전해
+        # JSON export/feature importance가 멈추거나 죽음 → 직렬화 왕복으로 정규화(예측 결과는 동일)
+        return pickle.loads(pickle.dumps(model))
+
+    model = fit_warm(tr_idx)
+    if model is None:
+        return full("delta too small for SMOTENC")
+
+    va_pool = Pool(X.iloc[va_idx], cat_features=cat_idx)
+    auc_prev = _auc(y[va_idx], prev_model.predict_proba(va_pool)[:, 1])
+    auc_new = _auc(y[va_idx], model.predict_proba(va_pool)[:, 1])
+    info.update(train_rows=int(len(tr_idx)), valid_rows=int(len(va_idx)), params=params,
+                valid_auc_prev=round(auc_prev, 4), valid_auc_new=round(auc_new, 4))
+    if not auc_new >= auc_prev - config.warm_max_auc_drop:
+        return full(f"valid AUC {auc_new:.4f} < previous {auc_prev:.4f} - {config.warm_max_auc_drop}")
+
+    # 검증 통과 → 검증용으로 뺀 행까지 delta 전체로 다시 이어 학습
+    # (스냅샷에는 delta 전체 해시가 기록되므로 학습하지 않은 행을 남기면 다음 전체 재학습까지 반영 안 됨)
+    model = fit_warm(delta_idx)   # 검증 fit이 SMOTENC를 통과했으면 더 큰 delta도 통과
+    info.update(decision="warm", reason="guardrails passed", generation=generation + 1, refit_rows=n_delta)
+    return model, info
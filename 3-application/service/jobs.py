@@ -0,0 +1,342 @@
+# jobs.py
+# ------------------------------------------------------------
+# 목적: 학습/적재 작업을 Streamlit 스크립트 스레드 밖(별도 프로세스)에서 실행하는 경량 작업 큐
+# - submit("train_and_score", write_db=True) → job_id 즉시 반환, 워커 프로세스가 백그라운드 실행
+# - 작업별 폴더 assets/logs/jobs/<job_id>/ : job.json(상태) + log.txt(stdout/stderr)
+# - 워커는 jobs/.lock 파일 락으로 직렬화 → 동시에 눌러도 한 번에 1개만 실행(나머지는 queued)
+# - 각 단계는 자식 프로세스(python service/full_scoring.py --folds 5 ... 등) → os.environ 경합/모듈 reload 없음
+# - 페이지: get(job_id)로 상태/진행률, read_log(job_id, offset)로 로그 증분 폴링, cancel(job_id)
+# - 진행률: 단계별 로그 접두어 마일스톤(학습은 RunConfig.variants 기준, 레이싱 조기 탈락도 완료로 집계)
+# 사용: python -m service.jobs submit train_and_score [--no-db] [--incremental] [--variants ...] / list / show <job_id>
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from service.config import RunConfig, split_variants, variant_label
+
+APP_DIR = Path(__file__).resolve().parents[1]           # 3-application/
+JOBS_DIR = Path(os.getenv("JOBS_DIR", str(APP_DIR / "assets" / "logs" / "jobs")))
+MODELS_DIR = APP_DIR / "models"
+POLL_S = 0.5
+ACTIVE = ("queued", "running")
+
+
+# ─────────────────────────────────────────────
+# 작업 종류: 단계(argv + ENV) 목록과 진행률 마일스톤(로그 접두어)
+# ─────────────────────────────────────────────
+_INGEST_STEP = {
+    "name": "ingest", "argv": ["db/csv_to_db.py"], "env": {},
+    "milestones": [">> Create tables", ">> Load bank_customer", ">> Load stg_churn_score"],
+}
+
+def _variant_milestones(variants: Sequence[str]) -> List[List[str]]:
+    """변형별 완료 로그(대안 접두어 목록): CV 리포트 / 실패 / 레이싱 조기 탈락 중 먼저 나온 것."""
+    return [[f"[CV] {variant_label(v)}:", f"[CV] {variant_label(v)} failed",
+             f"[RACE] drop {v} ", f"[RACE] {v} failed"] for v in variants]
+
+def _train_steps(write_db: bool = True, create_view: bool = True, ingest: bool = False,
+                 n_folds: int = 5, random_state: int = 42, mode: str = "full",
+                 variants: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    # 변형 목록을 여기서 확정해 자식 argv와 마일스톤이 같은 목록을 보게 함(기본: VARIANTS 환경변수/기본값)
+    variants = list(variants or RunConfig.from_env().variants)
+    steps = [dict(_INGEST_STEP)] if ingest else []
+    steps.append({
+        "name": "train_and_score",
+        "argv": ["service/full_scoring.py", "--folds", str(int(n_folds)), "--seed", str(int(random_state)),
+                 "--write-db" if write_db else "--no-write-db",
+                 "--create-view" if create_view else "--no-create-view", "--mode", mode,
+                 "--variants", ";".join(variants)],
+        "env": {},
+        "milestones": (["[INFO] engineer_features", "[INCR]", "[SAVE] scores", "[SAVE] profile"]
+                       if mode == "incremental" else
+                       ["[INFO] engineer_features", *_variant_milestones(variants), "[BEST]",
+                        "[SAVE] model", "[SAVE] scores", "[SAVE] profile"]),
+    })
+    return steps
+
+def _ingest_steps() -> List[Dict[str, Any]]:
+    return [dict(_INGEST_STEP)]
+
+KINDS = {"train_and_score": _train_steps, "ingest": _ingest_steps}
+
+
+# ─────────────────────────────────────────────
+# 상태 파일
+# ─────────────────────────────────────────────
+def _job_dir(job_id: str) -> Path:
+    return JOBS_DIR / job_id
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+def _write_status(job: Dict[str, Any]) -> None:
+    path = _job_dir(job["id"]) / "job.json"
+    tmp = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(job, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)                 # 폴링 중인 페이지가 반쯤 쓴 파일을 읽지 않도록
+
+def _read_status(job_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_job_dir(job_id) / "job.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    if os.name == "nt":
+        return True                       # Windows: 확인 생략(취소/완료는 워커가 기록)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ─────────────────────────────────────────────
+# 페이지/CLI용 API
+# ─────────────────────────────────────────────
+def submit(kind: str, **params: Any) -> str:
+    """작업 등록 후 워커 프로세스를 띄우고 즉시 job_id 반환."""
+    if kind not in KINDS:
+        raise ValueError(f"unknown job kind: {kind} (choose from {sorted(KINDS)})")
+    job_id = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+    _job_dir(job_id).mkdir(parents=True, exist_ok=True)
+    steps = KINDS[kind](**params)
+    job = {"id": job_id, "kind": kind, "params": params, "status": "queued",
+           "created_at": _now(), "started_at": None, "finished_at": None,
+           "steps": [s["name"] for s in steps], "step": None, "progress": 0.0,
+           "returncode": None, "error": None, "result": {}, "worker_pid": None}
+    _write_status(job)
+    (_job_dir(job_id) / "log.txt").touch()
+
+    kw: Dict[str, Any] = {"cwd": str(APP_DIR), "stdin": subprocess.DEVNULL,
+                          "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "nt":
+        kw["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kw["start_new_session"] = True    # Streamlit 재시작/세션 종료와 무관하게 계속 실행
+    subprocess.Popen([sys.executable, "-m", "service.jobs", "work", job_id], **kw)
+    return job_id
+
+def get(job_id: str) -> Optional[Dict[str, Any]]:
+    """현재 상태. 워커가 비정상 종료됐으면 status=lost로 보정."""
+    job = _read_status(job_id)
+    if job and job["status"] in ACTIVE and job.get("worker_pid") and not _pid_alive(job["worker_pid"]):
+        job = _read_status(job_id) or job  # 종료 직전 기록과의 경합 재확인
+        if job["status"] in ACTIVE:
+            job.update(status="lost", finished_at=_now(), error="worker process exited unexpectedly")
+            _write_status(job)
+    return job
+
+def list_jobs(limit: int = 20) -> List[Dict[str, Any]]:
+    """최근 작업 목록(최신순)."""
+    if not JOBS_DIR.exists():
+        return []
+    ids = sorted((p.name for p in JOBS_DIR.iterdir() if (p / "job.json").exists()), reverse=True)
+    return [j for j in (get(i) for i in ids[:limit]) if j]
+
+def active_job() -> Optional[Dict[str, Any]]:
+    """실행/대기 중인 가장 오래된 작업(없으면 None)."""
+    for job in reversed(list_jobs(limit=50)):
+        if job["status"] in ACTIVE:
+            return job
+    return None
+
+def read_log(job_id: str, offset: int = 0, max_bytes: int = 256_000) -> Tuple[str, int]:
+    """offset 이후 로그(증분 폴링용) → (text, 다음 offset)."""
+    path = _job_dir(job_id) / "log.txt"
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(max_bytes)
+    except OSError:
+        return "", offset
+    return data.decode("utf-8", "replace"), offset + len(data)
+
+def cancel(job_id: str) -> None:
+    """취소 요청(워커가 다음 폴링에서 현재 단계 프로세스를 종료)."""
+    (_job_dir(job_id) / "cancel").touch()
+
+
+# ─────────────────────────────────────────────
+# 워커
+# ─────────────────────────────────────────────
+class _FileLock:
+    """JOBS_DIR/.lock 배타 락(프로세스 간). 작업 실행을 1개씩 직렬화."""
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.f = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.f = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    self.f.seek(0)
+                    msvcrt.locking(self.f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(POLL_S)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+        else:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_UNLCK, 1)
+        self.f.close()
+
+def _latest_artifacts(since: float) -> Dict[str, Optional[str]]:
+    """작업 시작 이후 생성된 최신 모델/프로파일 경로."""
+    pkls = [p for p in MODELS_DIR.glob("best_model_*.pkl") if p.stat().st_mtime >= since]
+    if not pkls:
+        return {}
+    latest = max(pkls, key=lambda p: p.stat().st_mtime)
+    profile = latest.with_suffix(".profile.json")
+    return {"model_pkl": str(latest), "profile": str(profile) if profile.exists() else None,
+            "scores_csv": os.getenv("OUT_CSV", str(APP_DIR / "assets" / "data" / "churn_scores.csv"))}
+
+def _run_step(job: Dict[str, Any], step: Dict[str, Any], idx: int, log) -> int:
+    """단계 1개를 자식 프로세스로 실행. 로그를 따라가며 진행률 갱신, 취소 시 종료."""
+    env = {**os.environ, **step["env"], "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"}
+    log.write(f"\n===== [{idx + 1}/{len(job['steps'])}] {step['name']} =====\n".encode())
+    log.flush()
+    pos = log.tell()
+    proc = subprocess.Popen([sys.executable, *step["argv"]], cwd=str(APP_DIR), env=env,
+                            stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+    cancel_flag = _job_dir(job["id"]) / "cancel"
+    # 마일스톤: 접두어 또는 대안 접두어 목록. 순서 무관 매칭(레이싱 탈락 로그가 다른 변형 리포트보다 먼저 나올 수 있음)
+    milestones, done = step.get("milestones", []), set()
+    log_path = _job_dir(job["id"]) / "log.txt"
+    while True:
+        try:
+            rc = proc.wait(timeout=POLL_S)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+        if cancel_flag.exists():
+            proc.terminate()
+            try:
+                rc = proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                rc = proc.wait()
+            return -1
+        # 새로 쓰인 로그만 읽어 마일스톤 매칭
+        with open(log_path, "rb") as f:
+            f.seek(pos)
+            chunk = f.read().decode("utf-8", "replace")
+        cut = chunk.rfind("\n") + 1
+        pos += len(chunk[:cut].encode("utf-8"))
+        for line in chunk[:cut].splitlines():
+            for i, m in enumerate(milestones):
+                if i not in done and line.startswith(tuple(m) if isinstance(m, list) else m):
+                    done.add(i)
+                    break
+        if milestones:
+            job["progress"] = round((idx + len(done) / len(milestones)) / len(job["steps"]), 3)
+            _write_status(job)
+    return rc
+
+def work(job_id: str) -> int:
+    job = _read_status(job_id)
+    if job is None:
+        print(f"[ERROR] job not found: {job_id}")
+        return 2
+    steps = KINDS[job["kind"]](**job["params"])
+    job["worker_pid"] = os.getpid()       # 대기 중에도 워커 생존 여부 판정용
+    _write_status(job)
+    with _FileLock(JOBS_DIR / ".lock"):
+        job = _read_status(job_id) or job
+        if (_job_dir(job_id) / "cancel").exists():
+            job.update(status="cancelled", finished_at=_now())
+            _write_status(job)
+            return 1
+        job.update(status="running", started_at=_now())
+        _write_status(job)
+        t0 = time.time()
+        with open(_job_dir(job_id) / "log.txt", "ab") as log:
+            try:
+                for i, step in enumerate(steps):
+                    job["step"] = step["name"]
+                    _write_status(job)
+                    rc = _run_step(job, step, i, log)
+                    if rc != 0:
+                        cancelled = rc == -1
+                        job.update(status="cancelled" if cancelled else "failed", returncode=rc,
+                                   error=None if cancelled else f"step '{step['name']}' exited with {rc}")
+                        break
+                else:
+                    job.update(status="succeeded", returncode=0, progress=1.0,
+                               result=_latest_artifacts(t0) if job["kind"] == "train_and_score" else {})
+            except Exception as e:
+                job.update(status="failed", error=f"{type(e).__name__}: {e}")
+            finally:
+                job["finished_at"] = _now()
+                _write_status(job)
+    return 0 if job["status"] == "succeeded" else 1
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="백그라운드 작업 큐(학습/적재)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("submit", help="작업 등록")
+    p.add_argument("kind", choices=sorted(KINDS))
+    p.add_argument("--no-db", action="store_true", help="train_and_score: DB 적재/뷰 생성 생략")
+    p.add_argument("--ingest", action="store_true", help="train_and_score: 학습 전 CSV 적재")
+    p.add_argument("--incremental", action="store_true",
+                   help="train_and_score: 최신 모델에서 변경분만 이어 학습(야간 갱신용, 가드레일 실패 시 전체 재학습)")
+    p.add_argument("--variants", default=None,
+                   help="train_and_score: 비교할 변형(예: 'smote;balanced:depth=8', 기본 VARIANTS 환경변수)")
+    sub.add_parser("list", help="최근 작업 목록")
+    p = sub.add_parser("show", help="작업 상태 + 로그")
+    p.add_argument("job_id")
+    p = sub.add_parser("cancel", help="작업 취소")
+    p.add_argument("job_id")
+    p = sub.add_parser("work", help="(내부) 워커 실행")
+    p.add_argument("job_id")
+    args = ap.parse_args()
+
+    if args.cmd == "submit":
+        params = {} if args.kind == "ingest" else {"write_db": not args.no_db, "create_view": not args.no_db,
+                                                   "ingest": args.ingest,
+                                                   "mode": "incremental" if args.incremental else "full"}
+        if args.kind == "train_and_score" and args.variants:
+            params["variants"] = list(split_variants(args.variants))
+        print(submit(args.kind, **params))
+    elif args.cmd == "list":
+        for j in list_jobs():
+            print(f"{j['id']}  {j['kind']:<16} {j['status']:<10} {j['progress']:>5.0%}  {j.get('step') or ''}")
+    elif args.cmd == "show":
+        job = get(args.job_id)
+        print(json.dumps(job, ensure_ascii=False, indent=2) if job else "[INFO] 작업 없음")
+        if job:
+            print(read_log(args.job_id)[0])
+    elif args.cmd == "cancel":
+        cancel(args.job_id)
+    else:
+        sys.exit(work(args.job_id))
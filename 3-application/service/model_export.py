@@ -0,0 +1,379 @@
+# model_export.py
+# ------------------------------------------------------------
+# 목적: 학습된 CatBoost 모델을 추론 전용 경량 포맷(.npz)으로 내보내고,
+#       catboost 없이 NumPy만으로 벡터화 평가(oblivious tree)합니다.
+# 입력: CatBoostClassifier + 학습 피처 행렬(X, cat_features)
+# 출력: models/best_model_YYYYMMDD_HHMMSS.npz
+# 사용: python service/model_export.py            (최신 모델 내보내기 + parity 검증)
+#       python service/model_export.py --check    (기존 .npz parity만 재검증)
+# ------------------------------------------------------------
+from __future__ import annotations
+import sys
+import json
+import tempfile
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+PARITY_TOL = 1e-6              # predict_proba 대비 허용 오차(절대값)
+_CHUNK_ROWS = 4_096            # 평가 시 행 단위 청크(중간 배열 메모리 상한)
+_GATHER_ROWS = 256             # 이하 행 수는 리프 값을 2차원 gather 한 번으로(단건 지연 최소화)
+_UNKNOWN_HASH = 0x7FFFFFFF     # 학습 때 못 본 범주값(CatBoost 파이썬 export와 동일 규칙)
+_EMPTY_SLOT = (1 << 64) - 1    # CatBoost ctr 해시테이블의 빈 슬롯
+
+_SPLIT_FLOAT, _SPLIT_ONEHOT, _SPLIT_CTR = 0, 1, 2
+_CTR_BORDERS, _CTR_COUNTER = 0, 1
+
+_MAGIC = np.uint64(0x4906BA494954CB65)
+
+
+def _calc_hash(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """CatBoost projection 해시 결합(uint64 오버플로 = mod 2^64)."""
+    with np.errstate(over="ignore"):
+        return _MAGIC * (a + _MAGIC * b)
+
+
+# ─────────────────────────────────────────────
+# 내보내기 (catboost 필요: 학습 환경에서만 호출)
+# ─────────────────────────────────────────────
+def _compile_json(d: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """CatBoost JSON 모델 → 평가용 평탄 배열 dict."""
+    fi = d["features_info"]
+    float_feats = fi.get("float_features", [])
+    cat_feats = fi.get("categorical_features", [])
+    ctrs = fi.get("ctrs", [])
+
+    # split_index는 (float border → one-hot 값 → ctr border) 순서의 전역 이진 피처 번호
+    flat: List[tuple] = []
+    for f in float_feats:
+        flat += [(_SPLIT_FLOAT, f["feature_index"], b) for b in f.get("borders") or []]
+    for c in cat_feats:
+        flat += [(_SPLIT_ONEHOT, c["feature_index"], v) for v in c.get("values") or []]
+    for j, c in enumerate(ctrs):
+        flat += [(_SPLIT_CTR, j, b) for b in c.get("borders") or []]
+
+    kinds, refs, borders, depths, leaves = [], [], [], [], []
+    for t in d["oblivious_trees"]:
+        splits = t.get("splits") or []
+        for s in splits:
+            kind, ref, border = flat[s["split_index"]]
+            kinds.append(kind); refs.append(ref); borders.append(border)
+        depths.append(len(splits))
+        leaves += t["leaf_values"]
+
+    # 실제 split에 쓰이는 ctr만 남기고 번호 재부여
+    used = sorted({r for k, r in zip(kinds, refs) if k == _SPLIT_CTR})
+    remap = {old: new for new, old in enumerate(used)}
+    refs = [remap[r] if k == _SPLIT_CTR else r for k, r in zip(kinds, refs)]
+
+    out: Dict[str, np.ndarray] = {
+        "split_kind": np.asarray(kinds, dtype=np.int8),
+        "split_ref": np.asarray(refs, dtype=np.int32),
+        "split_border": np.asarray(borders, dtype=np.float64),
+        "tree_depth": np.asarray(depths, dtype=np.int32),
+        "leaf_values": np.asarray(leaves, dtype=np.float64),
+        "scale_bias": np.asarray([d["scale_and_bias"][0], d["scale_and_bias"][1][0]], dtype=np.float64),
+        "float_names": np.asarray([f["feature_id"] for f in float_feats], dtype=str),
+        "cat_names": np.asarray([c["feature_id"] for c in cat_feats], dtype=str),
+        "hash_keys": np.asarray([h["value"] for h in fi.get("cat_features_hash", [])], dtype=str),
+        # JSON의 해시는 ui32, one-hot 값/projection 해시는 부호 있는 i32 기준 → 부호 확장
+        "hash_vals": np.asarray([h["hash"] for h in fi.get("cat_features_hash", [])], dtype=np.uint32)
+                       .view(np.int32).astype(np.int64),
+    }
+
+    # ctr 스펙(작은 메타)은 JSON 문자열, 카운트 테이블은 배열로
+    tables: Dict[str, int] = {}
+    spec = []
+    for j in used:
+        c = ctrs[j]
+        ident = c["identifier"]
+        if ident not in tables:
+            tables[ident] = len(tables)
+            t = d["ctr_data"][ident]
+            stride = int(t["hash_stride"])
+            hm = t["hash_map"]
+            hashes = np.asarray([int(h) for h in hm[0::stride]], dtype=np.uint64)
+            counts = np.asarray([hm[i + 1:i + stride] for i in range(0, len(hm), stride)], dtype=np.float64)
+            keep = hashes != np.uint64(_EMPTY_SLOT)
+            hashes, counts = hashes[keep], counts[keep]
+            order = np.argsort(hashes)
+            k = tables[ident]
+            out[f"tab{k}_hash"] = hashes[order]
+            out[f"tab{k}_cnt"] = counts[order]
+            out[f"tab{k}_denom"] = np.asarray([t.get("counter_denominator", 0)], dtype=np.float64)
+        spec.append({
+            "type": _CTR_COUNTER if c["ctr_type"] in ("Counter", "FeatureFreq") else _CTR_BORDERS,
+            "table": tables[ident],
+            "target_border_idx": c.get("target_border_idx", 0),
+            "prior_num": c["prior_numerator"], "prior_denom": c["prior_denomerator"],
+            "shift": c["shift"], "scale": c["scale"],
+            # projection 해시: 범주값 먼저, 이후 이진화 원소(float border / one-hot 값)
+            "cats": [e["cat_feature_index"] for e in c["elements"] if e["combination_element"] == "cat_feature_value"],
+            "bins": [[e["combination_element"], e.get("float_feature_index", e.get("cat_feature_index")),
+                      e.get("border", e.get("value"))]
+                     for e in c["elements"] if e["combination_element"] != "cat_feature_value"],
+        })
+    out["ctr_spec"] = np.asarray(json.dumps(spec))
+    return out
+
+
+def export_model(model, X: pd.DataFrame, cat_features: List[str], out_path: str | Path) -> Path:
+    """
+    CatBoost 모델을 .npz로 내보냅니다.
+    - 범주값→해시 매핑을 포함시키기 위해 학습 피처 행렬 X로 Pool을 만들어 JSON export
+    - 전역 Feature Importance(PredictionValuesChange)도 함께 저장(대시보드용)
+    """
+    from catboost import Pool
+
+    cat_idx = [X.columns.get_loc(c) for c in cat_features]
+    pool = Pool(X, cat_features=cat_idx)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "model.json"
+        model.save_model(str(json_path), format="json", pool=pool)
+        with open(json_path, encoding="utf-8") as f:
+            arrays = _compile_json(json.load(f))
+
+    arrays["feature_names"] = np.asarray(list(X.columns), dtype=str)
+    arrays["model_class"] = np.asarray(type(model).__name__)
+    arrays["feature_importance"] = np.asarray(model.get_feature_importance(pool), dtype=np.float64)
+    out_path = Path(out_path)
+    np.savez_compressed(out_path, **arrays)
+    return out_path
+
+
+# ─────────────────────────────────────────────
+# 추론 (numpy/pandas만 사용)
+# ─────────────────────────────────────────────
+class CompiledModel:
+    """export_model()로 만든 .npz를 로드해 predict_proba를 벡터화 평가합니다."""
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with np.load(self.path, allow_pickle=False) as z:
+            a = {k: z[k] for k in z.files}
+        self.feature_names: List[str] = a["feature_names"].tolist()
+        self.float_names: List[str] = a["float_names"].tolist()
+        self.cat_names: List[str] = a["cat_names"].tolist()
+        self.feature_importance = a["feature_importance"]
+        self.model_class = str(a["model_class"]) if "model_class" in a else "CatBoostClassifier"
+        self._hash = dict(zip(a["hash_keys"].tolist(), a["hash_vals"].tolist()))
+
+        self.scale, self.bias = a["scale_bias"].tolist()
+
+        # 중복 split 조건(kind, ref, border)은 한 번만 평가
+        cond, split_cond = np.unique(
+            np.column_stack([a["split_kind"], a["split_ref"], a["split_border"]]), axis=0, return_inverse=True)
+        split_cond = split_cond.reshape(-1)
+        self.cond_kind = cond[:, 0].astype(np.int8)
+        self.cond_ref = cond[:, 1].astype(np.int64)
+        self.cond_border = cond[:, 2]
+
+        # 깊이(level)별로 (해당 깊이가 있는 트리, 그 트리의 split 조건) 묶음
+        depth = a["tree_depth"].astype(np.int64)
+        self.tree_depth = depth
+        max_depth = int(depth.max()) if len(depth) else 0
+        split_start = np.concatenate([[0], np.cumsum(depth)[:-1]]).astype(np.int64)
+        self.levels = []
+        for lv in range(max_depth):
+            trees = np.flatnonzero(depth > lv)
+            sel = slice(None) if len(trees) == len(depth) else trees
+            self.levels.append((sel, split_cond[split_start[trees] + lv]))
+        # 리프 값을 (트리 × 2^max_depth)로 패딩: 얕은 트리는 상위 비트가 항상 0
+        self.leaf_dtype = np.uint8 if max_depth <= 8 else np.uint16
+        leaf_start = np.concatenate([[0], np.cumsum(1 << depth)[:-1]]).astype(np.int64)
+        self.leaf_table = np.zeros((len(depth), 1 << max_depth), dtype=np.float64)
+        for t, (st, dp) in enumerate(zip(leaf_start, depth)):
+            self.leaf_table[t, :1 << dp] = a["leaf_values"][st:st + (1 << dp)]
+        self._tree_rows = np.arange(len(depth))[:, None]
+
+        self.ctr_spec = json.loads(str(a["ctr_spec"]))
+        self._compile_ctrs(a)
+
+    def _compile_ctrs(self, a: Dict[str, np.ndarray]) -> None:
+        """
+        ctr 스펙 → 모든 ctr을 한 번에 계산하기 위한 배열.
+        - ctr을 원소 수 내림차순으로 재배열: 해시 단계 e는 항상 앞쪽 ctr 구간만 갱신
+        - 카운트 테이블은 ctr별 최종 값(prior/shift/scale 반영)으로 미리 계산해
+          (해시 ⊕ ctr 번호) 기준 하나의 정렬 배열로 통합
+        """
+        spec, n_cat = self.ctr_spec, len(self.cat_names)
+        steps_of = lambda s: len(s["cats"]) + len(s["bins"])
+        order = sorted(range(len(spec)), key=lambda j: -steps_of(spec[j]))
+        rank = np.empty(len(spec), dtype=np.int64)
+        rank[order] = np.arange(len(spec))
+        is_ctr = self.cond_kind == _SPLIT_CTR
+        self.cond_ref[is_ctr] = rank[self.cond_ref[is_ctr]]
+        spec = [spec[j] for j in order]
+
+        # projection 해시 입력원: [범주 해시 행 | 이진화 원소 행]
+        bins = sorted({(k, i, v) for s in spec for k, i, v in s["bins"]}, key=str)
+        bin_pos = {b: n_cat + j for j, b in enumerate(bins)}
+        self.bin_onehot = np.asarray([k != "float_feature" for k, _, _ in bins], dtype=bool)
+        self.bin_ref = np.asarray([i for _, i, _ in bins], dtype=np.int64)
+        self.bin_val = np.asarray([v for _, _, v in bins], dtype=np.float64)
+        seqs = [list(s["cats"]) + [bin_pos[(k, i, v)] for k, i, v in s["bins"]] for s in spec]
+        self.ctr_steps = []   # 단계 e: (갱신할 ctr 수, 입력원 행 번호)
+        for e in range(max(map(len, seqs), default=0)):
+            active = [x[e] for x in seqs if len(x) > e]
+            self.ctr_steps.append((len(active), np.asarray(active, dtype=np.int64)))
+
+        keys, vals = [], []
+        for j, s in enumerate(spec):
+            k = s["table"]
+            cnt = a[f"tab{k}_cnt"]
+            if s["type"] == _CTR_COUNTER:
+                good, total = cnt[:, 0], np.full(len(cnt), float(a[f"tab{k}_denom"][0]))
+            else:
+                good, total = cnt[:, s["target_border_idx"] + 1:].sum(axis=1), cnt.sum(axis=1)
+            keys.append(_calc_hash(a[f"tab{k}_hash"], np.uint64(j + 1)))
+            vals.append(((good + s["prior_num"]) / (total + s["prior_denom"]) + s["shift"]) * s["scale"])
+        keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.uint64)
+        vals = np.concatenate(vals) if vals else np.zeros(0)
+        idx = np.argsort(keys)
+        self.tab_keys, self.tab_vals = keys[idx], vals[idx]
+        if len(np.unique(self.tab_keys)) != len(self.tab_keys):
+            raise ValueError("[ERROR] ctr 테이블 통합 해시 충돌")
+        self.ctr_ids = np.arange(1, len(spec) + 1, dtype=np.uint64)[:, None]
+        # 테이블에 없는 해시(학습 때 못 본 조합)의 값 = prior만 반영
+        self.ctr_default = np.asarray([(s["prior_num"] / s["prior_denom"] + s["shift"]) * s["scale"]
+                                       for s in spec], dtype=np.float64)[:, None]
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.feature_importance
+
+    # --- 피처 → 수치 행렬 (행=피처, 열=샘플: 피처별 연산이 연속 메모리) ---
+    def _float_matrix(self, X: pd.DataFrame) -> np.ndarray:
+        F = np.empty((len(self.float_names), len(X)), dtype=np.float32)
+        for i, c in enumerate(self.float_names):
+            F[i] = X[c].to_numpy(dtype=np.float32)
+        return F
+
+    def _hash_matrix(self, X: pd.DataFrame) -> np.ndarray:
+        H = np.empty((len(self.cat_names), len(X)), dtype=np.int64)
+        for i, c in enumerate(self.cat_names):
+            codes, uniq = pd.factorize(X[c].astype(str), sort=False)
+            lut = np.asarray([self._hash.get(u, _UNKNOWN_HASH) for u in uniq], dtype=np.int64)
+            H[i] = lut[codes]
+        return H
+
+    def _ctr_values(self, F: np.ndarray, H: np.ndarray) -> np.ndarray:
+        n = H.shape[1]
+        src = np.empty((len(H) + len(self.bin_ref), n), dtype=np.uint64)
+        src[:len(H)] = H.view(np.uint64)
+        oh, ref, val = self.bin_onehot, self.bin_ref, self.bin_val
+        src[len(H):][~oh] = F[ref[~oh]] > val[~oh, None].astype(np.float32)
+        src[len(H):][oh] = H[ref[oh]] == val[oh, None].astype(np.int64)
+
+        # h ← MAGIC·(h + MAGIC·x) 를 단계별·제자리 연산으로 (마지막에 ctr 번호를 섞음)
+        h = np.zeros((len(self.ctr_default), n), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for k, srcs in self.ctr_steps:
+                x = src[srcs]
+                x *= _MAGIC
+                h[:k] += x
+                h[:k] *= _MAGIC
+            h += _MAGIC * self.ctr_ids
+            h *= _MAGIC
+
+        # 고유 해시만 테이블 조회 후 펼침(행 수 대비 고유값이 매우 적음)
+        codes, uq = pd.factorize(h.ravel(), sort=False)
+        if len(self.tab_keys):
+            pos = np.minimum(np.searchsorted(self.tab_keys, uq), len(self.tab_keys) - 1)
+            val_u = np.where(self.tab_keys[pos] == uq, self.tab_vals[pos], np.nan)
+        else:
+            val_u = np.full(len(uq), np.nan)
+        C = val_u[codes].reshape(h.shape)
+        np.copyto(C, np.broadcast_to(self.ctr_default, C.shape), where=np.isnan(C))
+        return C
+
+    def _raw(self, X: pd.DataFrame) -> np.ndarray:
+        n = len(X)
+        F = self._float_matrix(X)
+        H = self._hash_matrix(X)
+        C = self._ctr_values(F, H) if self.ctr_spec else np.zeros((0, n))
+
+        # 고유 split 조건별 비트 (조건 수 × n)
+        kind, ref, border = self.cond_kind, self.cond_ref, self.cond_border
+        bits = np.empty((len(kind), n), dtype=np.uint8)
+        m = kind == _SPLIT_FLOAT
+        bits[m] = F[ref[m]] > border[m, None].astype(np.float32)
+        m = kind == _SPLIT_ONEHOT
+        bits[m] = H[ref[m]] == border[m, None].astype(np.int64)
+        m = kind == _SPLIT_CTR
+        bits[m] = C[ref[m]] > border[m, None]
+
+        # 트리별 리프 인덱스 = Σ bit(level) << level
+        leaf_idx = np.zeros((len(self.tree_depth), n), dtype=self.leaf_dtype)
+        for lv, (trees, conds) in enumerate(self.levels):
+            leaf_idx[trees] |= bits[conds].astype(self.leaf_dtype) << lv
+        if n <= _GATHER_ROWS:
+            raw = self.leaf_table[self._tree_rows, leaf_idx].sum(axis=0)
+        else:  # 큰 청크는 트리별 take 누적이 2차원 gather보다 빠름(인덱스 배열 변환 없음)
+            raw = np.zeros(n, dtype=np.float64)
+            for t in range(len(leaf_idx)):
+                raw += self.leaf_table[t].take(leaf_idx[t])
+        return self.scale * raw + self.bias
+
+    def predict_raw(self, X: pd.DataFrame) -> np.ndarray:
+        X = X[self.feature_names]
+        return np.concatenate([self._raw(X.iloc[i:i + _CHUNK_ROWS])
+                               for i in range(0, len(X), _CHUNK_ROWS)]) if len(X) else np.zeros(0)
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """CatBoostClassifier.predict_proba와 같은 (n, 2) 배열."""
+        p1 = 1.0 / (1.0 + np.exp(-self.predict_raw(X)))
+        return np.column_stack([1.0 - p1, p1])
+
+
+def check_parity(model, compiled: CompiledModel, X: pd.DataFrame, cat_features: List[str]) -> float:
+    """catboost predict_proba 대비 최대 절대 오차."""
+    from catboost import Pool
+    pool = Pool(X, cat_features=[X.columns.get_loc(c) for c in cat_features])
+    ref = model.predict_proba(pool)[:, 1]
+    got = compiled.predict_proba(X)[:, 1]
+    return float(np.max(np.abs(ref - got))) if len(X) else 0.0
+
+
+def export_with_parity(model, X: pd.DataFrame, cat_features: List[str], out_path: str | Path) -> Dict[str, Any]:
+    """내보내기 + parity 검증. 오차가 PARITY_TOL을 넘으면 파일을 지우고 ok=False."""
+    path = export_model(model, X, cat_features, out_path)
+    diff = check_parity(model, CompiledModel(path), X, cat_features)
+    ok = diff <= PARITY_TOL
+    if not ok:
+        path.unlink(missing_ok=True)
+    return {"path": str(path) if ok else None, "parity_max_abs_diff": diff, "ok": ok}
+
+
+if __name__ == "__main__":
+    from service.scoring import latest_model_path, load_model
+    from utils.process import load_csv_from_data
+
+    ap = argparse.ArgumentParser(description="CatBoost 모델 → .npz 추론 포맷 내보내기")
+    ap.add_argument("--model", default=None, help="모델 pkl 경로(기본: 최신 best_model_*.pkl)")
+    ap.add_argument("--check", action="store_true", help="내보내지 않고 기존 .npz parity만 확인")
+    args = ap.parse_args()
+
+    bundle = load_model(args.model or latest_model_path(), backend="catboost")
+    X = bundle.prepare(load_csv_from_data())
+    npz_path = bundle.path.with_suffix(".npz")
+    if args.check:
+        diff = check_parity(bundle.model, CompiledModel(npz_path), X, bundle.cat_features)
+        print(f"[PARITY] {npz_path.name}: max|Δp|={diff:.2e} ({'OK' if diff <= PARITY_TOL else 'FAIL'})")
+        sys.exit(0 if diff <= PARITY_TOL else 1)
+    res = export_with_parity(bundle.model, X, bundle.cat_features, npz_path)
+    print(f"[EXPORT] {res}")
+
+    # 기존 모델의 메타에도 기록 → scoring.py가 compiled 백엔드를 사용
+    meta_path = bundle.path.with_suffix(".meta.json")
+    if meta_path.exists():
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["compiled"] = res
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
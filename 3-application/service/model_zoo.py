@@ -0,0 +1,185 @@
+# model_zoo.py
+# ------------------------------------------------------------
+# 목적: 여러 모델 계열(utils/process/pipeline.py MODEL_FAMILIES)을 같은 fold 분할로 학습해
+#       정확도 + 서빙 비용을 한 리더보드로 비교 → 운영 모델 선택 근거
+# - fold 분할: split.get_stratified_kfold 결과를 fold 번호 배열로 1회 저장
+#   (<ZOO_DIR>/folds_<데이터 해시>_k<k>_s<seed>.npy) → 모든 계열/재실행이 같은 분할 사용
+# - 병렬: (계열, fold) 작업을 joblib 프로세스로 코어 수만큼 동시 실행(각 모델은 1스레드 → 과할당 없음)
+#   X/y는 SharedDataset(메모리 매핑 파일)으로 1회 기록해 공유 → 작업마다 DataFrame pickle 없음
+# - 지표(OOF 기준): ROC AUC, PR AUC, F1(OOF 최적 threshold) + fold 평균 학습 시간,
+#   1행 예측 지연(p50, ms), 배치 예측 행당 시간(µs), 모델 크기(pickle, KB)
+# - 결과: <ZOO_DIR>/leaderboard.csv 에 실행마다 누적(run_id, 기존 행과 열 이름 기준 병합), 콘솔에 AUC 순 표
+#         + 단계별 소요 프로파일 <ZOO_DIR>/model_zoo_<run_id>.profile.json
+# 사용: python service/model_zoo.py [--models rf,logreg,hgb,lgbm,xgb,catboost] [--folds 5] [--jobs -1]
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+import time
+import pickle
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import roc_auc_score, average_precision_score, f1_score
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.cv_store import data_hash
+from utils.process import load_csv_from_data, engineer_features, get_feature_groups, get_stratified_kfold
+from utils.process.pipeline import (MODEL_FAMILIES, DEFAULT_PREPROCESS, available_models, _make_pipe, _pipe_memory,
+                                    _reduce_pipe_cache)
+from utils.process.shared_data import SharedDataset
+from utils.perf import trace_run, span, PROFILE_SUFFIX
+
+APP_DIR = Path(__file__).resolve().parents[1]           # 3-application/
+ZOO_DIR = Path(os.getenv("MODEL_ZOO_DIR", str(APP_DIR / "assets" / "logs" / "model_zoo")))
+LEADERBOARD_CSV = ZOO_DIR / "leaderboard.csv"
+LATENCY_REPEATS = 50          # 1행 예측 지연 측정 반복 수
+
+
+# ─────────────────────────────────────────────
+# 공유 fold 분할
+# ─────────────────────────────────────────────
+def fold_assignment(X: pd.DataFrame, y: np.ndarray, n_splits: int = 5, seed: int = 42,
+                    root: Path = ZOO_DIR) -> np.ndarray:
+    """행별 fold 번호(0..k-1). 같은 데이터/k/seed면 저장된 분할을 그대로 사용."""
+    path = Path(root) / f"folds_{data_hash(X, y)[:16]}_k{n_splits}_s{seed}.npy"
+    if path.exists():
+        folds = np.load(path)
+        if len(folds) == len(X):
+            return folds
+    folds = np.full(len(X), -1, dtype=np.int8)
+    for k, (_, te_idx) in enumerate(get_stratified_kfold(n_splits=n_splits, random_state=seed).split(X, y)):
+        folds[te_idx] = k
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp.npy")
+    np.save(tmp, folds)
+    os.replace(tmp, path)
+    return folds
+
+
+# ─────────────────────────────────────────────
+# (계열, fold) 1개 — 워커 프로세스에서 실행
+# ─────────────────────────────────────────────
+def _run_fold(name: str, fold: int, data: SharedDataset, folds: np.ndarray,
+              fg: Dict[str, List[str]], seed: int) -> Dict[str, Any]:
+    tr, te = np.flatnonzero(folds != fold), np.flatnonzero(folds == fold)
+    # 같은 fold + 같은 전처리 모드(예: 트리 계열 ordinal)는 학습된 전처리기를 캐시에서 공유
+    pipe = _make_pipe(fg, name, seed, n_jobs=1, memory=_pipe_memory())
+    t0 = time.perf_counter()
+    pipe.fit(data.frame(tr), data.y[tr])
+    fit_s = time.perf_counter() - t0
+    pipe.memory = None
+
+    X_te = data.frame(te)
+    t0 = time.perf_counter()
+    proba = pipe.predict_proba(X_te)[:, 1]
+    batch_s = time.perf_counter() - t0
+
+    row = X_te.iloc[:1]
+    lat = []
+    for _ in range(LATENCY_REPEATS):
+        t0 = time.perf_counter()
+        pipe.predict_proba(row)
+        lat.append(time.perf_counter() - t0)
+    return {"model": name, "fold": fold, "te_idx": te, "proba": proba, "fit_s": fit_s,
+            "batch_us_row": batch_s / max(len(X_te), 1) * 1e6, "row_ms_p50": float(np.median(lat)) * 1e3,
+            "size_kb": len(pickle.dumps(pipe)) / 1024}
+
+def _best_f1(y: np.ndarray, proba: np.ndarray):
+    """OOF 기준 F1 최대 threshold(full_scoring과 같은 0.2~0.8 탐색)."""
+    best_th, best_f1 = 0.5, 0.0
+    for th in np.linspace(0.2, 0.8, 61):
+        f1 = f1_score(y, (proba >= th).astype(int))
+        if f1 > best_f1:
+            best_f1, best_th = f1, th
+    return float(best_f1), float(best_th)
+
+def _summarize(name: str, parts: List[Dict[str, Any]], y: np.ndarray) -> Dict[str, Any]:
+    oof = np.zeros(len(y))
+    for p in parts:
+        oof[p["te_idx"]] = p["proba"]
+    fold_auc = [roc_auc_score(y[p["te_idx"]], p["proba"]) for p in parts]
+    f1, th = _best_f1(y, oof)
+    return {"model": name, "preprocess": DEFAULT_PREPROCESS.get(name, "dense"),
+            "roc_auc": roc_auc_score(y, oof), "roc_auc_std": float(np.std(fold_auc)),
+            "pr_auc": average_precision_score(y, oof), "f1": f1, "threshold": th,
+            "fit_s": float(np.mean([p["fit_s"] for p in parts])),
+            "predict_ms_row": float(np.median([p["row_ms_p50"] for p in parts])),
+            "predict_us_row_batch": float(np.mean([p["batch_us_row"] for p in parts])),
+            "size_kb": float(np.mean([p["size_kb"] for p in parts]))}
+
+
+# ─────────────────────────────────────────────
+# 실행
+# ─────────────────────────────────────────────
+def run(models: Optional[Sequence[str]] = None, n_splits: int = 5, seed: int = 42, n_jobs: int = -1,
+        input_filename: Optional[str] = None, out_csv: Path = LEADERBOARD_CSV) -> pd.DataFrame:
+    """계열별 CV → 리더보드(DataFrame, ROC AUC 내림차순). out_csv에 누적 저장."""
+    avail = available_models()
+    models = list(models or avail)
+    unknown = [m for m in models if m not in MODEL_FAMILIES]
+    if unknown:
+        raise ValueError(f"unknown model(s): {unknown} (choose from {sorted(MODEL_FAMILIES)})")
+    for m in [m for m in models if m not in avail]:
+        print(f"[WARN] {m}: 패키지 미설치 → 제외")
+    models = [m for m in models if m in avail]
+    if not models:
+        raise RuntimeError("[ERROR] 실행 가능한 모델 계열이 없습니다.")
+
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    with trace_run("model_zoo", run_id=run_id, models=models, n_splits=n_splits, seed=seed) as trace:
+        with span("load"):
+            df = engineer_features(load_csv_from_data(filename=input_filename))
+        fg = get_feature_groups()
+        X = df[fg["numeric"] + fg["binary"] + fg["onehot"]].reset_index(drop=True)
+        y = df["Exited"].astype(int).to_numpy()
+        folds = fold_assignment(X, y, n_splits, seed)
+
+        tasks = [(m, k) for m in models for k in range(n_splits)]
+        print(f"[INFO] model zoo: {len(models)} models × {n_splits} folds = {len(tasks)} fits (n_jobs={n_jobs})")
+        with span("share_data", rows=len(y)):
+            data = SharedDataset.create(X, y)
+        with data, span("cv_parallel", fits=len(tasks)):
+            parts = Parallel(n_jobs=n_jobs)(delayed(_run_fold)(m, k, data, folds, fg, seed) for m, k in tasks)
+        _reduce_pipe_cache()
+
+    board = pd.DataFrame([_summarize(m, [p for p in parts if p["model"] == m], y) for m in models])
+    board = board.sort_values("roc_auc", ascending=False, ignore_index=True)
+    board.insert(0, "run_id", run_id)
+    board["n_folds"], board["seed"], board["rows"] = n_splits, seed, len(y)
+
+    out_csv = Path(out_csv)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    # 기존 파일과 열 이름 기준으로 합쳐 다시 씀(열이 추가/변경돼도 행이 밀리지 않음, 없던 열은 빈 값)
+    merged = board.round(6)
+    if out_csv.exists():
+        merged = pd.concat([pd.read_csv(out_csv), merged], ignore_index=True)
+        merged = merged[list(board.columns) + [c for c in merged.columns if c not in board.columns]]
+    tmp = out_csv.with_suffix(".csv.tmp")
+    merged.to_csv(tmp, index=False)
+    tmp.replace(out_csv)
+    print(board.drop(columns=["run_id", "n_folds", "seed", "rows"]).round(4).to_string(index=False))
+    print(f"[SAVE] leaderboard -> {out_csv}")
+    profile_path = trace.save(out_csv.parent / f"model_zoo_{run_id}{PROFILE_SUFFIX}")
+    print(f"[SAVE] profile -> {profile_path} (total {trace.wall_s:.1f}s)")
+    return board
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="모델 계열별 공유 fold CV → 정확도/서빙 비용 리더보드")
+    ap.add_argument("--models", default=None, help=f"',' 구분(기본: 설치된 전체 {','.join(MODEL_FAMILIES)})")
+    ap.add_argument("--folds", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--jobs", type=int, default=-1, help="동시 학습 프로세스 수(-1=전체 코어)")
+    ap.add_argument("--data-csv", default=None, help="assets/data 내 파일명(기본 자동 탐색)")
+    ap.add_argument("--out", default=str(LEADERBOARD_CSV))
+    a = ap.parse_args()
+    run([m.strip() for m in a.models.split(",") if m.strip()] if a.models else None,
+        n_splits=a.folds, seed=a.seed, n_jobs=a.jobs, input_filename=a.data_csv, out_csv=Path(a.out))
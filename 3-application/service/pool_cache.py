@@ -0,0 +1,67 @@
+# pool_cache.py
+# ------------------------------------------------------------
+# 목적: CatBoost 학습 데이터 양자화(border 계산 + 범주형 해싱)를 실행당 1회로
+# - 전체 피처 행렬(X, y)을 한 번 Pool.quantize() → CatBoost 바이너리 quantized 포맷으로 저장
+#   (<CV_CACHE_DIR>/pools/<key>.qpool, 키 = 데이터 해시 + 범주형 인덱스 + border_count + catboost 버전)
+# - CV fold 학습/검증 Pool은 slice(인덱스)로 잘라 씀(X.iloc[...].copy() + Pool 재생성 + 재양자화 없음)
+# - 같은 데이터로 다시 실행하면 파일에서 로드(quantized://)
+# - 정리: 새 Pool 저장 시 cv_store와 같은 정책(CV_CACHE_MAX_AGE_DAYS 경과/CV_CACHE_MAX_MB 초과 LRU)으로 삭제
+# - 제약: 예측(predict_proba)은 원본 피처 Pool 사용 — catboost 1.2는 범주형이 있는 quantized Pool 예측 미지원.
+#         SMOTENC 변형은 학습 행이 합성 데이터이므로 적용 대상 아님
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from service.cv_store import CV_CACHE_DIR, CVStore, data_hash
+
+POOL_DIR = CV_CACHE_DIR / "pools"
+BORDER_COUNT = 254          # CatBoost CPU 기본값(학습 파라미터에 border_count를 따로 주지 않음)
+
+
+class QuantizedPool:
+    def __init__(self, X: pd.DataFrame, y: np.ndarray, cat_idx: Sequence[int], *,
+                 border_count: int = BORDER_COUNT, root: Path = POOL_DIR, persist: bool = True) -> None:
+        import catboost
+        from catboost import Pool
+
+        parts = {"data": data_hash(X, y), "cat_idx": list(map(int, cat_idx)),
+                 "border_count": border_count, "catboost": catboost.__version__}
+        self.key = hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:24]
+        self.path = Path(root) / f"{self.key}.qpool"
+        self.loaded = False
+        self.pool = None
+        if persist and self.path.exists():
+            try:
+                self.pool = Pool(f"quantized://{self.path}")
+                self.loaded = self.pool.num_row() == len(X)
+                os.utime(self.path)           # 마지막 사용 시각(정리 기준)
+            except Exception:
+                self.pool = None          # 깨진 파일/버전 불일치 → 다시 양자화
+        if not self.loaded:
+            self.pool = Pool(X, y, cat_features=list(cat_idx), feature_names=list(map(str, X.columns)))
+            self.pool.quantize(border_count=border_count)
+            if persist:
+                self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.pool.save(str(tmp))
+            os.replace(tmp, self.path)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            print(f"[WARN] quantized pool 저장 실패(메모리에서만 사용): {e}")
+            return
+        CVStore(self.path.parent.parent).purge(keep=[self.path])
+
+    def slice(self, idx: Optional[np.ndarray] = None):
+        """행 인덱스 부분집합(quantized). idx=None이면 전체."""
+        return self.pool if idx is None else self.pool.slice(np.asarray(idx, dtype=np.int64))
@@ -0,0 +1,85 @@
+# racing.py
+# ------------------------------------------------------------
+# 목적: 후보 모델 fold 단위 레이싱 선택 — 통계적으로 열세가 확실한 후보는 남은 fold를 돌리지 않음
+# - 라운드 k: 살아 있는 후보 모두 fold k 평가 → 선두(평균 최고)와 각 후보의 fold별 점수 차(paired)로
+#   단측 t-검정, k >= min_folds 이고 P(선두 > 후보) >= confidence 이면 탈락
+# - 후보가 1개 남으면 즉시 종료 → 비용은 후보 수가 아니라 후보 간 차이가 작을수록 커짐
+# - 끝까지 여러 후보가 남으면 평균 점수 최고(동률은 후보 순서 우선), 평가 중 예외가 난 후보는 탈락
+# - 후보 = 이름 + evaluate(name, fold) → 점수 함수이므로 CatBoost 변형 외 모델도 그대로 경쟁 가능
+# ------------------------------------------------------------
+from __future__ import annotations
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class RaceResult:
+    best: str
+    scores: Dict[str, List[float]]                        # 후보 → 평가한 fold 점수(순서대로)
+    eliminated: Dict[str, int] = field(default_factory=dict)   # 후보 → 탈락 시점(fold 수)
+    failed: Dict[str, str] = field(default_factory=dict)       # 후보 → 예외 메시지
+
+    @property
+    def evaluations(self) -> int:
+        return sum(len(v) for v in self.scores.values())
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"best": self.best, "folds_run": {k: len(v) for k, v in self.scores.items()},
+                "eliminated": self.eliminated, "failed": self.failed}
+
+
+def _mean(xs: Sequence[float]) -> float:
+    return sum(xs) / len(xs)
+
+def dominance(leader: Sequence[float], other: Sequence[float]) -> float:
+    """paired 단측 t-검정 신뢰도 P(leader 평균 > other 평균). 차이의 분산이 0이면 부호로 판정."""
+    from scipy import stats
+    d = [a - b for a, b in zip(leader, other)]
+    k = len(d)
+    if k < 2:
+        return 0.0
+    mean = _mean(d)
+    sd = math.sqrt(sum((x - mean) ** 2 for x in d) / (k - 1))
+    if sd == 0.0:
+        return 1.0 if mean > 0 else 0.0
+    return float(stats.t.cdf(mean / (sd / math.sqrt(k)), df=k - 1))
+
+def race(candidates: Sequence[str], evaluate: Callable[[str, int], float], n_folds: int, *,
+         confidence: float = 0.95, min_folds: int = 2,
+         log: Optional[Callable[[str], None]] = print) -> RaceResult:
+    """fold 1..n_folds 순서로 살아 있는 후보를 평가하며 열세 후보를 탈락시킴."""
+    scores: Dict[str, List[float]] = {c: [] for c in candidates}
+    alive: List[str] = list(candidates)
+    res = RaceResult(best=alive[0], scores=scores)
+
+    for fold in range(1, n_folds + 1):
+        for c in list(alive):
+            try:
+                scores[c].append(float(evaluate(c, fold)))
+            except Exception as e:
+                alive.remove(c)
+                res.failed[c] = str(e)
+                if log:
+                    log(f"[RACE] {c} failed at fold {fold}: {e}")
+        if not alive:
+            raise RuntimeError(f"모든 후보의 평가가 실패했습니다: {res.failed}")
+        if log:
+            log(f"[RACE] fold {fold}: " + ", ".join(f"{c}={scores[c][-1]:.4f}" for c in alive))
+        if len(alive) == 1:
+            break
+        if fold < min_folds:
+            continue
+        leader = max(alive, key=lambda c: _mean(scores[c]))       # max는 동률 시 앞쪽 유지
+        for c in [c for c in alive if c != leader]:
+            p = dominance(scores[leader], scores[c])
+            if p >= confidence:
+                alive.remove(c)
+                res.eliminated[c] = fold
+                if log:
+                    log(f"[RACE] drop {c} after {fold} folds (P({leader} > {c})={p:.3f})")
+        if len(alive) == 1:
+            break
+
+    res.best = max(alive, key=lambda c: _mean(scores[c]))
+    return res
@@ -0,0 +1,120 @@
+# reco_batch.py
+# ------------------------------------------------------------
+# 목적: 스코어링된 전체 고객의 규칙 기반 추천(derive_flags + select_products)을 한 번에 사전계산
+#       → DB customer_reco 테이블(상세 패널은 1행 조회, 캠페인 추출은 SQL로 일괄)
+# - 규칙은 utils/llm/reco_templates.py의 PRODUCT_RULES 하나만 사용(스칼라/벡터 결과 동일)
+# - full_scoring(write_db) 실행 끝에 자동 갱신, 단독 실행도 가능
+# 입력: DB bank_customer + stg_churn_score (또는 --from-csv: 원본 CSV + churn_scores.csv)
+# 출력: customer_id, churn_probability, risk_level, credit_band, age_band,
+#       product_1..3, reason_1..3, generated_at
+# 사용: python service/reco_batch.py
+#       python service/reco_batch.py --from-csv --no-write-db --out-csv customer_reco.csv
+# ------------------------------------------------------------
+from __future__ import annotations
+import sys
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.config import RunConfig, DBConfig
+from utils.llm.reco_templates import derive_flags_frame, select_products_frame
+from utils.perf import metrics
+
+RECO_ROWS = metrics.counter("reco_batch_rows", "사전계산한 추천 행 수")
+RECO_SECONDS = metrics.histogram("reco_batch_seconds", "추천 사전계산 단계별 소요(초)", ["stage"])
+
+INPUT_COLS = ["CreditScore", "Age", "Balance", "NumOfProducts", "HasCrCard", "IsActiveMember",
+              "EstimatedSalary", "churn_probability"]
+
+
+def build_reco_frame(customers: pd.DataFrame) -> pd.DataFrame:
+    """고객 원본 컬럼 + churn_probability(CustomerId 또는 customer_id) → customer_reco 행."""
+    ids = customers["CustomerId"] if "CustomerId" in customers.columns else customers["customer_id"]
+    with RECO_SECONDS.time(stage="build"):
+        flags = derive_flags_frame(customers)
+        picks = select_products_frame(customers, flags=flags)
+        out = pd.concat([
+            pd.DataFrame({
+                "customer_id": ids.to_numpy(),
+                "churn_probability": pd.to_numeric(customers["churn_probability"], errors="coerce").to_numpy(),
+                "risk_level": flags["risk"].astype(str).to_numpy(),
+                "credit_band": flags["credit_band"].astype(str).to_numpy(),
+                "age_band": flags["age_band"].astype(str).to_numpy(),
+            }),
+            picks.reset_index(drop=True),
+        ], axis=1)
+        out["generated_at"] = datetime.now().replace(microsecond=0)
+    RECO_ROWS.inc(len(out))
+    return out
+
+def write_reco(df_reco: pd.DataFrame, db: DBConfig, engine=None) -> None:
+    """customer_reco 교체 적재(stg_churn_score와 같은 방식) + MySQL이면 PK/위험도 인덱스."""
+    from sqlalchemy import create_engine
+    eng = engine or create_engine(db.url, pool_pre_ping=True)
+    with RECO_SECONDS.time(stage="db_write"):
+        df_reco.to_sql(db.reco_table, con=eng, if_exists="replace", index=False,
+                       chunksize=5_000, method="multi")
+        if eng.dialect.name == "mysql":
+            with eng.begin() as conn:
+                conn.exec_driver_sql(f"ALTER TABLE {db.reco_table} MODIFY customer_id BIGINT NOT NULL, "
+                                     f"ADD PRIMARY KEY (customer_id), ADD INDEX ix_reco_risk (risk_level)")
+    print(f"[DB] wrote {len(df_reco):,} rows -> {db.name}.{db.reco_table}")
+
+def load_customers_db(db: DBConfig, engine=None) -> pd.DataFrame:
+    from sqlalchemy import create_engine
+    eng = engine or create_engine(db.url, pool_pre_ping=True)
+    sql = f"""
+    SELECT b.CustomerId, b.CreditScore, b.Age, b.Balance, b.NumOfProducts, b.HasCrCard,
+           b.IsActiveMember, b.EstimatedSalary, s.churn_probability
+    FROM bank_customer b
+    JOIN {db.table} s ON s.customer_id = b.CustomerId
+    """
+    return pd.read_sql(sql, eng)
+
+def load_customers_csv(config: RunConfig) -> pd.DataFrame:
+    from utils.process import load_csv_from_data
+    if config.data_csv is not None:
+        raw = load_csv_from_data(config.data_csv.name, data_dir=config.data_csv.parent)
+    else:
+        raw = load_csv_from_data()
+    scores = pd.read_csv(config.out_csv)
+    return raw.merge(scores, left_on="CustomerId", right_on="customer_id", how="inner")
+
+def run(config: RunConfig, customers: Optional[pd.DataFrame] = None,
+        out_csv: Optional[Path] = None) -> pd.DataFrame:
+    """사전계산 1회: customers 미지정 시 DB(write_db) 또는 CSV(from_csv)에서 읽음."""
+    t0 = time.perf_counter()
+    if customers is None:
+        customers = load_customers_db(config.db)
+    reco = build_reco_frame(customers)
+    print(f"[INFO] reco rows={len(reco):,} ({time.perf_counter() - t0:.2f}s) "
+          f"risk={reco['risk_level'].value_counts().to_dict()}")
+    if out_csv is not None:
+        Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
+        reco.to_csv(out_csv, index=False)
+        print(f"[SAVE] reco -> {out_csv}")
+    if config.write_db:
+        write_reco(reco, config.db)
+    return reco
+
+
+if __name__ == "__main__":
+    base = RunConfig.from_env(write_db=True)
+    ap = argparse.ArgumentParser(description="규칙 기반 추천 사전계산 → customer_reco")
+    ap.add_argument("--from-csv", action="store_true", help="DB 대신 원본 CSV + churn_scores.csv에서 읽기")
+    ap.add_argument("--data-csv", default=base.data_csv, help="원본 CSV(기본 assets/data 자동 탐색)")
+    ap.add_argument("--scores-csv", default=base.out_csv, help="점수 CSV(customer_id, churn_probability)")
+    ap.add_argument("--out-csv", default=None, help="결과 CSV(캠페인 추출용, 선택)")
+    ap.add_argument("--write-db", action=argparse.BooleanOptionalAction, default=True)
+    a = ap.parse_args()
+    config = base.replace(data_csv=a.data_csv, out_csv=a.scores_csv, write_db=a.write_db)
+    customers = load_customers_csv(config) if a.from_csv else None
+    run(config, customers, out_csv=a.out_csv)
+    metrics.flush()
@@ -0,0 +1,55 @@
+# resample.py
+# ------------------------------------------------------------
+# 목적: SMOTENC 오버샘플링을 타입 있는 배열로 실행(full_scoring CV fold/최종 학습, incremental delta 공용)
+# - 기존: X.values(문자열+숫자 혼합 → object 배열 전체 복사) → imblearn 내부에서 수치 열을 다시 float 변환,
+#         범주 열은 파이썬 문자열 비교로 원핫 → 결과도 object 배열 → 열마다 astype(str)
+# - 변경: 범주형은 정수 코드(pd.factorize sort=True → 범주 순서 = 문자열 정렬 순서 → 원핫 열 순서/동률 처리 동일),
+#         수치형은 그대로, float64 C-연속 배열 1개로 SMOTENC 실행 → 끝에서 범주형만 코드 → 문자열로 1회 복원
+# - float64 유지 이유: float32로 줄이면 거리 동률이 달라져 이웃/합성 행이 기존 결과와 달라짐
+#   (float64는 기존 object 경로와 결과가 비트 단위로 같음 → CV 캐시/레이싱 결과 호환)
+# ------------------------------------------------------------
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from imblearn.over_sampling import SMOTENC
+except Exception:
+    SMOTENC = None  # imblearn 미설치 환경에서도 import 가능하도록
+
+
+def encode_frame(X: pd.DataFrame, cat_idx: Sequence[int]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """DataFrame → (float64 C-연속 배열, 범주형 열별 범주 배열). 범주형 값은 정렬 기준 정수 코드."""
+    A = np.empty((len(X), X.shape[1]), dtype=np.float64)
+    cats: List[np.ndarray] = []
+    cat_set = set(cat_idx)
+    for j in range(X.shape[1]):
+        col = X.iloc[:, j]
+        if j in cat_set:
+            codes, uniques = pd.factorize(col.astype(str), sort=True)
+            A[:, j] = codes
+            cats.append(np.asarray(uniques, dtype=object))
+        else:
+            A[:, j] = pd.to_numeric(col, errors="coerce")
+    return A, cats
+
+def decode_frame(A: np.ndarray, columns: Sequence[str], cat_idx: Sequence[int],
+                 cats: List[np.ndarray]) -> pd.DataFrame:
+    """encode_frame 역변환(범주형 코드 → 문자열, 수치형은 float64)."""
+    data = {}
+    lookup = dict(zip(cat_idx, cats))
+    for j, c in enumerate(columns):
+        data[c] = lookup[j][A[:, j].astype(np.int64)] if j in lookup else A[:, j]
+    return pd.DataFrame(data, columns=list(columns))
+
+def smotenc_resample(X: pd.DataFrame, y: np.ndarray, cat_idx: Sequence[int], *, random_state: int,
+                     **smote_kw) -> Tuple[pd.DataFrame, np.ndarray]:
+    """SMOTENC(categorical_features=cat_idx, **smote_kw) 결과를 원래 컬럼 구성의 DataFrame으로."""
+    if SMOTENC is None:
+        raise RuntimeError("SMOTENC가 설치되지 않았습니다 (pip install imbalanced-learn).")
+    A, cats = encode_frame(X, cat_idx)
+    smote = SMOTENC(categorical_features=list(cat_idx), random_state=random_state, **smote_kw)
+    A_res, y_res = smote.fit_resample(A, y)
+    return decode_frame(np.asarray(A_res), X.columns, cat_idx, cats), np.asarray(y_res)
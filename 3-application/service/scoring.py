@@ -0,0 +1,186 @@
+# scoring.py
+# ------------------------------------------------------------
+# 목적: 재학습 없이 최신 best_model_*.pkl로 배치 스코어링
+#       (.npz 추론 포맷이 있으면 catboost import/pkl 로드 없이 NumPy로 평가)
+# 입력: DataFrame / list[dict] / CSV 경로 (Customer-Churn-Records.csv와 같은 스키마)
+# 출력: customer_id, churn_probability (churn_scores.csv와 동일 컬럼)
+# 사용: python service/scoring.py assets/data/Customer-Churn-Records.csv --out scores.csv
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+import json
+import pickle
+import time
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.process import engineer_features, fit_feature_params, load_csv_from_data
+from utils.process.data_loader import _safe_read_csv
+from utils.perf import metrics
+
+SCORING_ROWS = metrics.counter("scoring_rows", "스코어링한 행 수", ["backend"])
+SCORING_SECONDS = metrics.histogram("scoring_seconds", "score_frame 1회 소요(초, 피처 생성+예측)", ["backend"])
+SCORING_RPS = metrics.gauge("scoring_rows_per_second", "최근 score_frame 처리량(rows/s)", ["backend"])
+
+HERE = Path(__file__).resolve()
+APP_DIR = HERE.parent.parent            # 3-application/
+MODELS_DIR = APP_DIR / "models"
+MODEL_GLOB = "best_model_*.pkl"
+
+# auto: .npz(parity 통과)가 있으면 compiled, 없으면 catboost / compiled / catboost 강제
+SCORING_BACKEND = os.getenv("SCORING_BACKEND", "auto").lower()
+
+
+class ScoringModel:
+    """학습된 모델 + 학습 시 피처 정보(컬럼/범주형/구간)를 묶은 스코어링 번들."""
+    def __init__(self, model, features: List[str], cat_features: List[str],
+                 feature_params: Dict[str, Any], path: Path) -> None:
+        self.model = model
+        self.features = features
+        self.cat_features = cat_features
+        self.feature_params = feature_params
+        self.path = path
+
+    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """원본 스키마 DataFrame → 학습과 동일한 피처 행렬."""
+        data = engineer_features(df, params=self.feature_params)
+        missing = [c for c in self.features if c not in data.columns]
+        if missing:
+            raise KeyError(f"[ERROR] 스코어링 피처 누락: {missing}")
+        X = data[self.features].copy()
+        for c in self.cat_features:
+            X[c] = X[c].astype(str)
+        return X
+
+    @property
+    def backend(self) -> str:
+        return "catboost" if hasattr(self.model, "get_cat_feature_indices") else "compiled"
+
+    def predict_proba(self, X: pd.DataFrame):
+        if self.backend == "compiled":
+            return self.model.predict_proba(X)[:, 1]
+        from catboost import Pool
+        cat_idx = [X.columns.get_loc(c) for c in self.cat_features]
+        return self.model.predict_proba(Pool(X, cat_features=cat_idx))[:, 1]
+
+
+# ─────────────────────────────────────────────
+# 모델 로드 (프로세스 내 1회, 새 모델 파일이 생기면 자동 교체)
+# ─────────────────────────────────────────────
+_LOCK = threading.Lock()
+_CACHE: Dict[str, Any] = {"key": None, "bundle": None}
+
+def latest_model_path(models_dir: str | Path | None = None) -> Path:
+    d = Path(models_dir) if models_dir else MODELS_DIR
+    cands = sorted(d.glob(MODEL_GLOB), key=lambda p: p.stat().st_mtime)
+    if not cands:
+        raise FileNotFoundError(f"[ERROR] {d} 에 {MODEL_GLOB} 모델이 없습니다. full_scoring.py를 먼저 실행하세요.")
+    return cands[-1].resolve()
+
+def _load_pickle(model_path: Path):
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+def _read_meta(model_path: Path, model=None) -> Dict[str, Any]:
+    meta_path = model_path.with_suffix(".meta.json")
+    if meta_path.exists():
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    # 메타 이전에 저장된 모델: 모델 내장 정보 + 기본 학습 CSV로 피처 파라미터 재계산
+    print(f"[WARN] {meta_path.name} 없음 → 기본 학습 CSV로 피처 파라미터를 재계산합니다.")
+    model = model if model is not None else _load_pickle(model_path)
+    features = list(model.feature_names_)
+    cat_features = [features[i] for i in model.get_cat_feature_indices()]
+    return {
+        "features": features,
+        "cat_features": cat_features,
+        "feature_params": fit_feature_params(load_csv_from_data()),
+    }
+
+def _compiled_path(model_path: Path, meta: Dict[str, Any]) -> Optional[Path]:
+    """parity 검증을 통과한 같은 이름의 .npz 경로(없으면 None)."""
+    if not (meta.get("compiled") or {}).get("ok"):
+        return None
+    p = model_path.with_suffix(".npz")
+    return p if p.exists() else None
+
+def load_model(model_path: str | Path | None = None, *, reload: bool = False,
+               backend: str | None = None) -> ScoringModel:
+    """
+    모델 번들을 로드(캐시)합니다. model_path가 없으면 최신 best_model_*.pkl.
+    backend: auto | compiled | catboost (기본: SCORING_BACKEND 환경변수)
+    """
+    backend = (backend or SCORING_BACKEND).lower()
+    path = Path(model_path).resolve() if model_path else latest_model_path()
+    key = (str(path), path.stat().st_mtime, backend)
+    with _LOCK:
+        if not reload and _CACHE["key"] == key:
+            return _CACHE["bundle"]
+        meta = _read_meta(path)
+        compiled = _compiled_path(path, meta) if backend != "catboost" else None
+        if compiled is not None:
+            from service.model_export import CompiledModel
+            model = CompiledModel(compiled)
+        elif backend == "compiled":
+            raise FileNotFoundError(f"[ERROR] {path.stem}.npz 추론 포맷이 없습니다. model_export.py를 먼저 실행하세요.")
+        else:
+            model = _load_pickle(path)
+        bundle = ScoringModel(model, meta["features"], meta["cat_features"], meta["feature_params"], path)
+        _CACHE["key"], _CACHE["bundle"] = key, bundle
+        print(f"[LOAD] scoring model <- {(compiled or path).name} ({bundle.backend})")
+        return bundle
+
+
+# ─────────────────────────────────────────────
+# 공개 API
+# ─────────────────────────────────────────────
+def score_frame(df: pd.DataFrame, model_path: str | Path | None = None) -> pd.DataFrame:
+    """DataFrame → customer_id, churn_probability."""
+    bundle = load_model(model_path)
+    if df.empty:
+        return pd.DataFrame({"customer_id": [], "churn_probability": []})
+    t0 = time.perf_counter()
+    prob = bundle.predict_proba(bundle.prepare(df))
+    dt = time.perf_counter() - t0
+    SCORING_ROWS.inc(len(df), backend=bundle.backend)
+    SCORING_SECONDS.observe(dt, backend=bundle.backend)
+    SCORING_RPS.set(len(df) / max(dt, 1e-9), backend=bundle.backend)
+    ids = df["CustomerId"].values if "CustomerId" in df.columns else df.index.values
+    return pd.DataFrame({"customer_id": ids, "churn_probability": prob})
+
+def score_records(records: List[Dict[str, Any]], model_path: str | Path | None = None) -> List[Dict[str, Any]]:
+    """list[dict] (JSON 요청 등) → list[{"customer_id", "churn_probability"}]."""
+    return score_frame(pd.DataFrame.from_records(records), model_path).to_dict("records")
+
+def score_file(path: str | Path, out_csv: str | Path | None = None,
+               model_path: str | Path | None = None) -> pd.DataFrame:
+    """CSV 파일 스코어링. out_csv가 주어지면 결과 저장."""
+    df = _safe_read_csv(Path(path))
+    out = score_frame(df, model_path)
+    if out_csv:
+        out.to_csv(out_csv, index=False)
+        print(f"[SAVE] scores -> {out_csv} ({len(out):,} rows)")
+    return out
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="저장된 최신 모델로 CSV 스코어링(재학습 없음)")
+    ap.add_argument("csv", help="스코어링할 CSV 경로")
+    ap.add_argument("--out", default=None, help="결과 CSV 경로(미지정 시 상위 10행만 출력)")
+    ap.add_argument("--model", default=None, help="모델 pkl 경로(기본: 최신 best_model_*.pkl)")
+    ap.add_argument("--backend", default=None, choices=["auto", "compiled", "catboost"],
+                    help="추론 백엔드(기본: SCORING_BACKEND 또는 auto)")
+    args = ap.parse_args()
+    if args.backend:
+        SCORING_BACKEND = args.backend
+    res = score_file(args.csv, args.out, args.model)
+    print(res.head(10).to_string(index=False))
+    metrics.flush()
@@ -0,0 +1,264 @@
+# serve.py
+# ------------------------------------------------------------
+# 목적: CRM 실시간 호출용 경량 HTTP 스코어링 서버 (asyncio, 추가 의존성 없음)
+# 엔드포인트:
+#   POST /predict : 고객 1명(JSON object) → 마이크로배치로 묶어 predict_proba
+#   POST /score   : 고객 여러 명(JSON array 또는 {"records": [...]}) → 즉시 배치 스코어
+#   GET  /healthz : 모델/배치 상태
+#   GET  /metrics : Prometheus 텍스트 포맷(스코어링 처리량 + assets/logs/metrics/*.prom 병합)
+# 사용: python service/serve.py --port 8000 --max-batch 256 --max-wait-ms 5
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from service.scoring import load_model, score_frame
+from utils.perf import metrics
+
+# ENV ---------------------------------------------------------
+SERVE_HOST  = os.getenv("SERVE_HOST", "127.0.0.1")
+SERVE_PORT  = int(os.getenv("SERVE_PORT", "8000"))
+MAX_BATCH   = int(os.getenv("SERVE_MAX_BATCH", "256"))
+MAX_WAIT_MS = float(os.getenv("SERVE_MAX_WAIT_MS", "5"))
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+_MAX_BODY = 32 * 1024 * 1024
+
+
+class PayloadTooLarge(ValueError):
+    """Content-Length > _MAX_BODY (413). 그 밖의 요청 파싱 오류(ValueError)는 400."""
+
+
+class MicroBatcher:
+    """
+    동시에 들어온 단건 요청을 모아 한 번에 predict_proba 합니다.
+    - max_batch 개가 모이거나, 첫 요청 후 max_wait_ms가 지나면 배치 실행
+    - 모델 호출은 전용 스레드 1개에서 수행(이벤트 루프 비차단)
+    """
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS) -> None:
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.queue: asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]] = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scorer")
+        self.stats = {"requests": 0, "batches": 0, "max_batch_seen": 0}
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, fut))
+        return await fut
+
+    async def score_many(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """배치 엔드포인트용: 같은 스코어링 스레드에서 바로 실행."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _score_records, records)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    # 대기 시간이 지났어도 이미 큐에 쌓인 요청은 함께 처리
+                    if self.queue.empty():
+                        break
+                    batch.append(self.queue.get_nowait())
+                    continue
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            records = [r for r, _ in batch]
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(batch))
+            try:
+                results = await loop.run_in_executor(self.executor, _score_records_isolated, records)
+            except Exception as e:  # 안전망: 배치 전체 실패
+                results = [e] * len(batch)
+            for (_, fut), res in zip(batch, results):
+                if fut.done():
+                    continue
+                if isinstance(res, Exception):
+                    fut.set_exception(res)
+                else:
+                    fut.set_result(res)
+
+
+def _score_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return score_frame(pd.DataFrame.from_records(records)).to_dict("records")
+
+def _score_records_isolated(records: List[Dict[str, Any]]) -> List[Any]:
+    """배치 스코어 실패 시(잘못된 요청 1건 등) 건별로 재시도해 다른 요청은 살립니다."""
+    try:
+        return _score_records(records)
+    except Exception:
+        out: List[Any] = []
+        for r in records:
+            try:
+                out.append(_score_records([r])[0])
+            except Exception as e:
+                out.append(e)
+        return out
+
+
+# ─────────────────────────────────────────────
+# HTTP (HTTP/1.1 keep-alive, JSON 전용 최소 구현)
+# ─────────────────────────────────────────────
+async def _read_request(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").strip().split(" ", 2)
+    if len(parts) != 3:
+        raise ValueError(f"malformed request line: {line[:100]!r}")
+    method, target, version = parts
+    headers: Dict[str, str] = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError:
+        raise ValueError(f"invalid Content-Length: {headers['content-length']!r}") from None
+    if length < 0:
+        raise ValueError(f"invalid Content-Length: {length}")
+    if length > _MAX_BODY:
+        raise PayloadTooLarge("payload too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], version, headers, body
+
+def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    if isinstance(payload, str):   # /metrics (text exposition)
+        body, ctype = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body, ctype = json.dumps(payload, ensure_ascii=False, default=float).encode("utf-8"), "application/json; charset=utf-8"
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {ctype}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class ScoringServer:
+    def __init__(self, batcher: MicroBatcher) -> None:
+        self.batcher = batcher
+        self.started_at = time.time()
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/healthz":
+            if method != "GET":
+                return 405, {"error": "GET only"}
+            try:
+                # 새 best_model_*.pkl이 생기면 load_model이 언피클 → 이벤트 루프 밖(기본 스레드 풀)에서 실행
+                bundle = await asyncio.get_running_loop().run_in_executor(None, load_model)
+                model_name = bundle.path.name
+                status = "ok"
+            except Exception as e:
+                model_name, status = None, f"no model: {e}"
+            return 200, {"status": status, "model": model_name,
+                         "uptime_s": round(time.time() - self.started_at, 1),
+                         "max_batch": self.batcher.max_batch,
+                         "max_wait_ms": self.batcher.max_wait * 1000.0,
+                         **self.batcher.stats}
+
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"error": "GET only"}
+            return 200, metrics.collect()
+
+        if path not in ("/predict", "/score"):
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "POST only"}
+        try:
+            payload = json.loads(body or b"null")
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"invalid JSON: {e}"}
+
+        try:
+            if path == "/predict":
+                if not isinstance(payload, dict):
+                    return 400, {"error": "/predict expects a JSON object"}
+                return 200, await self.batcher.submit(payload)
+            records = payload.get("records") if isinstance(payload, dict) else payload
+            if not isinstance(records, list):
+                return 400, {"error": "/score expects a JSON array or {\"records\": [...]}"}
+            return 200, {"results": await self.batcher.score_many(records)}
+        except KeyError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    req = await _read_request(reader)
+                except ValueError as e:
+                    writer.write(_response(413 if isinstance(e, PayloadTooLarge) else 400, {"error": str(e)}, False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if req is None:
+                    break
+                method, path, version, headers, body = req
+                keep_alive = (headers.get("connection", "").lower() != "close") and version == "HTTP/1.1"
+                status, payload = await self.route(method, path, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+async def serve(host: str = SERVE_HOST, port: int = SERVE_PORT,
+                max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS) -> None:
+    load_model()  # 기동 시 1회 로드(첫 요청 지연 방지)
+    batcher = MicroBatcher(max_batch, max_wait_ms)
+    batcher.start()
+    app = ScoringServer(batcher)
+    server = await asyncio.start_server(app.handle, host, port)
+    print(f"[SERVE] http://{host}:{port}  (max_batch={batcher.max_batch}, max_wait_ms={max_wait_ms})")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="churn 모델 HTTP 스코어링 서버")
+    ap.add_argument("--host", default=SERVE_HOST)
+    ap.add_argument("--port", type=int, default=SERVE_PORT)
+    ap.add_argument("--max-batch", type=int, default=MAX_BATCH, help="마이크로배치 최대 크기")
+    ap.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="첫 요청 후 최대 대기(ms)")
+    args = ap.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        print("[SERVE] stopped")
+    finally:
+        metrics.flush()
@@ -0,0 +1,198 @@
+# test_llm_bulk.py
+# ------------------------------------------------------------
+# 목적: AsyncLLMClient / recommend_for_users_bulk 검증 — 실제 API 대신 로컬 가짜 OpenAI 호환 서버 사용
+# - 가짜 서버: http.server(스레드) POST /v1/chat/completions, OPENAI_BASE_URL을 여기로 지정
+# - 응답 summary = "age=<프롬프트의 나이>" → 결과가 어느 입력 행의 것인지 확인
+# - 검증: 세마포어 상한 / 429 Retry-After(backoff_max_s 상한) / 500·타임아웃 항목별 폴백 / 입력 순서 / 캐시 히트
+# 사용: python -m unittest discover -s tests      (3-application에서)
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from unittest import mock
+
+# --- import 경로 보정 (3-application를 sys.path에 추가) ---
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.llm import reco_templates
+from utils.llm.llm_client import AsyncLLMClient
+from utils.llm.reco_cache import RecoCache
+
+_AGE = re.compile(r"나이: (\d+)")
+# (status, headers, 응답 content(JSON 문자열), 응답 전 대기 초)
+Reply = Tuple[int, Dict[str, str], str, float]
+
+
+def _ok(age: str, delay: float = 0.0) -> Reply:
+    return 200, {}, json.dumps({"risk_level": "LOW", "summary": f"age={age}", "top_products": [],
+                                "next_actions": ["call"]}), delay
+
+
+class FakeOpenAI:
+    """OpenAI 호환 /v1/chat/completions 가짜 서버. reply(age, n번째 호출) → Reply."""
+    def __init__(self) -> None:
+        self.reply: Callable[[str, int], Reply] = lambda age, n: _ok(age)
+        self.calls: Dict[str, int] = {}
+        self.in_flight = self.max_in_flight = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                m = _AGE.search(body["messages"][-1]["content"])
+                age = m.group(1) if m else "?"
+                with fake._lock:
+                    n = fake.calls[age] = fake.calls.get(age, 0) + 1
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                try:
+                    status, headers, content, delay = fake.reply(age, n)
+                    time.sleep(delay)
+                    payload = ({"id": "cmpl-test", "object": "chat.completion", "created": 0,
+                                "model": body["model"],
+                                "choices": [{"index": 0, "finish_reason": "stop",
+                                             "message": {"role": "assistant", "content": content}}],
+                                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}}
+                               if status == 200 else {"error": {"message": content, "type": "test"}})
+                    data = json.dumps(payload).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    for k, v in headers.items():
+                        self.send_header(k, v)
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass          # 타임아웃으로 클라이언트가 먼저 끊음
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+def _row(age: int) -> Dict[str, Any]:
+    return {"Geography": "France", "Gender": "Female", "Age": age, "Tenure": 3, "Balance": 1200.0,
+            "NumOfProducts": 1, "HasCrCard": 1, "IsActiveMember": 0, "EstimatedSalary": 50_000.0,
+            "CreditScore": 640, "churn_probability": 0.42}
+
+
+class BulkRecoTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fake = FakeOpenAI()
+        self.addCleanup(self.fake.close)
+        env = {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": self.fake.url, "LLM_PROVIDER": "openai",
+               "LLM_MAX_RETRIES": "0", "LLM_TIMEOUT_S": "5", "LLM_BACKOFF_S": "0.01"}
+        for p in (mock.patch.dict(os.environ, env),
+                  mock.patch.object(reco_templates, "USE_LLM", True),
+                  mock.patch.object(reco_templates, "get_cache", lambda: self.cache)):
+            p.start()
+            self.addCleanup(p.stop)
+        self.cache: Optional[RecoCache] = None
+
+    def test_concurrency_is_capped_by_semaphore(self) -> None:
+        self.fake.reply = lambda age, n: _ok(age, delay=0.1)
+        rows = [_row(20 + i) for i in range(12)]
+        out = reco_templates.recommend_for_users_bulk(rows, max_concurrency=3)
+        self.assertEqual(self.fake.total_calls(), 12)
+        self.assertEqual(self.fake.max_in_flight, 3)
+        self.assertEqual([o["summary"] for o in out], [f"age={20 + i}" for i in range(12)])
+
+    def test_results_keep_input_order(self) -> None:
+        # 앞쪽 행일수록 늦게 응답 → 완료 순서는 입력의 역순
+        self.fake.reply = lambda age, n: _ok(age, delay=(40 - int(age)) * 0.03)
+        rows = [_row(30 + i) for i in range(8)]
+        out = reco_templates.recommend_for_users_bulk(rows, max_concurrency=8)
+        self.assertEqual([o["summary"] for o in out], [f"age={30 + i}" for i in range(8)])
+
+    def test_server_error_falls_back_per_item(self) -> None:
+        self.fake.reply = lambda age, n: (500, {}, "boom", 0.0) if age == "41" else _ok(age)
+        rows = [_row(40), _row(41), _row(42)]
+        out = reco_templates.recommend_for_users_bulk(rows)
+        self.assertEqual(out[1], reco_templates._fallback_user(rows[1]))
+        self.assertEqual([out[0]["summary"], out[2]["summary"]], ["age=40", "age=42"])
+
+    def test_timeout_falls_back_per_item(self) -> None:
+        self.fake.reply = lambda age, n: _ok(age, delay=2.0 if age == "51" else 0.0)
+        rows = [_row(50), _row(51), _row(52)]
+        t0 = time.perf_counter()
+        with mock.patch.dict(os.environ, {"LLM_TIMEOUT_S": "0.3"}):
+            out = reco_templates.recommend_for_users_bulk(rows)
+        self.assertLess(time.perf_counter() - t0, 1.5)
+        self.assertEqual(out[1], reco_templates._fallback_user(rows[1]))
+        self.assertEqual([out[0]["summary"], out[2]["summary"]], ["age=50", "age=52"])
+
+    def test_cache_hits_skip_the_call(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            self.cache = RecoCache(Path(d) / "reco_cache.sqlite")
+            rows = [_row(60), _row(61)]
+            first = reco_templates.recommend_for_users_bulk(rows)
+            self.assertEqual(self.fake.total_calls(), 2)
+            second = reco_templates.recommend_for_users_bulk(rows + [_row(62)])
+            self.assertEqual(self.fake.total_calls(), 3)          # 새 행(62)만 호출
+            self.assertEqual(second[:2], first)
+            self.assertEqual(second[2]["summary"], "age=62")
+            self.cache = None
+
+
+class RetryAfterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fake = FakeOpenAI()
+        self.addCleanup(self.fake.close)
+        p = mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": self.fake.url,
+                                         "LLM_PROVIDER": "openai"})
+        p.start()
+        self.addCleanup(p.stop)
+
+    def _chat(self, retry_after: str, backoff_max_s: float) -> Tuple[Dict[str, Any], float]:
+        self.fake.reply = lambda age, n: (429, {"Retry-After": retry_after}, "slow down", 0.0) if n == 1 else _ok(age)
+
+        async def run() -> Dict[str, Any]:
+            async with AsyncLLMClient(max_retries=2, backoff_s=0.0) as client:
+                client.backoff_max_s = backoff_max_s
+                return await client.chat_json(reco_templates.build_user_messages(_row(70)))
+
+        t0 = time.perf_counter()
+        out = asyncio.run(run())
+        return out, time.perf_counter() - t0
+
+    def test_honours_retry_after(self) -> None:
+        out, elapsed = self._chat("0.4", backoff_max_s=5.0)
+        self.assertEqual(out["summary"], "age=70")
+        self.assertEqual(self.fake.calls["70"], 2)
+        self.assertGreaterEqual(elapsed, 0.4)      # backoff_s=0 → 대기는 Retry-After에서만 나옴
+
+    def test_retry_after_is_capped_by_backoff_max(self) -> None:
+        out, elapsed = self._chat("3600", backoff_max_s=0.2)
+        self.assertEqual(out["summary"], "age=70")
+        self.assertEqual(self.fake.calls["70"], 2)
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,2 +1,2 @@
-from .llm_client import LLMClient, chat_text, chat_json
-__all__ = ["LLMClient", "chat_text", "chat_json"]
\ No newline at end of file
+from .llm_client import LLMClient, AsyncLLMClient, chat_text, chat_json, chat_json_stream
+__all__ = ["LLMClient", "AsyncLLMClient", "chat_text", "chat_json", "chat_json_stream"]
\ No newline at end of file
@@ -1,6 +1,6 @@
 # 3-application/utils/llm/llm_client.py
 from __future__ import annotations
-import os, json
+import os, json, random, asyncio
 from pathlib import Path
 from typing import List, Dict, Any, Generator, Optional
 from dotenv import load_dotenv
@@ -12,10 +12,13 @@ for p in (REPO_ROOT / ".env", APP_ROOT / ".env"):
     if p.exists():
         load_dotenv(p, override=False)
 
-try:
-    from openai import OpenAI
-except Exception as e:
-    raise RuntimeError("openai 패키지가 필요합니다. `pip install openai`") from e
+def _openai_cls(name: str = "OpenAI"):
+    """openai는 실제 클라이언트 생성 시점에 import(페이지 로드/키 미설정 폴백 경로에서 ~0.6s 절약)."""
+    try:
+        import openai
+    except Exception as e:
+        raise RuntimeError("openai 패키지가 필요합니다. `pip install openai`") from e
+    return getattr(openai, name)
 
 
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
@@ -23,24 +26,49 @@ def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     return v if v not in ("", None) else default
 
 
-class LLMClient:
-    """OpenAI 전용 간단 클라이언트."""
-    def __init__(self) -> None:
-        provider = (_env("LLM_PROVIDER", "openai") or "openai").lower()
-        if provider != "openai":
-            raise NotImplementedError(f"현재는 openai만 지원합니다 (LLM_PROVIDER={provider})")
+def current_model() -> str:
+    return _env("OPENAI_MODEL", "gpt-4o-mini") or "gpt-4o-mini"
 
-        api_key = _env("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY가 비어 있습니다. 루트 .env에 키를 넣어주세요.")
+def _settings() -> Dict[str, Any]:
+    """LLMClient/AsyncLLMClient 공통 설정(.env/환경변수)."""
+    provider = (_env("LLM_PROVIDER", "openai") or "openai").lower()
+    if provider != "openai":
+        raise NotImplementedError(f"현재는 openai만 지원합니다 (LLM_PROVIDER={provider})")
+
+    api_key = _env("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY가 비어 있습니다. 루트 .env에 키를 넣어주세요.")
+
+    return {
+        "api_key": api_key,
+        "base_url": _env("OPENAI_BASE_URL") or None,  # 필요 시 프록시/커스텀 엔드포인트
+        "model": current_model(),
+        "temperature": float(_env("LLM_TEMPERATURE", "0.1") or 0.1),
+        "max_tokens": int(_env("LLM_MAX_TOKENS", "600") or 600),
+        "seed": int(_env("LLM_SEED", "42") or 42),
+    }
+
+def _parse_json(text: str) -> Dict[str, Any]:
+    try:
+        return json.loads(text)
+    except Exception:
+        return {"raw": text}
 
-        base_url      = _env("OPENAI_BASE_URL")  # 필요 시 프록시/커스텀 엔드포인트
-        self.model    = _env("OPENAI_MODEL", "gpt-4o-mini")
-        self.temperature = float(_env("LLM_TEMPERATURE", "0.1") or 0.1)
-        self.max_tokens  = int(_env("LLM_MAX_TOKENS", "600") or 600)
-        self.seed        = int(_env("LLM_SEED", "42") or 42)
+def _response_format(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return (
+        {"type": "json_schema", "json_schema": {"name": "response", "schema": schema}}
+        if schema else
+        {"type": "json_object"}
+    )
 
-        self.client = OpenAI(api_key=api_key, base_url=base_url or None)
+
+class LLMClient:
+    """OpenAI 전용 간단 클라이언트."""
+    def __init__(self) -> None:
+        cfg = _settings()
+        self.model, self.temperature = cfg["model"], cfg["temperature"]
+        self.max_tokens, self.seed = cfg["max_tokens"], cfg["seed"]
+        self.client = _openai_cls()(api_key=cfg["api_key"], base_url=cfg["base_url"])
 
     def chat(
         self,
@@ -71,6 +99,8 @@ class LLMClient:
 
             def _gen():
                 for chunk in resp:
+                    if not chunk.choices:          # usage 전용 청크 등
+                        continue
                     delta = getattr(chunk.choices[0], "delta", None)
                     if delta and getattr(delta, "content", None):
                         yield delta.content  # type: ignore[attr-defined]
@@ -107,15 +137,125 @@ def chat_json(
 ) -> Dict[str, Any]:
     if temperature is not None:
         kwargs["temperature"] = temperature
-    response_format = (
-        {"type": "json_schema", "json_schema": {"name": "response", "schema": schema}}
-        if schema else
-        {"type": "json_object"}
-    )
-    text = _client().chat(messages, stream=False, response_format=response_format, **kwargs)  # type: ignore[assignment]
+    text = _client().chat(messages, stream=False, response_format=_response_format(schema), **kwargs)  # type: ignore[assignment]
+    return _parse_json(text)
+
+def chat_json_stream(
+    messages: List[Dict[str, str]],
+    *,
+    schema: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+    """
+    chat_json의 스트리밍 버전: 토큰이 도착할 때마다 지금까지의 부분 JSON(dict)을 yield.
+    제너레이터 반환값(StopIteration.value) = 최종 파싱 결과(chat_json과 동일 규칙).
+    """
+    from utils.llm.partial_json import PartialJSON
+    parser = PartialJSON()
+    last = None
+    for delta in _client().chat(messages, stream=True, response_format=_response_format(schema), **kwargs):
+        snap = parser.feed(delta)
+        if snap is not None and snap != last:
+            last = snap
+            yield snap
+    return parser.final()
+
+
+# ───────────────────────────────────────────────────────────────
+# 비동기 클라이언트 (일괄 추천용): 동시 요청 상한 + 지터 백오프 재시도 + 요청 타임아웃
+_RETRY_STATUS = (408, 409, 429)
+
+def _retryable(e: BaseException) -> bool:
+    """일시적 오류만 재시도(타임아웃/연결 끊김/429/5xx). 인증·요청 오류(4xx)는 즉시 실패."""
+    if isinstance(e, asyncio.TimeoutError):
+        return True
+    if type(e).__name__ in ("APITimeoutError", "APIConnectionError"):
+        return True
+    status = getattr(e, "status_code", None)
+    return status is not None and (status in _RETRY_STATUS or status >= 500)
+
+def _retry_after(e: BaseException) -> Optional[float]:
+    resp = getattr(e, "response", None)
     try:
-        return json.loads(text)
+        return float(resp.headers.get("retry-after"))  # type: ignore[union-attr]
     except Exception:
-        return {"raw": text}
+        return None
+
+
+class AsyncLLMClient:
+    """
+    AsyncOpenAI 기반 비동기 클라이언트. 이벤트 루프마다 새로 만들고 `async with`로 닫습니다.
+    - max_concurrency : 동시에 진행 중인 요청 수 상한(세마포어, 기본 LLM_MAX_CONCURRENCY=8)
+    - timeout_s       : 요청 1회 타임아웃(기본 LLM_TIMEOUT_S=30)
+    - max_retries     : 일시적 오류 재시도 횟수(기본 LLM_MAX_RETRIES=3), SDK 자체 재시도는 끔
+    - backoff_s       : 지수 백오프 기준(기본 LLM_BACKOFF_S=0.5) × full jitter, Retry-After 우선(둘 다 최대 8초)
+    """
+    def __init__(self, *, max_concurrency: Optional[int] = None, timeout_s: Optional[float] = None,
+                 max_retries: Optional[int] = None, backoff_s: Optional[float] = None) -> None:
+        cfg = _settings()
+        self.model, self.temperature = cfg["model"], cfg["temperature"]
+        self.max_tokens, self.seed = cfg["max_tokens"], cfg["seed"]
+        self.max_concurrency = max(1, int(max_concurrency or _env("LLM_MAX_CONCURRENCY", "8") or 8))
+        self.timeout_s   = float(timeout_s or _env("LLM_TIMEOUT_S", "30") or 30)
+        self.max_retries = int(max_retries if max_retries is not None else (_env("LLM_MAX_RETRIES", "3") or 3))
+        self.backoff_s   = float(backoff_s if backoff_s is not None else (_env("LLM_BACKOFF_S", "0.5") or 0.5))
+        self.backoff_max_s = 8.0
+        self._sem = asyncio.Semaphore(self.max_concurrency)
+        self.client = _openai_cls("AsyncOpenAI")(api_key=cfg["api_key"], base_url=cfg["base_url"],
+                                                 timeout=self.timeout_s, max_retries=0)
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        response_format: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> str:
+        args: Dict[str, Any] = dict(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            seed=self.seed,
+        )
+        if response_format:
+            args["response_format"] = response_format
+        args.update(kwargs or {})
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._sem:
+                    resp = await asyncio.wait_for(self.client.chat.completions.create(stream=False, **args),
+                                                  self.timeout_s)
+                return (resp.choices[0].message.content or "").strip()
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = random.uniform(0, min(self.backoff_max_s, self.backoff_s * 2 ** attempt))
+                else:   # 서버가 준 값도 상한 적용(큰 값이면 일괄 요청 1건이 그만큼 멈춤)
+                    delay = max(0.0, min(delay, self.backoff_max_s))
+                await asyncio.sleep(delay)   # 세마포어 밖에서 대기 → 다른 요청은 계속 진행
+        raise RuntimeError("unreachable")
+
+    async def chat_json(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        schema: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        text = await self.chat(messages, response_format=_response_format(schema), **kwargs)
+        return _parse_json(text)
 
-__all__ = ["LLMClient", "chat_text", "chat_json"]
+__all__ = ["LLMClient", "AsyncLLMClient", "chat_text", "chat_json", "chat_json_stream"]
@@ -0,0 +1,172 @@
+# utils/llm/partial_json.py
+# ------------------------------------------------------------
+# 목적: 스트리밍 중인(미완성) JSON 텍스트 → 지금까지 확정된 부분의 dict
+# - 열린 문자열/배열/객체를 닫아서 파싱, 미완성 토큰(키 일부, `tru`, `0.`, 끝의 `,`/`:`)은 잘라냄
+# - PartialJSON.feed(delta): 괄호/문자열 상태를 증분 갱신 후 스냅샷 반환
+#   · 문자열 값 이어쓰기(델타가 열린 문자열 안에서 끝남): 새 원문만 디코딩해 마지막 문자열 값 연장(재파싱 없음)
+#   · 값을 닫을 수 있는 델타(`,` `}` `]` `"` 포함)만 버퍼 전체 재파싱(O(버퍼)), 그 밖(숫자/리터럴 일부)은 스냅샷 유지
+# 사용:
+#   p = PartialJSON()
+#   for delta in chat(..., stream=True):
+#       snap = p.feed(delta)      # {"summary": "고객은 …"} → {"summary": "…", "top_products": [{…}]} …
+# ------------------------------------------------------------
+from __future__ import annotations
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+_PARTIAL_UNICODE = re.compile(r"\\u[0-9a-fA-F]{0,3}$")
+# 이어 붙이며 디코딩할 때 끝에 남겨 둘 미완성 이스케이프(\uXXX, 짝이 올 수 있는 상위 서로게이트 \uD8xx)
+_PENDING_UNICODE = re.compile(r"(\\u[dD][89abAB][0-9a-fA-F]{2})?\\u[0-9a-fA-F]{0,3}$|\\u[dD][89abAB][0-9a-fA-F]{2}$")
+_CLOSERS = frozenset('",}]')
+_CLOSE = {"{": "}", "[": "]"}
+
+
+def _scan(text: str, stack: List[str], in_str: bool, esc: bool) -> Tuple[List[str], bool, bool, int]:
+    """text를 이어서 읽으며 (열린 괄호 스택, 문자열 안 여부, 직전 역슬래시 여부,
+    text 안에서 마지막으로 열린 문자열의 내용 시작 위치(-1: 없음)) 갱신."""
+    opened = -1
+    for i, ch in enumerate(text):
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str, opened = True, i + 1
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]" and stack:
+            stack.pop()
+    return stack, in_str, esc, opened
+
+def _complete(text: str, stack: List[str], in_str: bool, esc: bool) -> str:
+    """현재 상태에서 닫는 문자열/괄호를 붙인 후보 텍스트."""
+    if in_str:
+        if esc:
+            text = text[:-1]
+        text = _PARTIAL_UNICODE.sub("", text) + '"'
+    text = text.rstrip()
+    if text.endswith(":"):
+        text += " null"
+    elif text.endswith(","):
+        text = text[:-1]
+    return text + "".join(_CLOSE[c] for c in reversed(stack))
+
+def parse_partial_json(text: str) -> Optional[Dict[str, Any]]:
+    """미완성 JSON 객체 텍스트 → dict (아직 '{'가 없으면 None)."""
+    start = text.find("{")
+    if start < 0:
+        return None
+    s = text[start:]
+    # 완성 후보가 깨지면 끝에서 한 글자씩 줄여 재시도(미완성 키/리터럴은 보통 몇 글자)
+    while s:
+        stack, in_str, esc, _ = _scan(s, [], False, False)
+        try:
+            out = json.loads(_complete(s, stack, in_str, esc))
+            return out if isinstance(out, dict) else None
+        except ValueError:
+            s = s[:-1]
+    return None
+
+
+def _last_leaf(node: Any) -> Any:
+    """가장 깊은 마지막 값(열린 문자열 값은 항상 이 위치)."""
+    while isinstance(node, (dict, list)) and node:
+        node = node[next(reversed(node))] if isinstance(node, dict) else node[-1]
+    return node
+
+def _replace_last_leaf(node: Any, value: str) -> Any:
+    """경로상의 컨테이너만 얕은 복사해 마지막 값을 교체(이미 반환한 스냅샷은 그대로)."""
+    if isinstance(node, dict) and node:
+        k = next(reversed(node))
+        return {**node, k: _replace_last_leaf(node[k], value)}
+    if isinstance(node, list) and node:
+        return node[:-1] + [_replace_last_leaf(node[-1], value)]
+    return value
+
+
+class PartialJSON:
+    """
+    스트림 델타를 누적하며 파싱. 상태를 증분 유지해 흔한 경우(문자열 값 이어쓰기)는 재스캔/재파싱 없음.
+    열린 문자열 모드: key(닫힐 때까지 스냅샷 불변) | value(마지막 값만 연장) | reparse(매 델타 재파싱, 안전 폴백)
+    """
+    def __init__(self) -> None:
+        self.text = ""
+        self._stack: List[str] = []
+        self._in_str = False
+        self._esc = False
+        self._started = False
+        self._str_mode: Optional[str] = None
+        self._str_pos = 0          # 열린 문자열 값에서 아직 디코딩하지 않은 원문 시작 위치(self.text 기준)
+        self._str_val = ""         # 열린 문자열 값의 디코딩된 앞부분
+        self.value: Optional[Dict[str, Any]] = None
+
+    def feed(self, delta: str) -> Optional[Dict[str, Any]]:
+        if not delta:
+            return self.value
+        self.text += delta
+        if not self._started:
+            start = self.text.find("{")
+            if start < 0:
+                return None
+            self.text, delta, self._started = self.text[start:], self.text[start:], True
+        base = len(self.text) - len(delta)
+        was_str = self._in_str
+        self._stack, self._in_str, self._esc, opened = _scan(delta, self._stack, self._in_str, self._esc)
+        if was_str and self._in_str and opened < 0:          # 같은 문자열 안에서만 이어짐
+            if self._str_mode == "key":
+                return self.value
+            if self._str_mode == "value" and self._extend():
+                self.value = _replace_last_leaf(self.value, self._str_val)
+                return self.value
+        elif not _CLOSERS.intersection(delta):              # 닫힌 값 없음 → 스냅샷 유지
+            return self.value
+        self._reparse()
+        if self._in_str and opened >= 0:
+            self._open_string(base + opened)
+        return self.value
+
+    def _reparse(self) -> None:
+        try:
+            out = json.loads(_complete(self.text, list(self._stack), self._in_str, self._esc))
+            snap = out if isinstance(out, dict) else None
+        except ValueError:
+            snap = parse_partial_json(self.text)
+        if snap is not None:
+            self.value = snap
+
+    def _open_string(self, pos: int) -> None:
+        """새로 열린 문자열이 키인지 값인지 판정하고, 값이면 이어쓰기 상태 준비(재파싱 결과와 대조)."""
+        prev = self.text[:pos - 1].rstrip()[-1:]
+        is_value = prev in (":", "[") or (prev == "," and self._stack[-1:] == ["["])
+        self._str_mode, self._str_pos, self._str_val = "key", pos, ""
+        if is_value:
+            ok = self._extend() and isinstance(self.value, dict) and _last_leaf(self.value) == self._str_val
+            self._str_mode = "value" if ok else "reparse"
+
+    def _extend(self) -> bool:
+        """열린 문자열 값의 새 원문을 디코딩해 이어 붙임(미완성 이스케이프는 다음 델타로). 실패하면 reparse 모드."""
+        raw = self.text[self._str_pos:]
+        pending = _PENDING_UNICODE.search(raw)
+        head = raw[:pending.start()] if pending is not None else ""
+        if pending is not None and (len(head) - len(head.rstrip("\\"))) % 2 == 0:
+            raw = head                          # 앞의 역슬래시가 짝수 개 → 이 \u는 이스케이프 시작
+        elif self._esc:
+            raw = raw[:-1]
+        try:
+            self._str_val += json.loads(f'"{raw}"')
+        except ValueError:
+            self._str_mode = "reparse"
+            return False
+        self._str_pos += len(raw)
+        return True
+
+    def final(self) -> Dict[str, Any]:
+        """스트림 종료 후 전체 파싱(실패 시 chat_json과 같이 {"raw": text})."""
+        try:
+            return json.loads(self.text)
+        except ValueError:
+            return {"raw": self.text}
@@ -0,0 +1,136 @@
+# utils/llm/reco_cache.py
+# ------------------------------------------------------------
+# 목적: LLM 추천 결과 영구 캐시(SQLite) — 같은 입력의 재조회/재실행 시 네트워크 호출 0회
+# - 키: sha256(fn + 프롬프트 입력 지문 + 모델명 + PROMPT_VERSION)
+#   (고객: 렌더링된 프롬프트 메시지 전체 — 원본 값이 요약에 들어가므로, 세그먼트: 코드 + 통계)
+# - TTL(RECO_CACHE_TTL_S, 기본 7일) 경과 항목은 조회 시 만료 처리
+# - LRU: 항목 수가 RECO_CACHE_MAX(기본 5000)를 넘으면 마지막 조회가 오래된 순으로 삭제
+# - 파일: RECO_CACHE_PATH(기본 assets/logs/reco_cache.sqlite), RECO_CACHE=0 이면 비활성
+# 사용: python -m utils.llm.reco_cache stats | purge | clear
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.perf import metrics
+
+_APP_ROOT = Path(__file__).resolve().parents[2]     # .../3-application
+CACHE_PATH = Path(os.getenv("RECO_CACHE_PATH", str(_APP_ROOT / "assets" / "logs" / "reco_cache.sqlite")))
+TTL_S = float(os.getenv("RECO_CACHE_TTL_S", str(7 * 24 * 3600)))
+MAX_ENTRIES = int(os.getenv("RECO_CACHE_MAX", "5000"))
+ENABLED = os.getenv("RECO_CACHE", "true").lower() in ("1", "true", "yes")
+
+CACHE_REQUESTS = metrics.counter("llm_reco_cache_requests", "추천 캐시 조회(result=hit|miss|expired)",
+                                 ["fn", "result"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reco_cache (
+    key         TEXT PRIMARY KEY,
+    fn          TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_reco_cache_accessed ON reco_cache (accessed_at);
+"""
+
+
+def fingerprint(fn: str, inputs: Dict[str, Any], *, model: str, version: str) -> str:
+    """프롬프트 입력 → 캐시 키(키 순서/부동소수 표기와 무관하게 안정적)."""
+    payload = json.dumps({"fn": fn, "inputs": inputs, "model": model, "version": version},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecoCache:
+    """SQLite 기반 TTL + LRU 캐시. 스레드/프로세스 간 공유(스레드별 연결, WAL)."""
+    def __init__(self, path: Path = CACHE_PATH, ttl_s: float = TTL_S, max_entries: int = MAX_ENTRIES) -> None:
+        self.path, self.ttl_s, self.max_entries = Path(path), float(ttl_s), int(max_entries)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, fn: str = "") -> Optional[Dict[str, Any]]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT value, created_at FROM reco_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            CACHE_REQUESTS.inc(fn=fn, result="miss")
+            return None
+        if now - row[1] > self.ttl_s:
+            conn.execute("DELETE FROM reco_cache WHERE key = ?", (key,))
+            CACHE_REQUESTS.inc(fn=fn, result="expired")
+            return None
+        conn.execute("UPDATE reco_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        CACHE_REQUESTS.inc(fn=fn, result="hit")
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any], fn: str = "") -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO reco_cache (key, fn, value, created_at, accessed_at) "
+                     "VALUES (?, ?, ?, ?, ?)", (key, fn, json.dumps(value, ensure_ascii=False), now, now))
+        self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (n,) = conn.execute("SELECT COUNT(*) FROM reco_cache").fetchone()
+        if n > self.max_entries:
+            conn.execute("DELETE FROM reco_cache WHERE key IN "
+                         "(SELECT key FROM reco_cache ORDER BY accessed_at ASC LIMIT ?)", (n - self.max_entries,))
+
+    def purge_expired(self) -> int:
+        cur = self._conn().execute("DELETE FROM reco_cache WHERE created_at < ?", (time.time() - self.ttl_s,))
+        return cur.rowcount
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM reco_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._conn().execute("SELECT fn, COUNT(*), MIN(created_at) FROM reco_cache GROUP BY fn").fetchall()
+        return {"path": str(self.path), "ttl_s": self.ttl_s, "max_entries": self.max_entries,
+                "entries": {fn: n for fn, n, _ in rows},
+                "oldest_age_s": round(time.time() - min(r[2] for r in rows), 1) if rows else None}
+
+
+_CACHE: Optional[RecoCache] = None
+_LOCK = threading.Lock()
+
+def get_cache() -> Optional[RecoCache]:
+    """프로세스 공용 캐시(RECO_CACHE=0 이면 None)."""
+    global _CACHE
+    if not ENABLED:
+        return None
+    with _LOCK:
+        if _CACHE is None:
+            _CACHE = RecoCache()
+        return _CACHE
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = RecoCache()
+    if cmd == "stats":
+        print(json.dumps(cache.stats(), ensure_ascii=False, indent=2))
+    elif cmd == "purge":
+        print(f"[INFO] 만료 항목 삭제: {cache.purge_expired()}건")
+    elif cmd == "clear":
+        cache.clear()
+        print(f"[INFO] 캐시 비움: {cache.path}")
+    else:
+        print("사용: python -m utils.llm.reco_cache stats|purge|clear")
+        sys.exit(2)
@@ -1,14 +1,26 @@
 # 3-application/utils/llm/reco_templates.py
 from __future__ import annotations
 import os
-from typing import Dict, Any, List, Tuple
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 # LLM 호출 (JSON 보장)
-from utils.llm.llm_client import chat_json, chat_text  # ← 중요
+from utils.llm.llm_client import chat_json, chat_json_stream, chat_text, current_model  # ← 중요
+from utils.llm.reco_cache import fingerprint, get_cache
+from utils.perf import metrics
+
+LLM_REQUESTS = metrics.counter("llm_requests", "추천 요청 수(outcome=llm|cache|fallback, reason=no_key|error)",
+                               ["fn", "outcome", "reason"])
+LLM_SECONDS = metrics.histogram("llm_request_seconds", "LLM 호출 지연(초, 실패 포함)", ["fn"])
 
 # LLM 키가 없으면 룰베이스 폴백 사용
 USE_LLM = bool(os.getenv("OPENAI_API_KEY"))
 
+# 프롬프트/스키마를 바꾸면 올릴 것 → 이전 버전 캐시 항목은 자연히 미스(TTL/LRU로 정리)
+PROMPT_VERSION = "v1"
+
 # ───────────────────────────────────────────────────────────────
 # 카탈로그(필요하면 SKU/혜택/제한조건 등 상세 확장 가능)
 PRODUCT_CATALOG = [
@@ -84,48 +96,102 @@ def derive_flags(row: Dict[str, Any]) -> Dict[str, Any]:
 
 # ───────────────────────────────────────────────────────────────
 # 결정 규칙: 상품 코드 선택(순서=우선순위). 최대 3개 추천.
-def select_products(row: Dict[str, Any]) -> List[str]:
-    f = derive_flags(row)
-    out: List[str] = []
-
-    def add(code: str):
-        if code in _catalog_map and code not in out and len(out) < 3:
-            out.append(code)
-
+# (위험도, 코드, 조건, 근거) — 조건은 flags → bool 이며 스칼라(dict)/벡터(DataFrame) 공용이므로
+# ==, !=, &, | 만 사용(not/and/or 금지). 앞 규칙에서 이미 고른 코드/3개 초과는 건너뜀.
+_ALWAYS = lambda f: True
+PRODUCT_RULES: List[Tuple[str, str, Any, str]] = [
     # 1) 위험도가 높을수록 유지/활성화/혜택 중심
-    if f["risk"] == "HIGH":
-        add("CHK_FREE")                                # 수수료 면제 → 유지
-        if f["few_products"] or f["inactive"]:
-            add("SAV_PLUS")                            # 자동저축으로 재방문 유도
-        if f["credit_band"] != "low":
-            add("CRD_CASH")                            # 생활비 캐시백(가맹점 혜택)
-        if len(out) < 3 and f["credit_band"] == "mid":
-            add("LOAN_PL")                             # 유동성 니즈 대응(중금리)
-        if len(out) < 3 and f["has_card"]:
-            add("INS_SAFE")                            # 번들로 이탈방지(보장)
-
-    elif f["risk"] == "MEDIUM":
-        if f["inactive"]:
-            add("CHK_FREE")
-        if f["few_products"]:
-            add("SAV_PLUS")
-        if f["high_balance"] or f["high_income"]:
-            add("SAV_HIGH")
-        if f["credit_band"] != "low" and len(out) < 3:
-            add("CRD_CASH")
-
-    else:  # LOW
-        if f["high_balance"]:
-            add("SAV_HIGH")
-        add("WEALTH_ETF")                              # 소액 ETF 적립(업셀링)
-        if f["credit_band"] != "low":
-            # 여행/혜택형은 성인~장년층 위주
-            add("CRD_TRAVEL" if f["age_band"] in ("adult", "mature") else "CRD_CASH")
-        if len(out) < 3 and f["few_products"]:
-            add("SAV_PLUS")
+    ("HIGH",   "CHK_FREE",   _ALWAYS,                                          "수수료 면제로 주거래 유지"),
+    ("HIGH",   "SAV_PLUS",   lambda f: f["few_products"] | f["inactive"],      "자동저축으로 재방문 유도"),
+    ("HIGH",   "CRD_CASH",   lambda f: f["credit_band"] != "low",              "생활비 캐시백(가맹점 혜택)"),
+    ("HIGH",   "LOAN_PL",    lambda f: f["credit_band"] == "mid",              "유동성 니즈 대응(중금리)"),
+    ("HIGH",   "INS_SAFE",   lambda f: f["has_card"],                          "보장 번들로 이탈 방지"),
+
+    ("MEDIUM", "CHK_FREE",   lambda f: f["inactive"],                          "비활동 고객 재활성화"),
+    ("MEDIUM", "SAV_PLUS",   lambda f: f["few_products"],                      "보유상품 확대(소액저축)"),
+    ("MEDIUM", "SAV_HIGH",   lambda f: f["high_balance"] | f["high_income"],   "고잔액/고소득 금리우대"),
+    ("MEDIUM", "CRD_CASH",   lambda f: f["credit_band"] != "low",              "생활비 캐시백(가맹점 혜택)"),
+
+    ("LOW",    "SAV_HIGH",   lambda f: f["high_balance"],                      "고잔액 금리우대"),
+    ("LOW",    "WEALTH_ETF", _ALWAYS,                                          "소액 ETF 적립(업셀링)"),
+    # 여행/혜택형은 성인~장년층 위주
+    ("LOW",    "CRD_TRAVEL", lambda f: (f["credit_band"] != "low") & ((f["age_band"] == "adult") | (f["age_band"] == "mature")),
+                                                                               "여행 리워드(성인~장년층)"),
+    ("LOW",    "CRD_CASH",   lambda f: (f["credit_band"] != "low") & (f["age_band"] != "adult") & (f["age_band"] != "mature"),
+                                                                               "생활비 캐시백(가맹점 혜택)"),
+    ("LOW",    "SAV_PLUS",   lambda f: f["few_products"],                      "보유상품 확대(소액저축)"),
+]
+MAX_PRODUCTS = 3
 
+def select_products_with_reasons(row: Dict[str, Any]) -> List[Tuple[str, str]]:
+    f = derive_flags(row)
+    out: List[Tuple[str, str]] = []
+    for risk, code, cond, reason in PRODUCT_RULES:
+        if risk != f["risk"] or len(out) >= MAX_PRODUCTS or code in (c for c, _ in out):
+            continue
+        if code in _catalog_map and cond(f):
+            out.append((code, reason))
     return out
 
+def select_products(row: Dict[str, Any]) -> List[str]:
+    return [code for code, _ in select_products_with_reasons(row)]
+
+# ───────────────────────────────────────────────────────────────
+# 벡터화 버전(배치 사전계산: service/reco_batch.py) — 위 스칼라 규칙과 결과 동일
+def derive_flags_frame(df):
+    """고객 DataFrame(원본 컬럼 + churn_probability) → 파생 플래그 DataFrame(derive_flags와 같은 키).
+    밴드는 Categorical(비교가 정수 코드 연산이라 규칙 평가가 빠름)."""
+    import numpy as np
+    import pandas as pd
+
+    def num(col: str):
+        s = df[col] if col in df.columns else pd.Series(0, index=df.index)
+        return pd.to_numeric(s, errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    def band(conds, labels):
+        return pd.Categorical.from_codes(np.select(conds, range(len(conds)), len(conds)), categories=labels)
+
+    churn, cs, age = num("churn_probability"), num("CreditScore"), num("Age")
+    return pd.DataFrame({
+        "risk": band([churn >= CHURN_TH_HIGH, churn >= CHURN_TH_MED], ["HIGH", "MEDIUM", "LOW"]),
+        "credit_band": band([cs < CREDIT_LOW, cs < CREDIT_MID], ["low", "mid", "high"]),
+        "age_band": band([age < AGE_YOUNG, age < AGE_ADULT, age < AGE_MATURE],
+                         ["youth", "adult", "mature", "senior"]),
+        "high_balance": num("Balance") >= BAL_HIGH,
+        "high_income": num("EstimatedSalary") >= SAL_HIGH,
+        "inactive": num("IsActiveMember").astype(int) == 0,
+        "has_card": num("HasCrCard").astype(int) == 1,
+        "few_products": num("NumOfProducts").astype(int) <= 1,
+    }, index=df.index)
+
+def select_products_frame(df, flags=None):
+    """고객 DataFrame → product_1..3 / reason_1..3 (빈 칸은 None). 규칙 단위로 전체 행을 한 번에 평가."""
+    import numpy as np
+    import pandas as pd
+
+    f = derive_flags_frame(df) if flags is None else flags
+    n = len(f)
+    rules = [r for r in PRODUCT_RULES if r[1] in _catalog_map]
+    slots = np.full((n, MAX_PRODUCTS), -1, dtype=np.int16)     # 규칙 번호(-1 = 빈 칸)
+    count = np.zeros(n, dtype=np.int8)
+    taken = np.zeros(n, dtype=np.int64)                         # 이미 고른 코드 비트마스크
+    code_bit = {c: np.int64(1) << i for i, c in enumerate(_catalog_map)}
+    for i, (rule_risk, code, cond, _) in enumerate(rules):
+        hit = np.asarray(cond(f), dtype=bool) & np.asarray(f["risk"] == rule_risk)
+        hit &= (count < MAX_PRODUCTS) & ((taken & code_bit[code]) == 0)
+        rows = np.flatnonzero(hit)
+        slots[rows, count[rows]] = i
+        count[rows] += 1
+        taken[rows] |= code_bit[code]
+    codes = np.array([r[1] for r in rules] + [None], dtype=object)    # -1 → 마지막(None)
+    reasons = np.array([r[3] for r in rules] + [None], dtype=object)
+    out = {}
+    for k in range(MAX_PRODUCTS):
+        out[f"product_{k + 1}"] = codes[slots[:, k]]
+    for k in range(MAX_PRODUCTS):
+        out[f"reason_{k + 1}"] = reasons[slots[:, k]]
+    return pd.DataFrame(out, index=f.index)
+
 # 세그먼트 기본 번들 (집합 추천) — DB의 segment_code 기준
 SEGMENT_BUNDLES = {
     "VIP":     ["WEALTH_ETF", "SAV_HIGH", "CRD_TRAVEL"],
@@ -272,8 +338,7 @@ SEG_SCHEMA = {
 def _fallback_user(row: Dict[str, Any]) -> Dict[str, Any]:
     # 간단 룰베이스(LLM 키 없거나 에러 시)
     risk = derive_flags(row)["risk"]
-    chosen = select_products(row)
-    tops = [{"code": c, "reason": "정책 기반 추천"} for c in chosen]
+    tops = [{"code": c, "reason": r} for c, r in select_products_with_reasons(row)]
     return {
         "risk_level": risk,
         "summary": "기본 정책에 따른 추천입니다.",
@@ -281,6 +346,19 @@ def _fallback_user(row: Dict[str, Any]) -> Dict[str, Any]:
         "next_actions": ["담당자 상담 연결", "앱에서 바로 신청 유도"]
     }
 
+def reco_from_row(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """사전계산 테이블(customer_reco) 1행 → _fallback_user와 같은 형태(상세 패널에서 규칙 재계산 없이 사용)."""
+    def txt(v):   # DB NULL / pandas NaN → None
+        return v if isinstance(v, str) and v else None
+    tops = [{"code": txt(rec.get(f"product_{k}")), "reason": txt(rec.get(f"reason_{k}")) or "정책 기반 추천"}
+            for k in range(1, MAX_PRODUCTS + 1) if txt(rec.get(f"product_{k}"))]
+    return {
+        "risk_level": rec.get("risk_level", "N/A"),
+        "summary": "기본 정책에 따른 추천입니다.",
+        "top_products": tops,
+        "next_actions": ["담당자 상담 연결", "앱에서 바로 신청 유도"]
+    }
+
 def _fallback_segment(segment_code: str) -> Dict[str, Any]:
     bundle = SEGMENT_BUNDLES.get(segment_code.upper(), ["SAV_PLUS", "CRD_CASH", "CHK_FREE"])
     return {
@@ -290,18 +368,203 @@ def _fallback_segment(segment_code: str) -> Dict[str, Any]:
         "playbook": ["표준 오퍼 발송", "A/B 테스트로 캠페인 최적화"]
     }
 
+# ───────────────────────────────────────────────────────────────
+# 영구 캐시 키: 프롬프트를 결정하는 입력 전체 사용(단건/일괄 공용 → 서로 캐시 공유)
+def _user_cache_key(row: Dict[str, Any]) -> str:
+    # 사용자 프롬프트에 원본 값(나이/잔액/확률 등)이 들어가고 요약이 이를 인용 → 플래그만으로는 고객 간 충돌
+    return fingerprint("user", {"messages": build_user_messages(row)},
+                       model=current_model(), version=PROMPT_VERSION)
+
+def _segment_cache_key(segment_code: str, stats: Dict[str, Any]) -> str:
+    return fingerprint("segment", {"segment": segment_code, "stats": stats},
+                       model=current_model(), version=PROMPT_VERSION)
+
+def _cache_get(key: Optional[str], fn: str) -> Optional[Dict[str, Any]]:
+    cache = get_cache() if key else None
+    if cache is None:
+        return None
+    try:
+        return cache.get(key, fn=fn)
+    except Exception:
+        return None        # 캐시 장애는 미스로 취급(추천 자체는 계속)
+
+def _cache_put(key: Optional[str], out: Dict[str, Any], fn: str) -> None:
+    cache = get_cache() if key else None
+    if cache is None or "raw" in out:      # JSON 파싱 실패 응답은 저장하지 않음
+        return
+    try:
+        cache.put(key, out, fn=fn)
+    except Exception:
+        pass
+
+def _with_fallback(fn: str, call, fallback, key: Optional[str] = None) -> Dict[str, Any]:
+    """LLM 호출(+영구 캐시) + 지연/폴백 지표 기록. 키가 없거나 에러면 정책 기반 폴백(캐시 안 함)."""
+    if not USE_LLM:
+        LLM_REQUESTS.inc(fn=fn, outcome="fallback", reason="no_key")
+        return fallback()
+    hit = _cache_get(key, fn)
+    if hit is not None:
+        LLM_REQUESTS.inc(fn=fn, outcome="cache", reason="")
+        return hit
+    t0 = time.perf_counter()
+    try:
+        out = call()
+        LLM_REQUESTS.inc(fn=fn, outcome="llm", reason="")
+        _cache_put(key, out, fn)
+        return out
+    except Exception:
+        LLM_REQUESTS.inc(fn=fn, outcome="fallback", reason="error")
+        return fallback()
+    finally:
+        LLM_SECONDS.observe(time.perf_counter() - t0, fn=fn)
+
 def recommend_for_user(row: Dict[str, Any]) -> Dict[str, Any]:
+    return _with_fallback("recommend_for_user",
+                          lambda: chat_json(build_user_messages(row), schema=USER_SCHEMA),
+                          lambda: _fallback_user(row),
+                          key=_user_cache_key(row))
+
+_RISK_LEVELS = ("LOW", "MEDIUM", "HIGH")
+
+def _merge_partial_user(base: Dict[str, Any], part: Dict[str, Any]) -> Dict[str, Any]:
+    """규칙 기반 카드(base) 위에 스트리밍 중인 LLM 부분 결과를 덮어씀(완성된 필드만)."""
+    out = dict(base)
+    if isinstance(part.get("summary"), str) and part["summary"]:
+        out["summary"] = part["summary"]
+    if part.get("risk_level") in _RISK_LEVELS:          # "HI" 같은 미완성 값은 무시
+        out["risk_level"] = part["risk_level"]
+    reasons = {p.get("code"): p.get("reason") for p in part.get("top_products") or [] if isinstance(p, dict)}
+    out["top_products"] = [{"code": t["code"], "reason": reasons.get(t["code"]) or t["reason"]}
+                           for t in base["top_products"]]
+    acts = [a for a in part.get("next_actions") or [] if isinstance(a, str) and a]
+    if acts:
+        out["next_actions"] = acts
+    return out
+
+def recommend_for_user_stream(row: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    recommend_for_user의 스트리밍 버전. yield 순서:
+    1) 규칙 기반 카드(즉시, summary="" → LLM 요약 대기) 2) LLM 부분 결과를 덮어쓴 중간 상태들
+    3) 최종 결과(recommend_for_user와 동일: LLM 전체 응답 / 캐시 / 폴백). 각 dict의 "done"은 최종 여부.
+    """
+    fn = "recommend_for_user"
+    fallback = _fallback_user(row)
     if not USE_LLM:
-        return _fallback_user(row)
+        LLM_REQUESTS.inc(fn=fn, outcome="fallback", reason="no_key")
+        yield dict(fallback, done=True)
+        return
+    key = _user_cache_key(row)
+    hit = _cache_get(key, fn)
+    if hit is not None:
+        LLM_REQUESTS.inc(fn=fn, outcome="cache", reason="")
+        yield dict(hit, done=True)
+        return
+
+    base = dict(fallback, summary="", done=False)
+    yield base
+    t0 = time.perf_counter()
     try:
-        return chat_json(build_user_messages(row), schema=USER_SCHEMA)
+        stream = chat_json_stream(build_user_messages(row), schema=USER_SCHEMA)
+        while True:
+            try:
+                part = next(stream)
+            except StopIteration as stop:
+                out = stop.value
+                break
+            yield _merge_partial_user(base, part)
+        LLM_REQUESTS.inc(fn=fn, outcome="llm", reason="")
+        _cache_put(key, out, fn)
     except Exception:
-        return _fallback_user(row)
+        LLM_REQUESTS.inc(fn=fn, outcome="fallback", reason="error")
+        out = fallback
+    finally:
+        LLM_SECONDS.observe(time.perf_counter() - t0, fn=fn)
+    yield dict(out, done=True)
 
 def recommend_for_segment(segment_code: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+    return _with_fallback("recommend_for_segment",
+                          lambda: chat_json(build_segment_messages(segment_code, stats), schema=SEG_SCHEMA),
+                          lambda: _fallback_segment(segment_code),
+                          key=_segment_cache_key(segment_code, stats))
+
+
+# ───────────────────────────────────────────────────────────────
+# 일괄 추천(비동기 fan-out): 동시 요청 상한/재시도/타임아웃은 AsyncLLMClient가 담당,
+# 캐시 히트는 호출 없이 채우고, 항목별로 실패하면 그 항목만 정책 기반 폴백(결과 순서 = 입력 순서)
+async def _abulk(fn: str, items: List[Any], build, schema: Dict[str, Any], fallback, key_of,
+                 max_concurrency: Optional[int]) -> List[Dict[str, Any]]:
     if not USE_LLM:
-        return _fallback_segment(segment_code)
+        for _ in items:
+            LLM_REQUESTS.inc(fn=fn, outcome="fallback", reason="no_key")
+        return [fallback(it) for it in items]
+
+    keys = [key_of(it) for it in items]
+    results: List[Optional[Dict[str, Any]]] = [_cache_get(k, fn) for k in keys]
+    for r in results:
+        if r is not None:
+            LLM_REQUESTS.inc(fn=fn, outcome="cache", reason="")
+    todo = [i for i, r in enumerate(results) if r is None]
+    if not todo:
+        return results  # type: ignore[return-value]
+
+    from utils.llm.llm_client import AsyncLLMClient
     try:
-        return chat_json(build_segment_messages(segment_code, stats), schema=SEG_SCHEMA)
+        client = AsyncLLMClient(max_concurrency=max_concurrency)
     except Exception:
-        return _fallback_segment(segment_code)
+        for i in todo:
+            LLM_REQUESTS.inc(fn=fn, outcome="fallback", reason="error")
+            results[i] = fallback(items[i])
+        return results  # type: ignore[return-value]
+
+    async def one(i: int) -> Dict[str, Any]:
+        it = items[i]
+        t0 = time.perf_counter()
+        try:
+            out = await client.chat_json(build(it), schema=schema)
+            LLM_REQUESTS.inc(fn=fn, outcome="llm", reason="")
+            _cache_put(keys[i], out, fn)
+            return out
+        except Exception:
+            LLM_REQUESTS.inc(fn=fn, outcome="fallback", reason="error")
+            return fallback(it)
+        finally:
+            LLM_SECONDS.observe(time.perf_counter() - t0, fn=fn)
+
+    async with client:
+        outs = await asyncio.gather(*(one(i) for i in todo))
+    for i, out in zip(todo, outs):
+        results[i] = out
+    return results  # type: ignore[return-value]
+
+def _run(coro):
+    """동기 코드에서 코루틴 실행. 이미 이벤트 루프가 돌고 있으면(노트북 등) 별도 스레드에서 실행."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
+
+async def arecommend_for_users_bulk(rows: List[Dict[str, Any]],
+                                    max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+    return await _abulk("recommend_for_users_bulk", list(rows), build_user_messages, USER_SCHEMA,
+                        _fallback_user, _user_cache_key, max_concurrency)
+
+def recommend_for_users_bulk(rows: List[Dict[str, Any]],
+                             max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+    """고객 여러 명 추천을 동시에 요청(recommend_for_user의 일괄 버전)."""
+    return _run(arecommend_for_users_bulk(rows, max_concurrency))
+
+async def arecommend_for_segments_bulk(segments: Dict[str, Dict[str, Any]],
+                                       max_concurrency: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    items = list(segments.items())
+    outs = await _abulk("recommend_for_segments_bulk", items,
+                        lambda it: build_segment_messages(it[0], it[1]), SEG_SCHEMA,
+                        lambda it: _fallback_segment(it[0]),
+                        lambda it: _segment_cache_key(it[0], it[1]), max_concurrency)
+    return {code: out for (code, _), out in zip(items, outs)}
+
+def recommend_for_segments_bulk(segments: Dict[str, Dict[str, Any]],
+                                max_concurrency: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """{세그먼트 코드: 통계} → {세그먼트 코드: 추천} (recommend_for_segment의 일괄 버전)."""
+    return _run(arecommend_for_segments_bulk(segments, max_concurrency))
@@ -0,0 +1,5 @@
+from .tracing import (
+    trace_run, span, traced, current_run, load_profile, summarize, span_depths, PROFILE_SUFFIX,
+)
+__all__ = ["trace_run", "span", "traced", "current_run", "load_profile", "summarize", "span_depths",
+           "PROFILE_SUFFIX"]
@@ -0,0 +1,427 @@
+# utils/perf/metrics.py
+# ------------------------------------------------------------
+# 목적: Prometheus 텍스트 포맷(0.0.4) 지표 — 외부 의존성/Prometheus 서버 없이 동작
+# - counter()/gauge()/histogram() : 프로세스 내 레지스트리(스레드 안전, 라벨 지원)
+# - flush()                       : 배치 작업(csv_to_db, full_scoring 등) → assets/logs/metrics/<job>.prom
+#                                   (textfile collector 방식, counter/histogram은 이전 실행분 누적 —
+#                                    <job>.prom.lock 파일 락 안에서 파일 값 + 직전 flush 이후 증가분만 더함
+#                                    → 같은 job 이름의 여러 프로세스가 서로의 증가분을 덮어쓰지 않음)
+# - start_http_server(port)       : GET /metrics — 프로세스 내 지표 + 다른 작업의 .prom 파일 병합
+# - CLI: python -m utils.perf.metrics serve --port 9108 | show
+# - METRICS_ENABLED=0 이면 기록/파일 쓰기 생략
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import re
+import sys
+import time
+import atexit
+import bisect
+import threading
+import contextlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_APP_ROOT = Path(__file__).resolve().parents[2]     # .../3-application
+METRICS_DIR = Path(os.getenv("METRICS_DIR", str(_APP_ROOT / "assets" / "logs" / "metrics")))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFIX = "bcms_"
+
+# 초 단위 지연(5ms ~ 10분)
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _fmt(v: float) -> str:
+    v = float(v)
+    if v == float("inf"):
+        return "+Inf"
+    return str(int(v)) if v.is_integer() and abs(v) < 1e15 else repr(v)
+
+def _labels_str(key: LabelKey) -> str:
+    if not key:
+        return ""
+    esc = lambda s: str(s).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in key) + "}"
+
+
+class _Metric:
+    kind = ""
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name if name.startswith(PREFIX) else PREFIX + name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"[ERROR] {self.name} 라벨 불일치: {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple((k, str(labels[k])) for k in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        raise NotImplementedError
+
+    def value(self, **labels: Any) -> Any:
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+
+class Counter(_Metric):
+    kind = "counter"
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if not ENABLED:
+            return
+        if amount < 0:
+            raise ValueError("[ERROR] counter는 감소할 수 없습니다.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name + "_total", k, v) for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    def set(self, value: float, **labels: Any) -> None:
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, k, v) for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            st = self._values.get(key)
+            if st is None:
+                st = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            st["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            st["sum"] += value
+            st["count"] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def samples(self):
+        out = []
+        with self._lock:
+            for key, st in self._values.items():
+                cum = 0
+                for le, c in zip(self.buckets + (float("inf"),), st["counts"]):
+                    cum += c
+                    out.append((self.name + "_bucket", key + (("le", _fmt(le)),), float(cum)))
+                out.append((self.name + "_sum", key, st["sum"]))
+                out.append((self.name + "_count", key, float(st["count"])))
+        return out
+
+
+# ─────────────────────────────────────────────
+# 레지스트리
+# ─────────────────────────────────────────────
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)$')
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._flushed: Dict[str, float] = {}   # 직전 flush 때 파일에 반영한 counter/histogram 값(샘플별)
+
+    def _get(self, cls, name: str, doc: str, labelnames: Sequence[str], **kw) -> Any:
+        full = name if name.startswith(PREFIX) else PREFIX + name
+        with self._lock:
+            m = self._metrics.get(full)
+            if m is None:
+                m = self._metrics[full] = cls(full, doc, labelnames, **kw)
+            elif not isinstance(m, cls) or m.labelnames != tuple(labelnames):
+                raise ValueError(f"[ERROR] 지표 {full}가 다른 타입/라벨로 이미 등록되어 있습니다.")
+            return m
+
+    def counter(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, doc, labelnames)
+
+    def gauge(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, doc, labelnames)
+
+    def histogram(self, name: str, doc: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, doc, labelnames, buckets=buckets)
+
+    def render(self, job: Optional[str] = None, baseline: Optional[Dict[str, Dict[str, Any]]] = None,
+               flushed: Optional[Dict[str, float]] = None, snapshot: Optional[Dict[str, float]] = None) -> str:
+        """텍스트 포맷 출력. job이 주어지면 모든 샘플에 job 라벨 추가.
+        baseline(현재 .prom): counter/histogram은 값 누적, 이번에 안 건드린 샘플/지표는 그대로 유지.
+        flushed: 이미 baseline에 반영된 이 프로세스 값(빼고 더함). snapshot: 이번 counter/histogram 원값 기록용."""
+        baseline = baseline or {}
+        flushed = flushed or {}
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        seen = set()
+        for m in metrics:
+            samples = m.samples()
+            if not samples:
+                continue
+            seen.add(m.name)
+            old = baseline.get(m.name, {}).get("samples", {})
+            lines.append(f"# HELP {m.name} {m.doc}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            emitted = set()
+            for name, key, v in samples:
+                if job is not None:
+                    key = (("job", job),) + key
+                sample = name + _labels_str(key)
+                if m.kind != "gauge":
+                    if snapshot is not None:
+                        snapshot[sample] = v
+                    v += old.get(sample, 0.0) - flushed.get(sample, 0.0)
+                emitted.add(sample)
+                lines.append(f"{sample} {_fmt(v)}")
+            lines += [f"{k} {_fmt(v)}" for k, v in old.items() if k not in emitted]
+        for name, fam in baseline.items():
+            if name not in seen:
+                lines.append(f"# HELP {name} {fam['help']}")
+                lines.append(f"# TYPE {name} {fam['type']}")
+                lines += [f"{k} {_fmt(v)}" for k, v in fam["samples"].items()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def render_merged(self, path: Path, job: str) -> str:
+        """현재 .prom 파일 값 + 이 프로세스의 미반영 증가분(쓰기 없음, /metrics 실시간 노출용)."""
+        return self.render(job=job, baseline=_read_families(path), flushed=dict(self._flushed))
+
+    def write_textfile(self, path: Path, job: str) -> Path:
+        """파일 락 안에서 읽기 → 직전 flush 이후 증가분만 누적 → 원자적 쓰기(tmp → rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(path.with_suffix(".prom.lock")):
+            snapshot: Dict[str, float] = {}
+            text = self.render(job=job, baseline=_read_families(path), flushed=self._flushed, snapshot=snapshot)
+            tmp = path.with_suffix(f".prom.{os.getpid()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+            self._flushed.update(snapshot)
+        return path
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """프로세스 간 배타 락(service/jobs.py _FileLock과 같은 방식)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _read_families(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        return _parse_families(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def _parse_families(text: str) -> Dict[str, Dict[str, Any]]:
+    """노출 포맷 텍스트 → {지표명: {"help", "type", "samples": {sample_str: value}}} (순서 유지)."""
+    families: Dict[str, Dict[str, Any]] = {}
+    cur = None
+    for line in text.splitlines():
+        if line.startswith("# HELP ") or line.startswith("# TYPE "):
+            _, tag, name, *rest = line.split(" ", 3)
+            cur = families.setdefault(name, {"help": "", "type": "untyped", "samples": {}})
+            cur["help" if tag == "HELP" else "type"] = rest[0] if rest else ""
+            continue
+        m = _SAMPLE_RE.match(line)
+        if m and cur is not None:
+            try:
+                cur["samples"][m.group(1) + (m.group(2) or "")] = float(m.group(3))
+            except ValueError:
+                continue
+    return families
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+# ─────────────────────────────────────────────
+# textfile 내보내기 / 병합 / HTTP
+# ─────────────────────────────────────────────
+def _default_job() -> str:
+    return Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "python"
+
+_LAST_FLUSH: Dict[str, float] = {}
+def flush(job: Optional[str] = None, min_interval_s: float = 0.0) -> Optional[Path]:
+    """현재 프로세스 지표를 METRICS_DIR/<job>.prom 으로 저장(배치 작업 종료 시 호출).
+    min_interval_s: 상주 프로세스(Streamlit)에서 잦은 호출 시 쓰기 간격 제한."""
+    if not ENABLED:
+        return None
+    job = job or _default_job()
+    now = time.monotonic()
+    if min_interval_s and now - _LAST_FLUSH.get(job, -1e9) < min_interval_s:
+        return None
+    _LAST_FLUSH[job] = now
+    try:
+        return REGISTRY.write_textfile(METRICS_DIR / f"{job}.prom", job)
+    except OSError as e:
+        print(f"[WARN] metrics textfile 쓰기 실패: {e}")
+        return None
+
+_AUTO_FLUSH: Dict[str, bool] = {}
+def flush_at_exit(job: Optional[str] = None) -> None:
+    """프로세스 종료 시 1회 flush 등록(CLI 배치 작업용, 중복 등록 무시)."""
+    job = job or _default_job()
+    if ENABLED and not _AUTO_FLUSH.get(job):
+        _AUTO_FLUSH[job] = True
+        atexit.register(flush, job)
+
+def collect(include_live: bool = True, live_job: Optional[str] = None) -> str:
+    """METRICS_DIR/*.prom + (선택) 프로세스 내 지표를 하나의 노출 포맷으로 병합."""
+    families: Dict[str, Dict[str, Any]] = {}
+    def add(text: str) -> None:
+        for name, fam in _parse_families(text).items():
+            dst = families.setdefault(name, {"help": fam["help"], "type": fam["type"], "samples": {}})
+            dst["samples"].update(fam["samples"])
+    live_job = live_job or _default_job()
+    for p in sorted(METRICS_DIR.glob("*.prom")) if METRICS_DIR.exists() else []:
+        if include_live and p.stem == live_job:
+            continue                         # 살아있는 프로세스 값이 더 최신
+        try:
+            add(p.read_text(encoding="utf-8"))
+        except OSError:
+            continue
+    if include_live:
+        add(REGISTRY.render_merged(METRICS_DIR / f"{live_job}.prom", live_job))
+    lines: List[str] = []
+    for name, fam in families.items():
+        lines += [f"# HELP {name} {fam['help']}", f"# TYPE {name} {fam['type']}"]
+        lines += [f"{k} {_fmt(v)}" for k, v in fam["samples"].items()]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+_SERVER: Dict[str, Any] = {}
+def start_http_server(port: int = METRICS_PORT, addr: str = "127.0.0.1", job: Optional[str] = None):
+    """GET /metrics 데몬 스레드 서버(프로세스당 1회, 이미 떠 있거나 포트 사용 중이면 None)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    if not ENABLED or port in _SERVER:
+        return _SERVER.get(port)
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = collect(live_job=job).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):  # 접근 로그 생략
+            pass
+
+    try:
+        srv = ThreadingHTTPServer((addr, port), _Handler)
+    except OSError as e:
+        print(f"[WARN] metrics 서버 기동 실패({addr}:{port}): {e}")
+        _SERVER[port] = None
+        return None
+    threading.Thread(target=srv.serve_forever, name=f"metrics-{port}", daemon=True).start()
+    _SERVER[port] = srv
+    print(f"[METRICS] http://{addr}:{port}/metrics")
+    return srv
+
+
+# ─────────────────────────────────────────────
+# 요약(Prometheus 없이 로컬 확인용)
+# ─────────────────────────────────────────────
+def _samples(text: str) -> List[Tuple[str, Dict[str, str], float]]:
+    out = []
+    for line in text.splitlines():
+        m = _SAMPLE_RE.match(line)
+        if m:
+            labels = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', m.group(2) or ""))
+            out.append((m.group(1), labels, float(m.group(3))))
+    return out
+
+def summary(text: Optional[str] = None) -> Dict[str, Any]:
+    """파생 지표: 스코어링 rows/s, LLM 폴백율/평균 지연, 캐시 hit율, DB 쓰기 평균 지연."""
+    s = _samples(text if text is not None else collect())
+    def total(name, **match):
+        return sum(v for n, l, v in s if n == name and all(l.get(k) == x for k, x in match.items()))
+    def ratio(a, b):
+        return round(a / b, 4) if b else None
+    return {
+        "ingest_rows": total(PREFIX + "ingest_rows_total"),
+        "scoring_rows_per_s": ratio(total(PREFIX + "scoring_rows_total"), total(PREFIX + "scoring_seconds_sum")),
+        "db_write_avg_s": ratio(total(PREFIX + "db_write_seconds_sum"), total(PREFIX + "db_write_seconds_count")),
+        "llm_fallback_rate": ratio(total(PREFIX + "llm_requests_total", outcome="fallback"),
+                                   total(PREFIX + "llm_requests_total")),
+        "llm_avg_latency_s": ratio(total(PREFIX + "llm_request_seconds_sum"),
+                                   total(PREFIX + "llm_request_seconds_count")),
+        "cache_hit_ratio": ratio(total(PREFIX + "streamlit_cache_requests_total", result="hit"),
+                                 total(PREFIX + "streamlit_cache_requests_total")),
+    }
+
+
+if __name__ == "__main__":
+    import argparse, json
+    ap = argparse.ArgumentParser(description="BCMS 지표 노출(/metrics) 및 요약")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sp = sub.add_parser("serve", help=f"{METRICS_DIR}/*.prom 을 /metrics로 노출")
+    sp.add_argument("--port", type=int, default=METRICS_PORT)
+    sp.add_argument("--addr", default="127.0.0.1")
+    sub.add_parser("show", help="병합된 지표 출력 + 파생 요약")
+    args = ap.parse_args()
+    if args.cmd == "serve":
+        start_http_server(args.port, args.addr)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    else:
+        text = collect(include_live=False)
+        print(text or "[INFO] 기록된 지표 없음")
+        print(json.dumps(summary(text), ensure_ascii=False, indent=2))
@@ -0,0 +1,234 @@
+# utils/perf/page_profile.py
+# ------------------------------------------------------------
+# 목적: Streamlit 페이지 rerun 단위 구간 측정(옵트인 프로파일링 모드)
+# - 켜기: 환경변수 PAGE_PROFILE=1 또는 URL 쿼리 ?profile=1
+# - @profiled("data")           → 데이터 접근 함수 소요 기록
+# - @cache_data(ttl=60)         → st.cache_data 대체, hit/miss + 소요 기록
+# - with timer("chart", "이름"): → 차트 생성/렌더 구간 기록
+# - 결과: 사이드바 접이식 패널(이번 rerun + 누적 p50/p95), assets/logs/page_metrics.jsonl 누적
+# - 집계: python -m utils.perf.page_profile [--page user_list]
+# - 꺼져 있으면 기록/렌더 없이 원래 함수만 호출(캐시 hit/miss 카운터 지표만 항상 기록)
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import json
+import time
+import uuid
+import threading
+import functools
+import contextlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from utils.perf import metrics
+
+if TYPE_CHECKING:            # pandas는 패널/집계 시점에만 import(공통 사이드바 경유 페이지 시작 비용 절감)
+    import pandas as pd
+
+_APP_ROOT = Path(__file__).resolve().parents[2]     # .../3-application
+LOG_PATH = Path(os.getenv("PAGE_PROFILE_LOG", str(_APP_ROOT / "assets" / "logs" / "page_metrics.jsonl")))
+LOG_TAIL = 50_000              # 누적 집계 시 읽을 최근 로그 줄 수
+PANEL_REDRAW_S = 0.5           # 패널 재렌더 최소 간격(기록마다 그리면 rerun당 O(n²) 렌더가 측정에 섞임)
+_STATE_KEY = "_page_profile"
+_LOCAL = threading.local()     # 캐시 hit/miss 판정(세션별 스크립트 스레드)
+_LOG_LOCK = threading.Lock()
+CACHE_REQUESTS = metrics.counter("streamlit_cache_requests", "Streamlit 캐시 함수 호출(result=hit|miss)",
+                                 ["fn", "result"])
+
+
+def _st():
+    import streamlit as st
+    return st
+
+def enabled() -> bool:
+    if os.getenv("PAGE_PROFILE", "false").lower() in ("1", "true", "yes"):
+        return True
+    st = _st()
+    try:
+        qp = st.query_params.get("profile")
+    except AttributeError:  # 구버전 Streamlit
+        qp = (st.experimental_get_query_params().get("profile") or [None])[0]
+    except Exception:       # 스크립트 실행 컨텍스트 밖(CLI 등)
+        return False
+    return str(qp).lower() in ("1", "true", "yes")
+
+def _state() -> Optional[Dict[str, Any]]:
+    try:
+        return _st().session_state.get(_STATE_KEY)
+    except Exception:
+        return None
+
+
+# ─────────────────────────────────────────────
+# 기록
+# ─────────────────────────────────────────────
+def _append_log(rows: List[Dict[str, Any]]) -> None:
+    try:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with _LOG_LOCK, open(LOG_PATH, "a", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"[WARN] page metrics log 쓰기 실패: {e}")
+
+def begin(page: str) -> None:
+    """rerun 시작(공통 사이드바에서 호출). 직전 rerun의 총 소요를 로그에 남기고 패널 자리 확보."""
+    st = _st()
+    prev = st.session_state.get(_STATE_KEY)
+    if not enabled():
+        st.session_state.pop(_STATE_KEY, None)
+        return
+    if prev and prev["records"]:
+        # 마지막 기록 종료 시점까지를 직전 rerun의 총 소요로 간주(st.stop() 포함)
+        _append_log([{**prev["base"], "kind": "page", "name": "rerun_total", "ms": prev["last_end_ms"]}])
+    summary = summarize_log(page=page)      # 누적 집계는 rerun 시작 시 1회(측정 구간에서 제외)
+    state = {
+        "t0": time.perf_counter(),
+        "base": {"session": (prev or {}).get("base", {}).get("session") or uuid.uuid4().hex[:8],
+                 "run": uuid.uuid4().hex[:8], "page": page},
+        "records": [], "last_end_ms": 0.0, "depth": 0, "drawn_at": 0.0,
+        "summary": summary,
+    }
+    with st.sidebar:
+        state["panel"] = st.empty()
+    st.session_state[_STATE_KEY] = state
+    _render(state)
+
+def record(kind: str, name: str, ms: float, **attrs: Any) -> None:
+    state = _state()
+    if state is None:
+        return
+    end_ms = (time.perf_counter() - state["t0"]) * 1000
+    rec = {**state["base"], "ts": round(time.time(), 3), "kind": kind, "name": name,
+           "ms": round(ms, 2), "at_ms": round(end_ms - ms, 1), **attrs}
+    state["records"].append(rec)
+    state["last_end_ms"] = round(end_ms, 1)
+    _append_log([rec])
+    # 바깥 측정 구간이 열려 있으면 그리지 않고, 그 밖에서도 PANEL_REDRAW_S 간격으로만 갱신
+    now = time.perf_counter()
+    if state["depth"] == 0 and now - state["drawn_at"] >= PANEL_REDRAW_S:
+        _render(state)
+        state["drawn_at"] = time.perf_counter()
+        state["t0"] += state["drawn_at"] - now      # 패널 렌더 시간은 rerun 시계에서 제외
+
+@contextlib.contextmanager
+def timer(kind: str, name: str, **attrs: Any) -> Iterator[None]:
+    if _state() is None:
+        yield
+        return
+    state = _state()
+    state["depth"] += 1
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        state["depth"] -= 1
+        record(kind, name, (time.perf_counter() - t0) * 1000, **attrs)
+
+def profiled(kind: str = "data", name: Optional[str] = None):
+    """함수 호출 소요 기록 데코레이터(데이터 접근/변환 등)."""
+    def deco(fn):
+        label = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(kind, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def _cached(cache_decorator, kind: str, **cache_kwargs):
+    def deco(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _LOCAL.miss = True              # 본문이 실행되면 캐시 miss
+            return fn(*args, **kwargs)
+        cached_fn = cache_decorator(**cache_kwargs)(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _LOCAL.miss = False
+            state = _state()
+            if state is not None:
+                state["depth"] += 1
+            t0 = time.perf_counter()
+            try:
+                return cached_fn(*args, **kwargs)
+            finally:
+                CACHE_REQUESTS.inc(fn=fn.__name__, result="miss" if _LOCAL.miss else "hit")
+                if state is not None:
+                    state["depth"] -= 1
+                    record(kind, fn.__name__, (time.perf_counter() - t0) * 1000, hit=not _LOCAL.miss)
+        wrapper.clear = getattr(cached_fn, "clear", None)
+        return wrapper
+    return deco
+
+def cache_data(**cache_kwargs):
+    """st.cache_data 대체 — 프로파일 모드에서 hit/miss와 소요를 기록."""
+    return _cached(_st().cache_data, "cache", **cache_kwargs)
+
+def cache_resource(**cache_kwargs):
+    """st.cache_resource 대체 — 프로파일 모드에서 hit/miss와 소요를 기록."""
+    return _cached(_st().cache_resource, "cache", **cache_kwargs)
+
+
+# ─────────────────────────────────────────────
+# 패널/집계
+# ─────────────────────────────────────────────
+def _render(state: Dict[str, Any]) -> None:
+    import pandas as pd
+    st = _st()
+    recs = state["records"]
+    with state["panel"].container():
+        with st.expander(f"⏱️ 페이지 프로파일 · {state['last_end_ms']:.0f} ms", expanded=False):
+            if recs:
+                df = pd.DataFrame(recs)
+                cols = [c for c in ("kind", "name", "ms", "at_ms", "hit") if c in df.columns]
+                st.caption(f"이번 rerun (패널은 {PANEL_REDRAW_S:g}s 간격 갱신, 전체 기록은 로그)")
+                st.dataframe(df[cols], hide_index=True, width="stretch")
+            else:
+                st.caption("이번 rerun: 기록 없음")
+            summ = state["summary"]
+            if summ is not None and not summ.empty:
+                st.caption(f"누적 p50/p95 ({LOG_PATH.name})")
+                st.dataframe(summ.drop(columns=["page"]), hide_index=True, width="stretch")
+
+def read_log(path: Path | str | None = None, tail: int = LOG_TAIL) -> "pd.DataFrame":
+    import pandas as pd
+    path = Path(path or LOG_PATH)
+    if not path.exists():
+        return pd.DataFrame()
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()[-tail:]
+    rows = []
+    for line in lines:
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue                       # 동시 쓰기 중 잘린 줄 무시
+    return pd.DataFrame(rows)
+
+def summarize_log(path: Path | str | None = None, page: Optional[str] = None) -> "pd.DataFrame":
+    """(page, kind, name)별 호출 수, p50/p95/max(ms), 캐시 hit율."""
+    df = read_log(path)
+    if df.empty:
+        return df
+    if page is not None:
+        df = df[df["page"] == page]
+        if df.empty:
+            return df
+    if "hit" not in df.columns:
+        df["hit"] = None
+    g = df.groupby(["page", "kind", "name"], sort=False)
+    out = g["ms"].agg(n="count", p50=lambda s: s.quantile(.5), p95=lambda s: s.quantile(.95), max="max")
+    out["hit_rate"] = g["hit"].agg(lambda s: s.dropna().astype(float).mean() if s.notna().any() else None)
+    return out.round(1).reset_index().sort_values("p95", ascending=False, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="페이지 프로파일 로그 집계(p50/p95)")
+    ap.add_argument("--log", default=None, help=f"로그 경로(기본 {LOG_PATH})")
+    ap.add_argument("--page", default=None, help="페이지 이름으로 필터(예: user_list)")
+    args = ap.parse_args()
+    summ = summarize_log(args.log, page=args.page)
+    print(summ.to_string(index=False) if not summ.empty else "[INFO] 기록 없음")
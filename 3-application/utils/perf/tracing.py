@@ -0,0 +1,217 @@
+# utils/perf/tracing.py
+# ------------------------------------------------------------
+# 목적: 파이프라인 단계별 실행 시간/CPU/메모리 측정(경량 span 트레이서)
+# - with trace_run("full_scoring") as run: ... → 실행 1회 프로파일
+# - with span("cv_fold", fold=1): ... / @traced("final_fit") → 구간 기록(중첩 가능)
+# - 활성 run이 없으면 span은 아무것도 하지 않음(라이브러리 코드에 그대로 둬도 무해)
+# - TRACE_MALLOC=1 이면 tracemalloc으로 구간별 파이썬 힙 peak도 기록(느려짐 주의)
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import contextlib
+import tracemalloc
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_CURRENT: ContextVar[Optional["Run"]] = ContextVar("perf_run", default=None)
+PROFILE_SUFFIX = ".profile.json"
+
+
+def rss_mb() -> float:
+    """현재 RSS(MB). /proc이 없으면 peak RSS로 대체."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+def peak_rss_mb() -> float:
+    """프로세스 peak RSS(MB, 단조 증가)."""
+    if resource is None:
+        return 0.0
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / 2**20 if sys.platform == "darwin" else kb / 1024   # macOS는 bytes 단위
+
+
+class Run:
+    """실행 1회의 span 모음. to_dict()/save()로 JSON 프로파일 출력."""
+    def __init__(self, name: str, trace_malloc: bool = False, **attrs: Any) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.spans: List[Dict[str, Any]] = []
+        self.trace_malloc = trace_malloc
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._t0 = time.perf_counter()
+        self._c0 = time.process_time()
+        self._maxrss0 = peak_rss_mb()
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.wall_s: Optional[float] = None
+        self.cpu_s: Optional[float] = None
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        stack = self._stack()
+        rec: Dict[str, Any] = {
+            "id": None, "parent": stack[-1]["id"] if stack else None, "name": name,
+            "thread": threading.current_thread().name, "attrs": attrs,
+        }
+        with self._lock:
+            rec["id"] = len(self.spans)
+            self.spans.append(rec)
+        if self.trace_malloc and tracemalloc.is_tracing():
+            if stack:   # 부모 구간의 peak를 보존한 뒤 자식 기준으로 리셋
+                stack[-1]["_py_peak"] = max(stack[-1].get("_py_peak", 0), tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(rec)
+        rss0, maxrss0 = rss_mb(), peak_rss_mb()
+        t0, c0 = time.perf_counter(), time.process_time()
+        rec["start_s"] = round(t0 - self._t0, 6)
+        try:
+            yield rec
+        except BaseException as e:
+            rec["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            rec["wall_s"] = round(time.perf_counter() - t0, 6)
+            # process_time은 프로세스 전체 CPU(멀티스레드 학습 포함) → wall보다 클 수 있음
+            rec["cpu_s"] = round(time.process_time() - c0, 6)
+            maxrss1 = peak_rss_mb()
+            rec["rss_start_mb"] = round(rss0, 1)
+            rec["rss_end_mb"] = round(rss_mb(), 1)
+            rec["peak_rss_mb"] = round(maxrss1, 1)
+            rec["peak_rss_growth_mb"] = round(max(0.0, maxrss1 - maxrss0), 1)
+            stack.pop()
+            if self.trace_malloc and tracemalloc.is_tracing():
+                peak = max(rec.pop("_py_peak", 0), tracemalloc.get_traced_memory()[1])
+                rec["py_peak_mb"] = round(peak / 2**20, 2)
+                if stack:
+                    stack[-1]["_py_peak"] = max(stack[-1].get("_py_peak", 0), peak)
+                tracemalloc.reset_peak()
+
+    def finish(self) -> None:
+        self.wall_s = round(time.perf_counter() - self._t0, 6)
+        self.cpu_s = round(time.process_time() - self._c0, 6)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "wall_s": self.wall_s if self.wall_s is not None else round(time.perf_counter() - self._t0, 6),
+            "cpu_s": self.cpu_s,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "peak_rss_growth_mb": round(max(0.0, peak_rss_mb() - self._maxrss0), 1),
+            "pid": os.getpid(),
+            "attrs": self.attrs,
+            "spans": [{k: v for k, v in s.items() if not k.startswith("_")} for s in self.spans],
+        }
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        return path
+
+
+@contextlib.contextmanager
+def trace_run(name: str, **attrs: Any) -> Iterator[Run]:
+    """실행 1회 프로파일 시작. 블록 안의 span()이 이 run에 기록됩니다."""
+    trace_malloc = os.getenv("TRACE_MALLOC", "false").lower() in ("1", "true", "yes")
+    started_malloc = trace_malloc and not tracemalloc.is_tracing()
+    if started_malloc:
+        tracemalloc.start()
+    run = Run(name, trace_malloc=trace_malloc, **attrs)
+    token = _CURRENT.set(run)
+    try:
+        yield run
+    finally:
+        run.finish()
+        _CURRENT.reset(token)
+        if started_malloc:
+            tracemalloc.stop()
+
+def current_run() -> Optional[Run]:
+    return _CURRENT.get()
+
+@contextlib.contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Dict[str, Any]]]:
+    """활성 run에 구간 기록. run이 없으면 no-op(yield None)."""
+    run = _CURRENT.get()
+    if run is None:
+        yield None
+        return
+    with run.span(name, **attrs) as rec:
+        yield rec
+
+def traced(name: Optional[str] = None, **attrs: Any):
+    """함수 전체를 span으로 감싸는 데코레이터."""
+    def deco(fn):
+        label = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label, **attrs):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ─────────────────────────────────────────────
+# 프로파일 읽기/요약 (데이터 도구 페이지용)
+# ─────────────────────────────────────────────
+def load_profile(path: str | Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def summarize(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """span 이름별 합계(호출 수, wall/self/CPU 합, 전체 대비 비율) — self 내림차순.
+    self_s = 자식 span 시간을 뺀 순수 소요(중첩 구간 이중 집계 방지)."""
+    spans = profile.get("spans", [])
+    total = profile.get("wall_s") or 1.0
+    child_wall: Dict[Any, float] = {}
+    for s in spans:
+        if s.get("parent") is not None:
+            child_wall[s["parent"]] = child_wall.get(s["parent"], 0.0) + s.get("wall_s", 0.0)
+    agg: Dict[str, Dict[str, Any]] = {}
+    for s in spans:
+        a = agg.setdefault(s["name"], {"name": s["name"], "count": 0, "wall_s": 0.0, "self_s": 0.0,
+                                       "cpu_s": 0.0, "peak_rss_growth_mb": 0.0})
+        a["count"] += 1
+        a["wall_s"] += s.get("wall_s", 0.0)
+        a["self_s"] += max(0.0, s.get("wall_s", 0.0) - child_wall.get(s["id"], 0.0))
+        a["cpu_s"] += s.get("cpu_s", 0.0)
+        a["peak_rss_growth_mb"] += s.get("peak_rss_growth_mb", 0.0)
+    out = sorted(agg.values(), key=lambda a: -a["self_s"])
+    for a in out:
+        a["share"] = round(a["self_s"] / total, 4)
+        for k in ("wall_s", "self_s", "cpu_s", "peak_rss_growth_mb"):
+            a[k] = round(a[k], 3)
+    return out
+
+def span_depths(profile: Dict[str, Any]) -> Dict[int, int]:
+    """span id → 중첩 깊이(0=최상위). 타임라인 들여쓰기용."""
+    parents = {s["id"]: s.get("parent") for s in profile.get("spans", [])}
+    depth: Dict[int, int] = {}
+    for sid in parents:
+        d, p = 0, parents[sid]
+        while p is not None:
+            d, p = d + 1, parents.get(p)
+        depth[sid] = d
+    return depth
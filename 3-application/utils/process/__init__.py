@@ -1,8 +1,33 @@
 # service/utils/process/__init__.py
+# 하위 모듈은 이름을 처음 참조할 때 import(PEP 562) — preprocessor/split(sklearn), synthetic(scipy)을
+# 쓰지 않는 경로(페이지의 load_csv_from_data/engineer_features 등)는 ~1s import 비용을 내지 않음
+from importlib import import_module
 
-from .data_loader import load_csv_from_data
-from .feature_engineering import engineer_features, REQUIRED_COLUMNS
-from .feature_groups import get_feature_groups
-from .preprocessor import make_preprocessor
-from .split import stratified_split, get_stratified_kfold
-from .utils import set_seed, assert_columns
+_EXPORTS = {
+    "load_csv_from_data": ".data_loader",
+    "engineer_features": ".feature_engineering",
+    "fit_feature_params": ".feature_engineering",
+    "REQUIRED_COLUMNS": ".feature_engineering",
+    "get_feature_groups": ".feature_groups",
+    "make_preprocessor": ".preprocessor",
+    "stratified_split": ".split",
+    "get_stratified_kfold": ".split",
+    "fit_synthetic_spec": ".synthetic",
+    "synthetic_frame": ".synthetic",
+    "write_synthetic": ".synthetic",
+    "SharedDataset": ".shared_data",
+    "set_seed": ".utils",
+    "assert_columns": ".utils",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value          # 다음 참조부터는 일반 속성
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
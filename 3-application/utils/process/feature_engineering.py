@@ -1,4 +1,5 @@
 # utils/process/feature_engineering.py
+from __future__ import annotations
 import pandas as pd
 import numpy as np
 
@@ -9,11 +10,40 @@ REQUIRED_COLUMNS = [
     'HasCrCard','Gender','EstimatedSalary','Card Type'
 ]#complain은 제외라 미포함
 
-def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
+# 데이터 분포에 따라 값이 달라지는 파생 피처(중앙값/분위 구간) 목록
+_QCUT_COLS = {"age_bin": "Age", "sal_bin": "EstimatedSalary", "ten_bin": "Tenure"}
+
+def fit_feature_params(df: pd.DataFrame) -> dict:
+    """
+    학습 데이터 기준 피처 파라미터(Balance 중앙값, qcut 구간 경계)를 계산합니다.
+    - 저장해 두었다가 engineer_features(df, params=...)로 넘기면
+      스코어링 시 새 데이터에도 학습 때와 동일한 구간이 적용됩니다.
+    """
+    params = {"median_balance": float(df['Balance'].median()), "bins": {}}
+    for name, col in _QCUT_COLS.items():
+        _, edges = pd.qcut(df[col], q=5, duplicates='drop', retbins=True)
+        params["bins"][name] = [float(e) for e in edges]
+    return params
+
+def _bin(data: pd.DataFrame, name: str, params: dict | None) -> pd.Series:
+    col = _QCUT_COLS[name]
+    if params is None:
+        return pd.qcut(data[col], q=5, duplicates='drop')
+    # 학습 구간 밖의 값은 양 끝 구간으로 보정
+    edges = params["bins"][name]
+    return pd.cut(data[col].clip(edges[0], edges[-1]), bins=edges, include_lowest=True, duplicates='drop')
+
+def engineer_features(df: pd.DataFrame, params: dict | None = None) -> pd.DataFrame:
+    """
+    파생 피처 생성.
+    - params=None  : 입력 데이터 자체로 중앙값/분위 구간 계산(학습 시 기존 동작)
+    - params=dict  : fit_feature_params() 결과를 그대로 사용(스코어링 시)
+    """
     data = df.copy()
 
-    # 존재 컬럼 확인
-    missing = [c for c in REQUIRED_COLUMNS if c not in data.columns]
+    # 존재 컬럼 확인 (스코어링 시에는 정답 라벨 Exited가 없어도 됨)
+    required = REQUIRED_COLUMNS if params is None else [c for c in REQUIRED_COLUMNS if c != 'Exited']
+    missing = [c for c in required if c not in data.columns]
     if missing:
         raise KeyError(f"[ERROR] 누락 컬럼: {missing}")
 
@@ -28,7 +58,7 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
 
     # Germany 플래그 + 상호작용(고잔액)
     data['Germany_Flag'] = (data['Geography'] == 'Germany').astype(int)
-    median_balance = data['Balance'].median()
+    median_balance = data['Balance'].median() if params is None else params["median_balance"]
     data['Germany_HighBalance'] = ((data['Geography'] == 'Germany') & (data['Balance'] > median_balance)).astype(int)
 
     # 잔액/상품수 (참여도)
@@ -51,12 +81,12 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     data['geo_x_gender'] = data['Geography'].astype(str) + '_' + data['Gender'].astype(str)
 
     # 4) Age (bin) × EstimatedSalary (bin)
-    data['age_bin'] = pd.qcut(data['Age'], q=5, duplicates='drop')
-    data['sal_bin'] = pd.qcut(data['EstimatedSalary'], q=5, duplicates='drop')
+    data['age_bin'] = _bin(data, 'age_bin', params)
+    data['sal_bin'] = _bin(data, 'sal_bin', params)
     data['agebin_x_salbin'] = data['age_bin'].astype(str) + '_' + data['sal_bin'].astype(str)
 
     # 6) Tenure (bin) × IsActiveMember
-    data['ten_bin'] = pd.qcut(data['Tenure'], q=5, duplicates='drop')
+    data['ten_bin'] = _bin(data, 'ten_bin', params)
     data['tenbin_x_ia'] = data['ten_bin'].astype(str) + '_' + data['IsActiveMember'].astype(str)
 
     # 7) Card Type × IsActiveMember  (카디널리티 낮아 안전)
@@ -2,6 +2,8 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
+import os
+import time
 import json
 import joblib
 import numpy as np
@@ -18,8 +20,10 @@ from utils.process import (
     set_seed,                    # 시드 고정        :contentReference[oaicite:13]{index=13}
 )
 
+from utils.process.shared_data import SharedDataset
+from utils.perf import trace_run, span, PROFILE_SUFFIX
+
 from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import (
     roc_auc_score, average_precision_score, f1_score,
     precision_score, recall_score
@@ -36,22 +40,99 @@ DATA_DIR    = _APP_ROOT / "assets" / "data"           # (참고: data_loader 기
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# 학습된 전처리기 캐시(sklearn Pipeline(memory=...)): 같은 전처리 설정 + 같은 학습 행이면 재학습 없이 로드
+# → 재실행/같은 fold를 쓰는 다른 모델 계열은 StandardScaler/OneHotEncoder fit을 건너뜀. PIPELINE_CACHE=0 이면 끔
+# 병렬 학습이 끝날 때마다 PIPELINE_CACHE_MAX(기본 256M, joblib 단위 K/M/G) 안으로 최근 사용 순 정리
+PIPE_CACHE_DIR = Path(os.getenv("PIPELINE_CACHE_DIR", str(_APP_ROOT / "assets" / "logs" / "pipeline_cache")))
+PIPE_CACHE = os.getenv("PIPELINE_CACHE", "true").lower() not in ("0", "false", "no")
+PIPE_CACHE_MAX = os.getenv("PIPELINE_CACHE_MAX", "256M")
+
 # ─────────────────────────────────────────────
 # 헬퍼
 # ─────────────────────────────────────────────
 def _now_tag() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def _make_pipe(fg) -> Pipeline:
-    """전처리 + 모델로 구성된 Pipeline 생성"""
-    preproc = make_preprocessor(fg)  # 숫자: StandardScaler, 이진: passthrough, 범주: OneHot  :contentReference[oaicite:16]{index=16}
-    model = RandomForestClassifier(
-        n_estimators=300,
-        class_weight="balanced",
-        random_state=42,
-        n_jobs=-1
-    )
-    return Pipeline([("preprocess", preproc), ("model", model)])
+# ─────────────────────────────────────────────
+# 모델 계열(이름 → 생성 함수). lightgbm/xgboost/catboost는 설치된 경우에만 사용 가능
+# ─────────────────────────────────────────────
+def _rf(seed, n_jobs):
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(n_estimators=300, class_weight="balanced", random_state=seed, n_jobs=n_jobs)
+
+def _logreg(seed, n_jobs):
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(max_iter=2000, class_weight="balanced", random_state=seed)
+
+def _hgb(seed, n_jobs):
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    return HistGradientBoostingClassifier(max_iter=300, learning_rate=0.05, class_weight="balanced",
+                                          random_state=seed)
+
+def _lgbm(seed, n_jobs):
+    from lightgbm import LGBMClassifier
+    return LGBMClassifier(n_estimators=400, learning_rate=0.05, num_leaves=31, class_weight="balanced",
+                          random_state=seed, n_jobs=n_jobs, verbose=-1)
+
+def _xgb(seed, n_jobs):
+    from xgboost import XGBClassifier
+    # 이탈 비율(약 1:4) 보정
+    return XGBClassifier(n_estimators=400, learning_rate=0.05, max_depth=5, tree_method="hist",
+                         scale_pos_weight=4.0, eval_metric="auc", random_state=seed, n_jobs=n_jobs)
+
+def _catboost(seed, n_jobs):
+    from catboost import CatBoostClassifier
+    return CatBoostClassifier(iterations=800, learning_rate=0.05, depth=6, auto_class_weights="Balanced",
+                              random_state=seed, thread_count=n_jobs, verbose=False)
+
+MODEL_FAMILIES = {"rf": _rf, "logreg": _logreg, "hgb": _hgb, "lgbm": _lgbm, "xgb": _xgb, "catboost": _catboost}
+# 계열별 기본 전처리(preprocessor.PREPROCESS_MODES) — 트리는 정수 코드, 선형은 희소 원핫
+# (sklearn 트리는 CSR 입력 학습이 밀집보다 수 배 느리고, HistGradientBoosting은 희소 입력 미지원)
+DEFAULT_PREPROCESS = {"rf": "ordinal", "logreg": "sparse", "hgb": "ordinal",
+                      "lgbm": "ordinal", "xgb": "ordinal", "catboost": "ordinal"}
+_REQUIRES = {"lgbm": "lightgbm", "xgb": "xgboost", "catboost": "catboost"}
+
+def available_models() -> list:
+    """현재 환경에서 import 가능한 모델 계열 이름."""
+    from importlib.util import find_spec
+    return [m for m in MODEL_FAMILIES if m not in _REQUIRES or find_spec(_REQUIRES[m]) is not None]
+
+def make_model(name: str = "rf", seed: int = 42, n_jobs: int = -1):
+    if name not in MODEL_FAMILIES:
+        raise ValueError(f"unknown model: {name} (choose from {sorted(MODEL_FAMILIES)})")
+    return MODEL_FAMILIES[name](seed, n_jobs)
+
+def _pipe_memory():
+    return joblib.Memory(str(PIPE_CACHE_DIR), verbose=0) if PIPE_CACHE else None
+
+def _reduce_pipe_cache() -> None:
+    """전처리기 캐시를 PIPE_CACHE_MAX 이하로(오래 안 쓴 항목부터 삭제). 워커가 아닌 부모 프로세스에서 1회 호출."""
+    memory = _pipe_memory()
+    if memory is not None:
+        memory.reduce_size(bytes_limit=PIPE_CACHE_MAX)
+
+def _make_pipe(fg, model: str = "rf", seed: int = 42, n_jobs: int = -1, preprocess: str | None = None,
+               memory=None) -> Pipeline:
+    """전처리 + 모델로 구성된 Pipeline 생성. preprocess 미지정 시 계열 기본값(DEFAULT_PREPROCESS)"""
+    # 숫자: StandardScaler, 이진: passthrough, 범주: OneHot(dense/sparse) 또는 정수 코드(ordinal)  :contentReference[oaicite:16]{index=16}
+    preproc = make_preprocessor(fg, mode=preprocess or DEFAULT_PREPROCESS.get(model, "dense"))
+    return Pipeline([("preprocess", preproc), ("model", make_model(model, seed, n_jobs))], memory=memory)
+
+def _worker_split(n_tasks: int, n_jobs: int = -1):
+    """(동시 작업 수, 작업당 모델 n_jobs) — 합이 코어 수를 넘지 않게(RandomForest n_jobs=-1 과할당 방지)."""
+    cores = (os.cpu_count() or 1) if n_jobs is None or n_jobs < 0 else max(1, n_jobs)
+    workers = max(1, min(n_tasks, cores))
+    return workers, max(1, cores // workers)
+
+def _fit_task(fg, model, seed, preprocess, data: SharedDataset, tr_idx, te_idx, n_jobs):
+    """fold(또는 te_idx=None이면 전체 재학습) 1개 — 워커 프로세스에서 실행(data는 메모리 매핑, 행은 인덱스로)."""
+    pipe = _make_pipe(fg, model, seed, n_jobs=n_jobs, preprocess=preprocess, memory=_pipe_memory())
+    t0 = time.perf_counter()
+    pipe.fit(data.frame(tr_idx), data.y[tr_idx])
+    fit_s = time.perf_counter() - t0
+    pipe.memory = None           # 저장되는 모델에 캐시 경로를 남기지 않음(학습된 단계는 그대로)
+    prob = pipe.predict_proba(data.frame(te_idx))[:, 1] if te_idx is not None else None
+    return pipe, prob, fit_s
 
 def _metrics(y_true, y_prob=None, y_pred=None) -> dict:
     m = {}
@@ -74,20 +155,36 @@ def train_and_predict_to_csv(
     test_size: float = 0.3,          # split.py 기본 7:3과 맞춤  :contentReference[oaicite:17]{index=17}
     n_splits: int = 5,
     seed: int = 42,
+    model: str = "rf",               # MODEL_FAMILIES 키(rf | logreg | hgb | lgbm | xgb | catboost)
+    preprocess: str | None = None,   # dense | sparse | ordinal (None: 계열 기본값)
+    n_jobs: int = -1,                # oof: fold 병렬 + 모델 스레드에 나눠 쓸 코어 수(-1=전체)
 ) -> dict:
     """
     mode:
     - holdout : 7:3(기본) 분할 → test에만 예측 저장(평가용)
     - oof     : StratifiedKFold OOF 예측 → 전 샘플 '검증 기반' 예측
     - insample: 전체 학습→전체 예측(대시보드/시연용)
+    단계별 소요 프로파일은 결과 CSV 옆 <result>.profile.json 으로 저장됩니다.
     """
+    preprocess = preprocess or DEFAULT_PREPROCESS.get(model, "dense")
+    with trace_run("train_and_predict_to_csv", mode=mode, seed=seed, model=model, preprocess=preprocess) as run:
+        out = _train_and_predict(mode, input_filename, save_tag, test_size, n_splits, seed, model, preprocess,
+                                 n_jobs)
+    out["profile"] = run.save(out["result_csv"].with_suffix(PROFILE_SUFFIX))
+    print(f"[OK] Profile: {out['profile']} (total {run.wall_s:.1f}s)")
+    return out
+
+def _train_and_predict(mode, input_filename, save_tag, test_size, n_splits, seed, model="rf",
+                       preprocess=None, n_jobs=-1) -> dict:
     set_seed(seed)  # 재현성  :contentReference[oaicite:18]{index=18}
 
     # 1) 데이터 로드 (원본을 수정하지 않음)
-    df_raw = load_csv_from_data(filename=input_filename)  # 기본 경로: 3-application/assets/data  :contentReference[oaicite:19]{index=19}
+    with span("load"):
+        df_raw = load_csv_from_data(filename=input_filename)  # 기본 경로: 3-application/assets/data  :contentReference[oaicite:19]{index=19}
 
     # 2) 피처 엔지니어링 + 컬럼확인
-    data_fe = engineer_features(df_raw)                   # 필수 컬럼 검사/파생 생성  :contentReference[oaicite:20]{index=20}
+    with span("feature_engineering", rows=len(df_raw)):
+        data_fe = engineer_features(df_raw)               # 필수 컬럼 검사/파생 생성  :contentReference[oaicite:20]{index=20}
     # (engineer_features 내부에 REQUIRED_COLUMNS 체크가 있으므로 별도 assert_columns 생략 가능하지만,
     #  필요 시 아래처럼 사용할 수 있습니다)
     # from utils.process.feature_engineering import REQUIRED_COLUMNS
@@ -106,10 +203,12 @@ def train_and_predict_to_csv(
     if mode == "holdout":
         # stratified 7:3 분할  :contentReference[oaicite:22]{index=22}
         X_tr, X_te, y_tr, y_te = stratified_split(X, y, test_size=test_size)
-        pipe = _make_pipe(fg)
-        pipe.fit(X_tr, y_tr)
+        pipe = _make_pipe(fg, model, seed, preprocess=preprocess)
+        with span("final_fit", rows=len(X_tr)):
+            pipe.fit(X_tr, y_tr)
 
-        y_prob_te = pipe.predict_proba(X_te)[:, 1]
+        with span("predict", rows=len(X_te)):
+            y_prob_te = pipe.predict_proba(X_te)[:, 1]
         y_pred_te = (y_prob_te >= 0.5).astype(int)
 
         # test 레코드에만 예측 붙여 저장
@@ -118,10 +217,12 @@ def train_and_predict_to_csv(
         df_out["predicted_proba"]  = y_prob_te
 
         result_path = RESULTS_DIR / f"result_holdout{tag}_{ts}.csv"
-        df_out.to_csv(result_path, index=False, encoding="utf-8-sig")
+        with span("csv_write", rows=len(df_out)):
+            df_out.to_csv(result_path, index=False, encoding="utf-8-sig")
 
         model_path = MODELS_DIR / f"model_holdout{tag}_{ts}.joblib"
-        joblib.dump(pipe, model_path)
+        with span("save_model"):
+            joblib.dump(pipe, model_path)
 
         metrics = _metrics(y_te, y_prob_te, y_pred_te)
 
@@ -129,13 +230,29 @@ def train_and_predict_to_csv(
         skf = get_stratified_kfold(n_splits=n_splits)     # 5-Fold CV  :contentReference[oaicite:23]{index=23}
         oof_prob = np.zeros(len(y), dtype=float)
         oof_pred = np.zeros(len(y), dtype=int)
-
-        for tr_idx, te_idx in skf.split(X, y):
-            pipe = _make_pipe(fg)
-            pipe.fit(X.iloc[tr_idx], y[tr_idx])
-            prob_te = pipe.predict_proba(X.iloc[te_idx])[:, 1]
+        splits = list(skf.split(X, y))
+
+        # fold k개 + 배포용 전체 재학습을 한 작업 풀에서 동시에 실행
+        # (동시 작업 수 × 모델 n_jobs <= n_jobs 코어 → 전체 소요가 단일 학습 1회에 가까워짐)
+        tasks = [(tr_idx, te_idx) for tr_idx, te_idx in splits] + [(np.arange(len(y)), None)]
+        workers, inner_jobs = _worker_split(len(tasks), n_jobs)
+        print(f"[INFO] OOF: {len(splits)} folds + full fit, workers={workers} × model n_jobs={inner_jobs}")
+        # X/y는 공유 메모리 파일로 1회 기록 → 작업마다 DataFrame을 pickle하지 않고 경로 + fold 인덱스만 전달
+        with span("share_data", rows=len(y)) as sp:
+            data = SharedDataset.create(X, y)
+            if sp is not None:
+                sp["attrs"]["bytes"] = data.nbytes
+        with data, span("cv_parallel", folds=len(splits), workers=workers, model_n_jobs=inner_jobs) as sp:
+            results = joblib.Parallel(n_jobs=workers)(
+                joblib.delayed(_fit_task)(fg, model, seed, preprocess, data, tr_idx, te_idx, inner_jobs)
+                for tr_idx, te_idx in tasks)
+            if sp is not None:
+                sp["attrs"]["fit_s"] = [round(r[2], 3) for r in results]
+        _reduce_pipe_cache()
+        for (_, te_idx), (_, prob_te, _) in zip(splits, results):
             oof_prob[te_idx] = prob_te
             oof_pred[te_idx] = (prob_te >= 0.5).astype(int)
+        final_pipe = results[-1][0]
 
         # 전 레코드에 OOF 예측 붙여 저장
         df_out = df_raw.copy()
@@ -143,20 +260,21 @@ def train_and_predict_to_csv(
         df_out["predicted_proba_oof"]  = oof_prob
 
         result_path = RESULTS_DIR / f"result_oof_k{n_splits}{tag}_{ts}.csv"
-        df_out.to_csv(result_path, index=False, encoding="utf-8-sig")
+        with span("csv_write", rows=len(df_out)):
+            df_out.to_csv(result_path, index=False, encoding="utf-8-sig")
 
-        # 배포용 최종 모델: 전체 데이터로 재학습
-        final_pipe = _make_pipe(fg)
-        final_pipe.fit(X, y)
         model_path = MODELS_DIR / f"model_oof_fullfit{tag}_{ts}.joblib"
-        joblib.dump(final_pipe, model_path)
+        with span("save_model"):
+            joblib.dump(final_pipe, model_path)
 
         metrics = _metrics(y, oof_prob, oof_pred)  # OOF 기준
 
     elif mode == "insample":
-        pipe = _make_pipe(fg)
-        pipe.fit(X, y)
-        prob_all = pipe.predict_proba(X)[:, 1]
+        pipe = _make_pipe(fg, model, seed, preprocess=preprocess)
+        with span("final_fit", rows=len(X)):
+            pipe.fit(X, y)
+        with span("predict", rows=len(X)):
+            prob_all = pipe.predict_proba(X)[:, 1]
         pred_all = (prob_all >= 0.5).astype(int)
 
         df_out = df_raw.copy()
@@ -164,10 +282,12 @@ def train_and_predict_to_csv(
         df_out["predicted_proba"]  = prob_all
 
         result_path = RESULTS_DIR / f"result_insample{tag}_{ts}.csv"
-        df_out.to_csv(result_path, index=False, encoding="utf-8-sig")
+        with span("csv_write", rows=len(df_out)):
+            df_out.to_csv(result_path, index=False, encoding="utf-8-sig")
 
         model_path = MODELS_DIR / f"model_insample{tag}_{ts}.joblib"
-        joblib.dump(pipe, model_path)
+        with span("save_model"):
+            joblib.dump(pipe, model_path)
 
         metrics = _metrics(y, prob_all, pred_all)
 
@@ -177,6 +297,8 @@ def train_and_predict_to_csv(
     # 5) 메타 저장(선택)
     meta = {
         "mode": mode,
+        "model": model,
+        "preprocess": preprocess,
         "timestamp": ts,
         "input_csv": str((DATA_DIR / (input_filename or "Customer-Churn-Records.csv")).resolve()),
         "features": {
@@ -190,6 +312,7 @@ def train_and_predict_to_csv(
         "n_splits": n_splits if mode == "oof" else None,
         "test_size": test_size if mode == "holdout" else None,
         "seed": seed,
+        "profile": str(result_path.with_suffix(PROFILE_SUFFIX).resolve()),
     }
     meta_path = result_path.with_suffix(".meta.json")
     with open(meta_path, "w", encoding="utf-8") as f:
@@ -1,23 +1,57 @@
 # service/utils/process/preprocessor.py
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+import numpy as np
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler, FunctionTransformer
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 
-def make_preprocessor(feature_groups) -> ColumnTransformer:
+# dense  : 수치 StandardScaler + 이진 passthrough + 범주 OneHot → 밀집 float64 (기존 동작)
+# sparse : 같은 피처를 CSR float32로 — 원핫의 0은 저장하지 않아 메모리가 (행 × 범주 수)가 아닌 비영 원소 수에 비례(선형 모델용)
+# ordinal: 범주를 열당 정수 코드 1개로(미지 값 -1) → 밀집 float32, 원핫이 필요 없는 트리 모델용
+#          (sklearn 트리는 내부적으로 float32를 쓰므로 float64 입력 때 생기는 복사도 없음)
+PREPROCESS_MODES = ("dense", "sparse", "ordinal")
+
+def _as_float32(X):
+    return np.asarray(X, dtype=np.float32)
+
+def make_preprocessor(feature_groups, mode: str = "dense") -> ColumnTransformer:
+    if mode not in PREPROCESS_MODES:
+        raise ValueError(f"mode must be one of {PREPROCESS_MODES} (got {mode!r})")
     numeric = feature_groups['numeric']
     binary  = feature_groups['binary']
     onehot  = feature_groups['onehot']
 
+    if mode == "dense":
+        transformers = []
+        if numeric:
+            transformers.append(("num", Pipeline([("scaler", StandardScaler())]), numeric))
+        if binary:
+            transformers.append(("bin", "passthrough", binary))
+        if onehot:
+            transformers.append(("oh", OneHotEncoder(handle_unknown='ignore', sparse_output=False), onehot))
+
+        return ColumnTransformer(
+            transformers=transformers,
+            remainder="drop",
+            verbose_feature_names_out=False
+        )
+
+    f32 = FunctionTransformer(_as_float32, feature_names_out="one-to-one")
     transformers = []
     if numeric:
-        transformers.append(("num", Pipeline([("scaler", StandardScaler())]), numeric))
+        transformers.append(("num", Pipeline([("f32", f32), ("scaler", StandardScaler())]), numeric))
     if binary:
-        transformers.append(("bin", "passthrough", binary))
+        transformers.append(("bin", f32, binary))
     if onehot:
-        transformers.append(("oh", OneHotEncoder(handle_unknown='ignore', sparse_output=False), onehot))
+        if mode == "sparse":
+            enc = OneHotEncoder(handle_unknown='ignore', sparse_output=True, dtype=np.float32)
+        else:
+            enc = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1,
+                                 encoded_missing_value=-1, dtype=np.float32)
+        transformers.append(("oh" if mode == "sparse" else "ord", enc, onehot))
 
     return ColumnTransformer(
         transformers=transformers,
         remainder="drop",
+        sparse_threshold=1.0 if mode == "sparse" else 0.0,   # sparse: 항상 CSR / ordinal: 항상 밀집
         verbose_feature_names_out=False
     )
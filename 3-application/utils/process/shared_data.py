@@ -0,0 +1,117 @@
+# 3-application/utils/process/shared_data.py
+# ------------------------------------------------------------
+# 목적: 엔지니어링된 피처 행렬 + 라벨을 워커 프로세스(joblib/ProcessPool)와 복사 없이 공유
+# - 기존: 작업마다 X(DataFrame, 문자열/범주 열 포함)를 pickle → 워커 수만큼 직렬화 비용 + 메모리 사본
+# - 변경: 생성 시 1회 .npy 파일로 기록 → 워커는 np.load(mmap_mode="r")로 열기만 함(페이지 캐시 공유)
+#   · 수치 열: float64 (n, k) 1개(정수 열도 정확히 표현, 복원 시 원래 dtype으로)
+#   · 범주/문자열 열: int32 코드 (n, m) 1개 + 열별 범주 목록(결측 = -1)
+#   · 라벨: y.npy
+#   · 기본 위치는 /dev/shm(메모리 기반 tmpfs, 없으면 임시 폴더), SHARED_DATA_DIR로 변경
+# - 핸들 pickle에는 경로/컬럼/범주 목록만 담김(수 KB) → 워커 기동 비용/RAM이 코어 수와 무관
+# - fold는 행 인덱스 배열로 넘기고 워커에서 data.frame(tr_idx)로 필요한 행만 DataFrame 구성
+# 사용:
+#   with SharedDataset.create(X, y) as data:
+#       Parallel(n_jobs=4)(delayed(task)(data, tr_idx, te_idx) for tr_idx, te_idx in splits)
+#   # task 내부: X_tr, y_tr = data.frame(tr_idx), data.y[tr_idx]
+# ------------------------------------------------------------
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SHARED_DATA_DIR = os.getenv("SHARED_DATA_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+
+class SharedDataset:
+    """메모리 매핑 피처 행렬/라벨. create()로 만든 프로세스만 파일을 지움(close / with 종료)."""
+
+    def __init__(self, path: Path, columns: List[str], num_cols: List[str], cat_cols: List[str],
+                 dtypes: Dict[str, Any], categories: Dict[str, Any], owner: Optional[int] = None):
+        self.path = Path(path)
+        self.columns, self.num_cols, self.cat_cols = columns, num_cols, cat_cols
+        self.dtypes, self.categories = dtypes, categories
+        self._owner = owner
+        self._open()
+
+    def _open(self):
+        self.num = np.load(self.path / "num.npy", mmap_mode="r")
+        self.codes = np.load(self.path / "codes.npy", mmap_mode="r")
+        self.y = np.load(self.path / "y.npy", mmap_mode="r")
+
+    @classmethod
+    def create(cls, X: pd.DataFrame, y: Sequence, root: Optional[str] = SHARED_DATA_DIR) -> "SharedDataset":
+        """X(수치 + 범주/문자열 열) / y → .npy 파일 기록 후 핸들 반환."""
+        path = Path(tempfile.mkdtemp(prefix="churn_data_", dir=root))
+        num_cols = [c for c in X.columns if pd.api.types.is_numeric_dtype(X[c]) and not isinstance(X[c].dtype, pd.CategoricalDtype)]
+        cat_cols = [c for c in X.columns if c not in num_cols]
+
+        num = np.lib.format.open_memmap(path / "num.npy", mode="w+", dtype=np.float64, shape=(len(X), len(num_cols)))
+        for j, c in enumerate(num_cols):
+            num[:, j] = X[c].to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.lib.format.open_memmap(path / "codes.npy", mode="w+", dtype=np.int32, shape=(len(X), len(cat_cols)))
+        categories: Dict[str, Any] = {}
+        for j, c in enumerate(cat_cols):
+            s = X[c]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                codes[:, j], categories[c] = s.cat.codes.to_numpy(), None    # dtype에 범주 포함
+            else:
+                codes[:, j], categories[c] = pd.factorize(s, use_na_sentinel=True)
+        num.flush(), codes.flush()
+        del num, codes
+        np.save(path / "y.npy", np.asarray(y))
+        return cls(path, list(X.columns), num_cols, cat_cols, {c: X[c].dtype for c in X.columns}, categories,
+                   owner=os.getpid())
+
+    # --- 워커로 보낼 때는 경로/메타만 ---
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for k in ("num", "codes", "y"):
+            state.pop(k, None)
+        state["_owner"] = None          # 워커 쪽 핸들은 파일을 지우지 않음
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.num.nbytes + self.codes.nbytes + self.y.nbytes)
+
+    def frame(self, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """rows(정수 인덱스, None=전체) 행만 원래 컬럼 순서/dtype의 DataFrame으로 구성."""
+        num = self.num if rows is None else self.num[rows]
+        codes = self.codes if rows is None else self.codes[rows]
+        data = {}
+        for j, c in enumerate(self.num_cols):
+            col = num[:, j]
+            data[c] = col if self.dtypes[c] == np.float64 or np.isnan(col).any() else col.astype(self.dtypes[c])
+        for j, c in enumerate(self.cat_cols):
+            dtype, cats = self.dtypes[c], self.categories[c]
+            if cats is None:
+                data[c] = pd.Categorical.from_codes(codes[:, j], dtype=dtype)
+            else:
+                data[c] = pd.Categorical.from_codes(codes[:, j], categories=cats).astype(dtype)
+        return pd.DataFrame(data, columns=self.columns)
+
+    def close(self):
+        """매핑 해제 + (생성 프로세스이면) 파일 삭제."""
+        for k in ("num", "codes", "y"):
+            self.__dict__.pop(k, None)
+        if self._owner == os.getpid():
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._owner = None
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,248 @@
+# utils/process/synthetic.py
+# ------------------------------------------------------------
+# 목적: 실제 고객 CSV의 분포를 학습해 임의 크기의 합성 고객 데이터를 생성(부하 테스트용)
+# - 범주형: (Geography, Gender, Card Type, Exited) 결합 빈도
+# - 수치형: (Geography, Exited) 그룹별 경험적 분위수(주변분포) + 가우시안 코퓰라(상관)
+# - Surname: 실제 빈도 분포
+# - RowNumber/CustomerId: 전역 행 번호 기반 → 청크/병렬 실행에서도 유일
+# 사용: python utils/process/synthetic.py --rows 1m --out assets/data/synthetic_1m.csv --workers 4
+# ------------------------------------------------------------
+from __future__ import annotations
+import sys
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+COLUMNS = [
+    "RowNumber", "CustomerId", "Surname", "CreditScore", "Geography", "Gender", "Age", "Tenure",
+    "Balance", "NumOfProducts", "HasCrCard", "IsActiveMember", "EstimatedSalary", "Exited",
+    "Complain", "Satisfaction Score", "Card Type", "Point Earned",
+]
+_JOINT_COLS = ["Geography", "Gender", "Card Type", "Exited"]
+_GROUP_COLS = ["Geography", "Exited"]
+_CONT_COLS = {"CreditScore": 0, "Age": 0, "Balance": 2, "EstimatedSalary": 2, "Point Earned": 0}  # 반올림 자릿수
+_DISC_COLS = ["Tenure", "NumOfProducts", "HasCrCard", "IsActiveMember", "Complain", "Satisfaction Score"]
+_N_QUANTILES = 1001
+_ID_OFFSET = 100_000_000     # 실제 CustomerId(1556xxxx~1581xxxx)와 겹치지 않는 시작값
+DEFAULT_CHUNK = 100_000
+
+
+# ─────────────────────────────────────────────
+# 분포 학습
+# ─────────────────────────────────────────────
+def _normal_scores(x: np.ndarray) -> np.ndarray:
+    ranks = pd.Series(x).rank(method="average").to_numpy()
+    return ndtri((ranks - 0.5) / len(x))
+
+def _nearest_corr(c: np.ndarray) -> np.ndarray:
+    """고유값 보정으로 양의 정부호 상관행렬 보장."""
+    c = np.nan_to_num((c + c.T) / 2, nan=0.0)
+    np.fill_diagonal(c, 1.0)
+    w, v = np.linalg.eigh(c)
+    c = (v * np.clip(w, 1e-6, None)) @ v.T
+    d = np.sqrt(np.diag(c))
+    return c / np.outer(d, d)
+
+def fit_synthetic_spec(df: pd.DataFrame) -> Dict[str, Any]:
+    """실제 고객 DataFrame → 생성 스펙(JSON 직렬화 가능 dict)."""
+    joint = df.groupby(_JOINT_COLS).size()
+    surnames = df["Surname"].astype(str).value_counts()
+    q = np.linspace(0, 1, _N_QUANTILES)
+
+    groups = {}
+    for key, g in df.groupby(_GROUP_COLS):
+        cols = list(_CONT_COLS) + _DISC_COLS
+        z = np.column_stack([_normal_scores(g[c].to_numpy(dtype=float)) for c in cols])
+        groups["|".join(map(str, key))] = {
+            "cont": {c: np.quantile(g[c].to_numpy(dtype=float), q).tolist() for c in _CONT_COLS},
+            "disc": {c: {"values": vc.index.tolist(), "p": (vc / vc.sum()).tolist()}
+                     for c in _DISC_COLS for vc in [g[c].value_counts().sort_index()]},
+            "corr": _nearest_corr(np.corrcoef(z, rowvar=False)).tolist(),
+        }
+    return {
+        "joint": {"keys": [list(map(_py, k)) for k in joint.index], "p": (joint / joint.sum()).tolist()},
+        "surnames": {"values": surnames.index.tolist(), "p": (surnames / surnames.sum()).tolist()},
+        "groups": groups,
+        "source_rows": int(len(df)),
+    }
+
+def _py(v):
+    """numpy 스칼라 → 파이썬 기본형(JSON 저장용)."""
+    return v.item() if hasattr(v, "item") else v
+
+def save_spec(spec: Dict[str, Any], path: str | Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(spec, f, ensure_ascii=False)
+
+def load_spec(path: str | Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ─────────────────────────────────────────────
+# 생성
+# ─────────────────────────────────────────────
+def generate_chunk(spec: Dict[str, Any], start: int, n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    전역 행 번호 [start, start+n_rows) 구간의 합성 고객.
+    난수 시드는 (seed, start)로 결정 → 어떤 청크 분할/병렬 순서에서도 같은 결과.
+    """
+    rng = np.random.default_rng([seed, start])
+    n = int(n_rows)
+    keys = spec["joint"]["keys"]
+    cell = rng.choice(len(keys), size=n, p=spec["joint"]["p"])
+    out: Dict[str, Any] = {
+        "RowNumber": np.arange(start + 1, start + n + 1, dtype=np.int64),
+        "CustomerId": _ID_OFFSET + np.arange(start, start + n, dtype=np.int64),
+    }
+    for j, c in enumerate(_JOINT_COLS):
+        vals = np.asarray([k[j] for k in keys], dtype=object if c != "Exited" else np.int64)
+        out[c] = vals[cell]
+    sn = spec["surnames"]
+    out["Surname"] = np.asarray(sn["values"], dtype=object)[rng.choice(len(sn["values"]), size=n, p=sn["p"])]
+
+    for c in list(_CONT_COLS) + _DISC_COLS:
+        out[c] = np.zeros(n, dtype=np.float64)
+    group_of = np.asarray(["|".join(map(str, (k[0], k[3]))) for k in keys])[cell]
+    q = np.linspace(0, 1, _N_QUANTILES)
+    for gkey, g in spec["groups"].items():
+        idx = np.flatnonzero(group_of == gkey)
+        if not len(idx):
+            continue
+        corr = np.asarray(g["corr"])
+        u = ndtr(rng.standard_normal((len(idx), len(corr))) @ np.linalg.cholesky(corr).T)
+        for j, c in enumerate(_CONT_COLS):
+            out[c][idx] = np.interp(u[:, j], q, g["cont"][c])
+        for j, c in enumerate(_DISC_COLS, start=len(_CONT_COLS)):
+            d = g["disc"][c]
+            pos = np.searchsorted(np.cumsum(d["p"]), u[:, j], side="right")
+            out[c][idx] = np.asarray(d["values"], dtype=np.float64)[np.minimum(pos, len(d["values"]) - 1)]
+
+    for c, nd in _CONT_COLS.items():
+        out[c] = out[c].round(nd) if nd else out[c].round().astype(np.int64)
+    for c in _DISC_COLS:
+        out[c] = out[c].astype(np.int64)
+    return pd.DataFrame(out)[COLUMNS]
+
+def iter_chunks(spec: Dict[str, Any], n_rows: int, chunk_size: int = DEFAULT_CHUNK,
+                seed: int = 42) -> Iterator[pd.DataFrame]:
+    """n_rows를 chunk_size 단위로 순차 생성."""
+    for start in range(0, int(n_rows), int(chunk_size)):
+        yield generate_chunk(spec, start, min(chunk_size, n_rows - start), seed)
+
+def synthetic_frame(n_rows: int, df: Optional[pd.DataFrame] = None,
+                    spec: Optional[Dict[str, Any]] = None, seed: int = 42) -> pd.DataFrame:
+    """메모리 내 합성 DataFrame. spec/df가 없으면 기본 학습 CSV로 분포를 학습."""
+    if spec is None:
+        if df is None:
+            from .data_loader import load_csv_from_data
+            df = load_csv_from_data()
+        spec = fit_synthetic_spec(df)
+    chunks = list(iter_chunks(spec, n_rows, seed=seed))
+    return pd.concat(chunks, ignore_index=True) if chunks else generate_chunk(spec, 0, 0, seed)
+
+
+# ─────────────────────────────────────────────
+# 파일 출력 (CSV 스트리밍 / Parquet 파트 파일, 병렬)
+# ─────────────────────────────────────────────
+def _render_csv(args) -> str:
+    spec, start, n, seed = args
+    return generate_chunk(spec, start, n, seed).to_csv(index=False, header=False, lineterminator="\n")
+
+def _write_parquet_part(args) -> str:
+    spec, start, n, seed, path = args
+    generate_chunk(spec, start, n, seed).to_parquet(path, index=False)
+    return path
+
+def write_synthetic(out_path: str | Path, n_rows: int, spec: Optional[Dict[str, Any]] = None,
+                    df: Optional[pd.DataFrame] = None, chunk_size: int = DEFAULT_CHUNK,
+                    workers: int = 1, seed: int = 42) -> Path:
+    """
+    합성 데이터를 파일로 스트리밍 출력합니다.
+    - .csv     : 단일 파일, 청크 순서대로 append (메모리 ≈ workers × 2 청크)
+    - .parquet : 디렉터리에 part-00000.parquet … (pyarrow 필요)
+    """
+    if spec is None:
+        if df is None:
+            from .data_loader import load_csv_from_data
+            df = load_csv_from_data()
+        spec = fit_synthetic_spec(df)
+    out_path = Path(out_path)
+    starts = list(range(0, int(n_rows), int(chunk_size)))
+    sizes = [min(chunk_size, n_rows - s) for s in starts]
+
+    if out_path.suffix.lower() == ".parquet":
+        out_path.mkdir(parents=True, exist_ok=True)
+        tasks = [(spec, s, n, seed, str(out_path / f"part-{i:05d}.parquet"))
+                 for i, (s, n) in enumerate(zip(starts, sizes))]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                list(ex.map(_write_parquet_part, tasks))
+        else:
+            for t in tasks:
+                _write_parquet_part(t)
+        return out_path
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    tasks = [(spec, s, n, seed) for s, n in zip(starts, sizes)]
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                # 순서 보장 + 진행 중 청크 수 제한(메모리 상한)
+                window = max(2, workers * 2)
+                pending = [ex.submit(_render_csv, t) for t in tasks[:window]]
+                nxt = len(pending)
+                while pending:
+                    f.write(pending.pop(0).result())
+                    if nxt < len(tasks):
+                        pending.append(ex.submit(_render_csv, tasks[nxt]))
+                        nxt += 1
+        else:
+            for t in tasks:
+                f.write(_render_csv(t))
+    tmp.replace(out_path)
+    return out_path
+
+
+def parse_size(s: str | int) -> int:
+    """'10k' / '1m' / '10000' → 정수 행 수."""
+    if isinstance(s, int):
+        return s
+    s = str(s).strip().lower().replace("_", "")
+    mult = {"k": 1_000, "m": 1_000_000}.get(s[-1:], 1)
+    return int(float(s[:-1] if mult > 1 else s) * mult)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from utils.process.data_loader import load_csv_from_data, _safe_read_csv
+
+    ap = argparse.ArgumentParser(description="실제 고객 CSV 분포 기반 합성 데이터 생성")
+    ap.add_argument("--rows", required=True, help="생성 행 수(예: 100k, 1m, 10m)")
+    ap.add_argument("--out", required=True, help="출력 경로(.csv 또는 .parquet 디렉터리)")
+    ap.add_argument("--source", default=None, help="분포를 학습할 CSV(기본: assets/data 자동 탐색)")
+    ap.add_argument("--spec", default=None, help="저장된 스펙 JSON 사용(있으면 --source 무시)")
+    ap.add_argument("--save-spec", default=None, help="학습한 스펙을 JSON으로 저장")
+    ap.add_argument("--chunk", default=str(DEFAULT_CHUNK), help="청크 행 수")
+    ap.add_argument("--workers", type=int, default=1, help="병렬 프로세스 수")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    if args.spec:
+        spec = load_spec(args.spec)
+    else:
+        src = _safe_read_csv(Path(args.source)) if args.source else load_csv_from_data()
+        spec = fit_synthetic_spec(src)
+    if args.save_spec:
+        save_spec(spec, args.save_spec)
+    path = write_synthetic(args.out, parse_size(args.rows), spec=spec,
+                           chunk_size=parse_size(args.chunk), workers=args.workers, seed=args.seed)
+    print(f"[SAVE] synthetic -> {path}")